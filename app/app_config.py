@@ -12,8 +12,10 @@ BASE_DIR = PACKAGE_DIR.parent
 ASSETS_DIR = BASE_DIR / "assets"
 DATA_DIR = ASSETS_DIR / "data"
 PAGES_DIR = PACKAGE_DIR / "pages"
+DATA_SNAPSHOT_DIR = BASE_DIR / ".data_cache"
 
 LOGGER = logging.getLogger(__name__)
+GUIDE_MARKER_MODES = ("layered", "single")
 CACHE_TYPE_ALIASES = {
     "simple": "flask_caching.backends.simplecache.SimpleCache",
 }
@@ -36,10 +38,29 @@ def _env_int(name, default):
         raise RuntimeError(f"{name} must be an integer, got {value!r}") from exc
 
 
+def _env_list(name):
+    value = os.getenv(name, "")
+    return tuple(item.strip().lower() for item in value.split(",") if item.strip())
+
+
+def _env_choice(name, choices, default):
+    value = os.getenv(name, default).strip().lower()
+    if value not in choices:
+        raise RuntimeError(f"{name} must be one of {', '.join(choices)}, got {value!r}")
+    return value
+
+
 def _cache_type(name):
     return CACHE_TYPE_ALIASES.get(name.strip().lower(), name)
 
 
+def _data_snapshot_dir():
+    if not _env_bool("DATA_SNAPSHOT", default=True):
+        return None
+    snapshot_dir = os.getenv("DATA_SNAPSHOT_DIR")
+    return Path(snapshot_dir) if snapshot_dir else DATA_SNAPSHOT_DIR
+
+
 def _detect_production():
     if os.getenv("DYNO"):
         return True
@@ -83,6 +104,10 @@ class RuntimeConfig:
     openai_request_limit: int
     cache_type: str
     cache_default_timeout: int
+    data_snapshot_dir: Path | None
+    warm_pages: tuple[str, ...]
+    guide_marker_mode: str
+    guide_figure_cache_size: int
 
     @property
     def cache_config(self):
@@ -116,6 +141,10 @@ def load_config():
         openai_request_limit=_env_int("OPENAI_REQUEST_LIMIT", 10),
         cache_type=_cache_type(os.getenv("CACHE_TYPE", "simple")),
         cache_default_timeout=_env_int("CACHE_DEFAULT_TIMEOUT", 3600),
+        data_snapshot_dir=_data_snapshot_dir(),
+        warm_pages=_env_list("WARM_PAGES"),
+        guide_marker_mode=_env_choice("GUIDE_MARKER_MODE", GUIDE_MARKER_MODES, "layered"),
+        guide_figure_cache_size=_env_int("GUIDE_FIGURE_CACHE_SIZE", 256),
     )
 
 
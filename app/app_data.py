@@ -1,11 +1,30 @@
+from collections.abc import Mapping
 from dataclasses import dataclass
 import hashlib
+from types import MappingProxyType
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import shapely
 from pandas.api.types import is_numeric_dtype
 
 from app.app_config import CONFIG, RuntimeConfig
+from app.data_snapshot import load_snapshot, source_fingerprint, write_snapshot
+from app.utils.analysis_figures import ChoroplethLayer, build_choropleth_layer
+from app.utils.guide_figures import generate_hover_texts
+from app.utils.guide_tables import (
+    GuideFilterTable,
+    GuideOutlineTable,
+    GuideViewTable,
+    build_guide_filter_table,
+    build_guide_outline_table,
+    build_guide_view_table,
+)
+from app.utils.lazy_loading import LazyValue
+from app.utils.restaurant_cards import RestaurantCardCache, build_restaurant_details
+from app.utils.restaurant_index import RestaurantIndex, build_restaurant_index
+from app.utils.locationMatcher import LocationMatcher
 
 
 RESTAURANT_COLUMNS = (
@@ -95,6 +114,27 @@ PARIS_COLUMNS = (
 )
 WINE_COLUMNS = ("region", "app", "colour", "geometry")
 WINE_GEOMETRY_TYPES = frozenset({"Polygon", "MultiPolygon"})
+WINE_GEOMETRY_TYPE_IDS = (shapely.GeometryType.POLYGON, shapely.GeometryType.MULTIPOLYGON)
+
+# Frames every page needs, loaded at import; lazy frames have their own sources and snapshots
+SOURCE_FILES = (
+    "all_restaurants(arrondissements).csv",
+    "monaco_restaurants.csv",
+    "region_restaurants.geojson",
+    "department_restaurants.geojson",
+    "paris_restaurants.geojson",
+    "monaco_restaurants.geojson",
+)
+SNAPSHOT_FILENAME = "michelin_data.pickle"
+
+# Lazy frames behind each page, loaded ahead of the first request by MichelinData.warm
+PAGE_LAZY_FRAMES = {
+    "home": (),
+    "guide": (),
+    "analysis": ("arron_df", "arrondissement_choropleth"),
+    "economics": (),
+    "wine": ("wine_df",),
+}
 
 
 @dataclass(frozen=True)
@@ -103,30 +143,77 @@ class MichelinData:
     all_monaco: pd.DataFrame
     region_df: gpd.GeoDataFrame
     department_df: gpd.GeoDataFrame
-    arron_df: gpd.GeoDataFrame
     paris_df: gpd.GeoDataFrame
     monaco_df: gpd.GeoDataFrame
-    wine_df: gpd.GeoDataFrame
     geo_df: gpd.GeoDataFrame
+    restaurants_with_monaco: pd.DataFrame
+    geo_df_with_monaco: gpd.GeoDataFrame
     unique_regions: list[str]
     initial_options: list[dict[str, str]]
-    dept_to_code: dict[str, str]
+    dept_to_code: Mapping[str, str]
+    dept_to_code_with_monaco: Mapping[str, str]
     region_to_name: dict[str, str]
+    location_matcher: LocationMatcher
+    guide_filters: GuideFilterTable
+    guide_views: GuideViewTable
+    guide_outlines: GuideOutlineTable
+    restaurant_index: RestaurantIndex
+    restaurant_details: Mapping[str, dict]
+    restaurant_cards: RestaurantCardCache
+    lazy_frames: Mapping[str, LazyValue]
+
+    # Arrondissement demographics and the AOC layer only serve Analysis and Wine
+
+    @property
+    def arron_df(self) -> gpd.GeoDataFrame:
+        return self.lazy_frames["arron_df"].get()
+
+    @property
+    def wine_df(self) -> gpd.GeoDataFrame:
+        return self.lazy_frames["wine_df"].get()
+
+    @property
+    def arrondissement_choropleth(self) -> ChoroplethLayer:
+        return self.lazy_frames["arrondissement_choropleth"].get()
+
+    def warm(self, pages):
+        """Load the lazy frames behind `pages` (page names, or "all") now instead of on first use."""
+        pages = tuple(PAGE_LAZY_FRAMES) if "all" in pages else tuple(pages)
+        unknown_pages = [page for page in pages if page not in PAGE_LAZY_FRAMES]
+        if unknown_pages:
+            raise RuntimeError(f"Cannot warm unknown pages: {', '.join(unknown_pages)}")
+
+        for page in pages:
+            for name in PAGE_LAZY_FRAMES[page]:
+                self.lazy_frames[name].get()
+
+    # Both variants are built once at load time; callers share them and must not mutate them
 
     def get_combined_restaurant_data(self, include_monaco=False):
         if include_monaco:
-            return pd.concat([self.all_france, self.all_monaco], ignore_index=True)
+            return self.restaurants_with_monaco
         return self.all_france
 
     def get_geo_df(self, include_monaco=False):
-        combined = self.get_combined_restaurant_data(include_monaco=include_monaco)
-        dept_codes = combined["department_num"].unique()
+        if include_monaco:
+            return self.geo_df_with_monaco
+        return self.geo_df
+
+    def get_dept_to_code(self, include_monaco=False):
+        if include_monaco:
+            return self.dept_to_code_with_monaco
+        return self.dept_to_code
 
-        if not include_monaco:
-            return self.department_df[self.department_df["code"].isin(dept_codes)]
 
-        merged_df = pd.concat([self.department_df, self.monaco_df], ignore_index=True)
-        return gpd.GeoDataFrame(merged_df, geometry="geometry", crs=self.department_df.crs)
+def _with_monaco_department(department_df, monaco_df):
+    merged_df = pd.concat([department_df, monaco_df], ignore_index=True)
+    return gpd.GeoDataFrame(merged_df, geometry="geometry", crs=department_df.crs)
+
+
+def _department_codes(geo_df):
+    return MappingProxyType(
+        geo_df.drop_duplicates(subset="department").set_index("department")["code"].to_dict()
+    )
 
 
 def _require_columns(frame, name, required_columns):
@@ -160,77 +247,218 @@ def wine_feature_id(region: str, app: str) -> str:
     return f"aoc-{hashlib.sha256(identity).hexdigest()}"
 
 
-def _validate_wine_data(frame: gpd.GeoDataFrame):
-    if frame.crs is None:
-        raise RuntimeError("wine_df has no CRS")
+def restaurant_id(name: str, address: str, location: str) -> str:
+    """Return an order-independent identifier for a restaurant."""
+    identity = f"{name}\0{address}\0{location}".encode("utf-8")
+    return f"restaurant-{hashlib.sha256(identity).hexdigest()[:12]}"
 
-    if frame.crs.to_epsg() != 4326:
-        frame = frame.to_crs(epsg=4326)
 
-    if frame.geometry.isna().any() or frame.geometry.is_empty.any():
-        raise RuntimeError("wine_df contains missing or empty geometries")
+def wine_feature_ids(regions, apps) -> np.ndarray:
+    """Return `wine_feature_id` for each (region, app) pair, as an object array."""
+    return np.array(list(map(wine_feature_id, regions, apps)), dtype=object)
+
 
-    required_values = ("region", "app", "colour")
-    missing_values = [
+@dataclass(frozen=True)
+class WineValidationReport:
+    """Problems found in an AOC layer by `wine_validation_report`."""
+
+    has_crs: bool
+    missing_geometries: int
+    missing_values: tuple[str, ...]
+    unsupported_geometry_types: tuple[str, ...]
+    duplicate_pairs: int
+    inconsistent_colour_regions: tuple[str, ...]
+    duplicate_feature_ids: int
+
+    @property
+    def errors(self) -> list[str]:
+        errors = []
+        if not self.has_crs:
+            errors.append("wine_df has no CRS")
+        if self.missing_geometries:
+            errors.append("wine_df contains missing or empty geometries")
+        if self.missing_values:
+            errors.append(f"wine_df contains missing values in: {', '.join(self.missing_values)}")
+        if self.unsupported_geometry_types:
+            errors.append(
+                "wine_df contains unsupported geometry types: "
+                f"{', '.join(self.unsupported_geometry_types)}"
+            )
+        if self.duplicate_pairs:
+            errors.append("wine_df contains duplicate (region, app) pairs")
+        if self.inconsistent_colour_regions:
+            errors.append(
+                "wine_df parent regions must each have exactly one colour: "
+                f"{', '.join(self.inconsistent_colour_regions)}"
+            )
+        if self.duplicate_feature_ids:
+            errors.append("wine_df contains duplicate generated feature IDs")
+        return errors
+
+    def raise_for_errors(self):
+        errors = self.errors
+        if errors:
+            raise RuntimeError("; ".join(errors))
+
+
+def _combined_codes(major_codes, minor_codes, minor_count) -> np.ndarray:
+    # One int64 key per (major, minor) factorised code pair; missing (-1) codes get their own slot
+    return (major_codes.astype(np.int64) + 1) * (minor_count + 1) + minor_codes + 1
+
+
+def wine_validation_report(frame: gpd.GeoDataFrame, feature_ids) -> WineValidationReport:
+    """
+    Check an AOC layer and its generated feature IDs in one sweep over the column arrays.
+
+    Each key column is factorised once; the duplicate and colour checks then hash
+    combined integer codes rather than regrouping the frame.
+    """
+    geometries = np.asarray(frame.geometry.array)
+    type_ids = shapely.get_type_id(geometries)
+    missing_geometries = (type_ids < 0) | shapely.is_empty(geometries)
+    unsupported = ~missing_geometries & ~np.isin(type_ids, WINE_GEOMETRY_TYPE_IDS)
+
+    region_codes, regions = pd.factorize(frame["region"])
+    app_codes, apps = pd.factorize(frame["app"])
+    colour_codes, colours = pd.factorize(frame["colour"])
+    missing_values = tuple(
         column
-        for column in required_values
-        if frame[column].isna().any()
-    ]
-    if missing_values:
-        raise RuntimeError(
-            f"wine_df contains missing values in: {', '.join(missing_values)}"
-        )
+        for column, codes in (("region", region_codes), ("app", app_codes), ("colour", colour_codes))
+        if (codes < 0).any()
+    )
 
-    unsupported_geometry_types = sorted(
-        set(frame.geometry.geom_type) - WINE_GEOMETRY_TYPES
+    duplicate_pairs = pd.Series(_combined_codes(region_codes, app_codes, len(apps))).duplicated().to_numpy()
+    duplicate_feature_ids = pd.Series(feature_ids).duplicated().to_numpy() & ~duplicate_pairs
+
+    # Count distinct colours per region, ignoring rows with either value missing
+    coloured = (region_codes >= 0) & (colour_codes >= 0)
+    region_colours = pd.unique(_combined_codes(region_codes[coloured], colour_codes[coloured], len(colours)))
+    colours_per_region = np.bincount(region_colours // (len(colours) + 1) - 1, minlength=len(regions))
+
+    return WineValidationReport(
+        has_crs=frame.crs is not None,
+        missing_geometries=int(missing_geometries.sum()),
+        missing_values=missing_values,
+        unsupported_geometry_types=tuple(sorted(set(frame.geometry[unsupported].geom_type))),
+        duplicate_pairs=int(duplicate_pairs.sum()),
+        inconsistent_colour_regions=tuple(sorted(regions[colours_per_region > 1])),
+        duplicate_feature_ids=int(duplicate_feature_ids.sum()),
     )
-    if unsupported_geometry_types:
-        raise RuntimeError(
-            "wine_df contains unsupported geometry types: "
-            f"{', '.join(unsupported_geometry_types)}"
-        )
 
-    if frame.duplicated(subset=["region", "app"]).any():
-        raise RuntimeError("wine_df contains duplicate (region, app) pairs")
 
-    inconsistent_colour_regions = sorted(
-        frame.groupby("region")["colour"].nunique().loc[lambda counts: counts != 1].index
-    )
-    if inconsistent_colour_regions:
-        raise RuntimeError(
-            "wine_df parent regions must each have exactly one colour: "
-            f"{', '.join(inconsistent_colour_regions)}"
-        )
-
-    frame = frame.copy()
-    frame["feature_id"] = [
-        wine_feature_id(region, app)
-        for region, app in frame[["region", "app"]].itertuples(index=False, name=None)
-    ]
-    if frame["feature_id"].duplicated().any():
-        raise RuntimeError("wine_df contains duplicate generated feature IDs")
+def _validate_wine_data(frame: gpd.GeoDataFrame):
+    if frame.crs is not None and frame.crs.to_epsg() != 4326:
+        frame = frame.to_crs(epsg=4326)
 
-    return frame
+    feature_ids = wine_feature_ids(frame["region"], frame["app"])
+    wine_validation_report(frame, feature_ids).raise_for_errors()
 
+    return frame.assign(feature_id=feature_ids)
 
-def load_michelin_data(config: RuntimeConfig = CONFIG):
+
+def _read_source_frames(config: RuntimeConfig):
     all_france = _read_restaurants(config, "all_restaurants(arrondissements).csv", "all_france")
     all_monaco = _read_restaurants(config, "monaco_restaurants.csv", "all_monaco")
 
     region_df = _read_geojson(config, "region_restaurants.geojson", "region_df", REGION_COLUMNS)
     department_df = _read_geojson(config, "department_restaurants.geojson", "department_df", DEPARTMENT_COLUMNS)
-    arron_df = _read_geojson(config, "arrondissement_restaurants.geojson", "arron_df", ARRONDISSEMENT_COLUMNS)
     paris_df = _read_geojson(config, "paris_restaurants.geojson", "paris_df", PARIS_COLUMNS)
     monaco_df = _read_geojson(config, "monaco_restaurants.geojson", "monaco_df", DEPARTMENT_COLUMNS)
 
-    wine_df = _read_geojson(config, "wine_regions_aoc.geojson", "wine_df", WINE_COLUMNS)
-    wine_df = _validate_wine_data(wine_df)
-
     _require_non_numeric(department_df, "department_df", ("code",))
-    _require_non_numeric(arron_df, "arron_df", ("code", "department_num"))
     _require_non_numeric(paris_df, "paris_df", ("code", "department_num"))
     _require_non_numeric(monaco_df, "monaco_df", ("code",))
 
+    return {
+        "all_france": all_france,
+        "all_monaco": all_monaco,
+        "region_df": region_df,
+        "department_df": department_df,
+        "paris_df": paris_df,
+        "monaco_df": monaco_df,
+    }
+
+
+def _read_arron_df(config: RuntimeConfig):
+    arron_df = _read_geojson(config, "arrondissement_restaurants.geojson", "arron_df", ARRONDISSEMENT_COLUMNS)
+    _require_non_numeric(arron_df, "arron_df", ("code", "department_num"))
+    return arron_df
+
+
+def _read_wine_df(config: RuntimeConfig):
+    wine_df = _read_geojson(config, "wine_regions_aoc.geojson", "wine_df", WINE_COLUMNS)
+    return _validate_wine_data(wine_df)
+
+
+# Lazy frame name -> (source files, reader)
+LAZY_FRAMES = {
+    "arron_df": (("arrondissement_restaurants.geojson",), _read_arron_df),
+    "wine_df": (("wine_regions_aoc.geojson",), _read_wine_df),
+}
+
+
+def _load_snapshotted(config: RuntimeConfig, snapshot_filename, source_files, read):
+    """Return `read(config)`, reusing its startup snapshot while `source_files` are unchanged."""
+    if config.data_snapshot_dir is None:
+        return read(config)
+
+    sources = [config.data_path(filename) for filename in source_files]
+    snapshot_path = config.data_snapshot_dir / snapshot_filename
+    frames = load_snapshot(snapshot_path, sources)
+    if frames is None:
+        # Fingerprint before parsing, so a source edited mid-load leaves the snapshot stale
+        fingerprint = source_fingerprint(sources)
+        frames = read(config)
+        write_snapshot(snapshot_path, fingerprint, frames)
+    return frames
+
+
+def _load_source_frames(config: RuntimeConfig):
+    """Return the parsed and validated source frames every page needs."""
+    return _load_snapshotted(config, SNAPSHOT_FILENAME, SOURCE_FILES, _read_source_frames)
+
+
+def _lazy_frame(config: RuntimeConfig, name):
+    source_files, read = LAZY_FRAMES[name]
+    return LazyValue(lambda: _load_snapshotted(config, f"{name}.pickle", source_files, read))
+
+
+def _lazy_frames(config: RuntimeConfig):
+    lazy_frames = {name: _lazy_frame(config, name) for name in LAZY_FRAMES}
+    # Built from arron_df when it loads, so warming the Analysis page also covers the arrondissement maps
+    lazy_frames["arrondissement_choropleth"] = LazyValue(
+        lambda: build_choropleth_layer(lazy_frames["arron_df"].get(), "arrondissement", sort_column="arrondissement")
+    )
+    return MappingProxyType(lazy_frames)
+
+
+def _with_hover_text(restaurants):
+    # Marker hover HTML is built once here; the guide figures slice it per selection
+    return restaurants.assign(hover_text=generate_hover_texts(restaurants))
+
+
+def _with_restaurant_ids(restaurants):
+    # Map clicks resolve restaurants by this ID, so it must not depend on row order
+    ids = list(map(restaurant_id, restaurants["name"], restaurants["address"], restaurants["location"]))
+    return restaurants.assign(restaurant_id=ids)
+
+
+def _require_unique_restaurant_ids(restaurants):
+    duplicated = restaurants["restaurant_id"].duplicated(keep=False)
+    if duplicated.any():
+        names = sorted(set(restaurants.loc[duplicated, "name"]))
+        raise RuntimeError(f"Restaurants share a name, address and location: {', '.join(names)}")
+
+
+def load_michelin_data(config: RuntimeConfig = CONFIG):
+    frames = _load_source_frames(config)
+    all_france = _with_restaurant_ids(_with_hover_text(frames["all_france"]))
+    all_monaco = _with_restaurant_ids(_with_hover_text(frames["all_monaco"]))
+    region_df = frames["region_df"]
+    department_df = frames["department_df"]
+    paris_df = frames["paris_df"]
+    monaco_df = frames["monaco_df"]
+
     departments_with_restaurants = all_france["department_num"].unique()
     geo_df = department_df[department_df["code"].isin(departments_with_restaurants)]
 
@@ -247,23 +475,44 @@ def load_michelin_data(config: RuntimeConfig = CONFIG):
         }
         for dept in initial_departments
     ]
-    dept_to_code = geo_df.drop_duplicates(subset="department").set_index("department")["code"].to_dict()
+    dept_to_code = _department_codes(geo_df)
     region_to_name = {region: region for region in geo_df["region"].unique()}
 
+    restaurants_with_monaco = pd.concat([all_france, all_monaco], ignore_index=True)
+    _require_unique_restaurant_ids(restaurants_with_monaco)
+    geo_df_with_monaco = _with_monaco_department(department_df, monaco_df)
+    dept_to_code_with_monaco = _department_codes(geo_df_with_monaco)
+
+    location_matcher = LocationMatcher(restaurants_with_monaco)
+    guide_filters = build_guide_filter_table(all_france, geo_df, geo_df_with_monaco)
+    guide_views = build_guide_view_table(geo_df, geo_df_with_monaco, paris_df)
+    guide_outlines = build_guide_outline_table(region_df, geo_df_with_monaco, paris_df)
+    restaurant_index = build_restaurant_index(restaurants_with_monaco, len(all_france))
+    restaurant_details = build_restaurant_details(restaurants_with_monaco)
+
     return MichelinData(
         all_france=all_france,
         all_monaco=all_monaco,
         region_df=region_df,
         department_df=department_df,
-        arron_df=arron_df,
         paris_df=paris_df,
         monaco_df=monaco_df,
-        wine_df=wine_df,
         geo_df=geo_df,
+        restaurants_with_monaco=restaurants_with_monaco,
+        geo_df_with_monaco=geo_df_with_monaco,
         unique_regions=unique_regions,
         initial_options=initial_options,
         dept_to_code=dept_to_code,
+        dept_to_code_with_monaco=dept_to_code_with_monaco,
         region_to_name=region_to_name,
+        location_matcher=location_matcher,
+        guide_filters=guide_filters,
+        guide_views=guide_views,
+        guide_outlines=guide_outlines,
+        restaurant_index=restaurant_index,
+        restaurant_details=restaurant_details,
+        restaurant_cards=RestaurantCardCache(restaurant_details),
+        lazy_frames=_lazy_frames(config),
     )
 
 
@@ -1,34 +1,79 @@
 import plotly.graph_objects as go
-from dash import html
-from dash.dependencies import ALL, Input, Output, State
+from dash import Patch, callback_context, html, no_update
+from dash.dependencies import ALL, MATCH, Input, Output, State
 from dash.exceptions import PreventUpdate
 
 from app.utils.analysis_figures import (
+    build_choropleth_areas,
+    build_choropleth_layer,
+    build_ranking_table,
+    choropleth_feature_ids,
+    choropleth_features,
+    choropleth_totals_patch,
     create_michelin_bar_chart,
     plot_single_choropleth_plotly,
-    top_restaurants,
+    ranked_area_cards,
+    ranking_area_id,
+    render_ranking,
 )
-from app.utils.star_filters import update_button_active_state_helper
+from app.utils.star_filters import register_star_button_callback
+
+
+def _star_toggled():
+    # The star filter buttons have pattern-matching (dict) ids; the dropdowns have string ids
+    return isinstance(callback_context.triggered_id, dict)
+
+
+def choropleth_map(df, counts, selected_stars, granularity, features, view, displayed_areas, star_toggle):
+    """
+    Return a choropleth map output for `df`, whose star counts are `counts`, and the areas it shows.
+
+    A star toggle over the areas already on the map only sends their new totals as a `Patch`;
+    anything else sends the full figure with the outlines.
+    """
+    areas = choropleth_feature_ids(df, granularity)
+    if star_toggle and displayed_areas == areas:
+        return choropleth_totals_patch(counts, selected_stars), no_update
+
+    fig = plot_single_choropleth_plotly(
+        df=df,
+        selected_stars=selected_stars,
+        granularity=granularity,
+        show_labels=False,
+        features=features,
+        view=view,
+        counts=counts
+    )
+    return fig, areas
 
 
 def register_analysis_callbacks(app, data):
     all_france = data.all_france
+    restaurant_cards = data.restaurant_cards
+    ranking_table = build_ranking_table(all_france)
     region_df = data.region_df
     department_df = data.department_df
-    arron_df = data.arron_df
     paris_df = data.paris_df
     star_placeholder = (0.5, 1, 2, 3)
     unique_regions = data.unique_regions
 
+    # Areas, outlines and map views are built once per granularity; the arrondissement ones load with arron_df
+    region_areas = build_choropleth_areas(region_df, 'region', sort_column='region')
+    region_features = choropleth_features(region_df, 'region')
+    department_layer = build_choropleth_layer(department_df, 'department', sort_column='department')
+    paris_layer = build_choropleth_layer(paris_df, 'arrondissement')
+
     # REGION content
 
     @app.callback(
         [Output('restaurant-analysis-graph', 'figure'),
-         Output('region-map', 'figure')],
+         Output('region-map', 'figure'),
+         Output('region-map-areas', 'data')],
         [Input('region-dropdown-analysis', 'value'),
-         Input({'type': 'filter-button-analysis', 'index': ALL}, 'n_clicks')]
+         Input({'type': 'filter-button-analysis', 'index': ALL}, 'n_clicks')],
+        [State('region-map-areas', 'data')]
     )
-    def update_analysis_chart_and_map(selected_regions, star_clicks):
+    def update_analysis_chart_and_map(selected_regions, star_clicks, displayed_areas):
         # Check if "Select All" is chosen
         if 'all' in selected_regions:
             selected_regions = unique_regions  # Reset to all available regions
@@ -42,8 +87,7 @@ def register_analysis_callbacks(app, data):
         if star_clicks:
             select_stars = [star_placeholder[i] for i, n in enumerate(star_clicks) if n % 2 == 0]
 
-        filtered_df = region_df[region_df['region'].isin(selected_regions)].copy()
-        filtered_df.sort_values('region', inplace=True)
+        filtered_df, counts = region_areas.select(selected_regions)
 
         fig_bar = create_michelin_bar_chart(
             filtered_df,
@@ -52,14 +96,11 @@ def register_analysis_callbacks(app, data):
             title="Selected regions of France."
         )
 
-        map_fig = plot_single_choropleth_plotly(
-            df=filtered_df,
-            selected_stars=select_stars,
-            granularity='region',
-            show_labels=False
+        map_fig, map_areas = choropleth_map(
+            filtered_df, counts, select_stars, 'region', region_features, None, displayed_areas, _star_toggled()
         )
 
-        return fig_bar, map_fig
+        return fig_bar, map_fig, map_areas
 
     @app.callback(
         Output('region-dropdown-analysis', 'value'),
@@ -73,16 +114,7 @@ def register_analysis_callbacks(app, data):
         # Otherwise, return the current selection
         return selected_regions
 
-    @app.callback(
-        [Output({'type': 'filter-button-analysis', 'index': ALL}, 'className'),
-         Output({'type': 'filter-button-analysis', 'index': ALL}, 'style')],
-        [Input({'type': 'filter-button-analysis', 'index': ALL}, 'n_clicks')],
-        [State({'type': 'filter-button-analysis', 'index': ALL}, 'id')]
-    )
-    def update_region_button_active_state(n_clicks_list, ids):
-        if not n_clicks_list:
-            raise PreventUpdate
-        return update_button_active_state_helper(n_clicks_list, ids, 'analysis')
+    register_star_button_callback(app, 'filter-button-analysis', 'analysis')
 
     # DEPARTMENT content
 
@@ -93,17 +125,19 @@ def register_analysis_callbacks(app, data):
          Output('department-analysis-graph', 'style'),
          Output('department-map', 'style'),
          Output('departments-store', 'data'),
-         Output('arrondissement-filter-title', 'children')],
+         Output('arrondissement-filter-title', 'children'),
+         Output('department-map-areas', 'data')],
         [Input('department-dropdown-analysis', 'value'),
-         Input({'type': 'filter-button-department', 'index': ALL}, 'n_clicks')]
+         Input({'type': 'filter-button-department', 'index': ALL}, 'n_clicks')],
+        [State('department-map-areas', 'data')]
     )
-    def update_department_chart_and_map(selected_region, star_clicks):
+    def update_department_chart_and_map(selected_region, star_clicks, displayed_areas):
         hide_style = {'display': 'none'}
         show_style = {'display': 'inline-block', 'height': '100%', 'width': '100%'}
 
         if not selected_region:
             empty_fig = go.Figure()
-            return hide_style, empty_fig, empty_fig, hide_style, hide_style, [], ""
+            return hide_style, empty_fig, empty_fig, hide_style, hide_style, [], "", None
 
         arrondissements_title = f"Select a Department within {selected_region}"
 
@@ -113,8 +147,7 @@ def register_analysis_callbacks(app, data):
         if star_clicks:
             select_stars = [star_placeholder[i] for i, n in enumerate(star_clicks) if n % 2 == 0]
 
-        filtered_df = department_df[department_df['region'] == selected_region].copy()
-        filtered_df.sort_values('department', inplace=True)
+        filtered_df, counts = department_layer.areas.select([selected_region])
 
         fig_bar = create_michelin_bar_chart(
             filtered_df,
@@ -123,28 +156,18 @@ def register_analysis_callbacks(app, data):
             title=f"{selected_region}"
         )
 
-        map_fig = plot_single_choropleth_plotly(
-            df=filtered_df,
-            selected_stars=select_stars,
-            granularity='department',
-            show_labels=False
+        map_fig, map_areas = choropleth_map(
+            filtered_df, counts, select_stars, 'department', department_layer.features,
+            department_layer.views[selected_region], displayed_areas, _star_toggled()
         )
 
         # Extract unique departments and create a list of options for the store
         department_options = [{'label': dept, 'value': dept} for dept in filtered_df['department'].unique()]
 
-        return show_style, fig_bar, map_fig, show_style, show_style, department_options, arrondissements_title
+        return (show_style, fig_bar, map_fig, show_style, show_style, department_options, arrondissements_title,
+                map_areas)
 
-    @app.callback(
-        [Output({'type': 'filter-button-department', 'index': ALL}, 'className'),
-         Output({'type': 'filter-button-department', 'index': ALL}, 'style')],
-        [Input({'type': 'filter-button-department', 'index': ALL}, 'n_clicks')],
-        [State({'type': 'filter-button-department', 'index': ALL}, 'id')]
-    )
-    def update_department_button_active_state(n_clicks_list, ids):
-        if not n_clicks_list:
-            raise PreventUpdate
-        return update_button_active_state_helper(n_clicks_list, ids, 'department')
+    register_star_button_callback(app, 'filter-button-department', 'department')
 
     # ARRONDISSEMENT content
 
@@ -173,17 +196,19 @@ def register_analysis_callbacks(app, data):
          Output('arrondissement-analysis-graph', 'figure'),
          Output('arrondissement-map', 'figure'),
          Output('arrondissement-analysis-graph', 'style'),
-         Output('arrondissement-map', 'style')],
+         Output('arrondissement-map', 'style'),
+         Output('arrondissement-map-areas', 'data')],
         [Input('arrondissement-dropdown-analysis', 'value'),
-         Input({'type': 'filter-button-arrondissement', 'index': ALL}, 'n_clicks')]
+         Input({'type': 'filter-button-arrondissement', 'index': ALL}, 'n_clicks')],
+        [State('arrondissement-map-areas', 'data')]
     )
-    def update_arrondissement_chart_and_map(selected_department, star_clicks):
+    def update_arrondissement_chart_and_map(selected_department, star_clicks, displayed_areas):
         hide_style = {'display': 'none'}
         show_style = {'display': 'inline-block', 'height': '100%', 'width': '100%'}
 
         if not selected_department:
             empty_fig = go.Figure()
-            return hide_style, empty_fig, empty_fig, hide_style, hide_style
+            return hide_style, empty_fig, empty_fig, hide_style, hide_style, None
 
         # Default to all star levels if none selected
         select_stars = [0.5, 1, 2, 3]
@@ -191,11 +216,11 @@ def register_analysis_callbacks(app, data):
         if star_clicks:
             select_stars = [star_placeholder[i] for i, n in enumerate(star_clicks) if n % 2 == 0]
 
-        if selected_department == 'Paris':
-            filtered_df = paris_df
-        else:
-            filtered_df = arron_df[arron_df['department'] == selected_department].copy()
-            filtered_df.sort_values('arrondissement', inplace=True)
+        # The arrondissement layer loads with arron_df, at startup when the Analysis page is warmed
+        layer = paris_layer if selected_department == 'Paris' else data.arrondissement_choropleth
+        filtered_df, counts = layer.areas.select([selected_department])
+        features = layer.features
+        view = layer.views[selected_department]
 
         fig_bar = create_michelin_bar_chart(
             filtered_df,
@@ -204,25 +229,13 @@ def register_analysis_callbacks(app, data):
             title=f"{selected_department}"
         )
 
-        map_fig = plot_single_choropleth_plotly(
-            df=filtered_df,
-            selected_stars=select_stars,
-            granularity='arrondissement',
-            show_labels=False
+        map_fig, map_areas = choropleth_map(
+            filtered_df, counts, select_stars, 'arrondissement', features, view, displayed_areas, _star_toggled()
         )
 
-        return show_style, fig_bar, map_fig, show_style, show_style
+        return show_style, fig_bar, map_fig, show_style, show_style, map_areas
 
-    @app.callback(
-        [Output({'type': 'filter-button-arrondissement', 'index': ALL}, 'className'),
-         Output({'type': 'filter-button-arrondissement', 'index': ALL}, 'style')],
-        [Input({'type': 'filter-button-arrondissement', 'index': ALL}, 'n_clicks')],
-        [State({'type': 'filter-button-arrondissement', 'index': ALL}, 'id')]
-    )
-    def update_demographics_button_active_state(n_clicks_list, ids):
-        if not n_clicks_list:
-            raise PreventUpdate
-        return update_button_active_state_helper(n_clicks_list, ids, 'arrondissement')
+    register_star_button_callback(app, 'filter-button-arrondissement', 'arrondissement')
 
     # RANKING content
 
@@ -254,24 +267,34 @@ def register_analysis_callbacks(app, data):
         # Set the button label based on the toggle state
         button_label = "Hide Restaurant Details" if display_restaurants else "Show Restaurant Details"
 
-        # Handle the 'Paris' case explicitly
-        if top_n == 1 and granularity == 'department':
-            # Focus on Paris for department granularity
-            filtered_data = all_france[all_france['department_num'] == '75']  # Only Paris restaurants
-        elif top_n == 1 and granularity == 'region':
-            # Focus on Île-de-France for region granularity
-            filtered_data = all_france[all_france['region'] == 'Île-de-France']  # Only Île-de-France restaurants
-        elif top_n == 1 and granularity == 'arrondissement':
-            # Focus on Paris arrondissements for 'arrondissement' granularity
-            filtered_data = all_france[all_france['department_num'] == '75']  # Only Paris restaurants
-            top_n = 5  # Force top_n to be 5 for Paris arrondissements
-        else:
-            # General case: filter out Île-de-France if not Paris
-            filtered_data = all_france[all_france['region'] != 'Île-de-France']
-            if granularity == 'department' and top_n in [3, 5]:
-                filtered_data = filtered_data[filtered_data['department_num'] != '75']  # Exclude Paris
-
-        # Call the top_restaurants function to get the components
-        ranking_components = top_restaurants(filtered_data, granularity, star_rating, top_n, display_restaurants)
+        # Rankings for every dropdown choice are built once, at registration
+        ranking = ranking_table[(granularity, star_rating, top_n)]
+        ranking_components = render_ranking(
+            ranking, star_rating, restaurant_cards, display_restaurants,
+            ranking_key=(granularity, star_rating, top_n)
+        )
 
         return ranking_components, n_clicks, button_label
+
+    def ranking_area_pattern(component_type):
+        return ranking_area_id(component_type, (MATCH, MATCH, MATCH), MATCH)
+
+    @app.callback(
+        [Output(ranking_area_pattern('ranking-cards'), 'children'),
+         Output(ranking_area_pattern('ranking-more-cards'), 'style'),
+         Output(ranking_area_pattern('ranking-next-page'), 'data')],
+        Input(ranking_area_pattern('ranking-more-cards-button'), 'n_clicks'),
+        [State(ranking_area_pattern('ranking-next-page'), 'data'),
+         State(ranking_area_pattern('ranking-more-cards-button'), 'id')],
+        running=[(Output(ranking_area_pattern('ranking-more-cards-button'), 'disabled'), True, False)],
+        prevent_initial_call=True
+    )
+    def load_more_ranking_cards(n_clicks, page, button_id):
+        # Each click appends the stored next page rather than one counted from n_clicks, so a failed or
+        # superseded request leaves its page to the next click. The button hides after the last page.
+        ranking = ranking_table[(button_id['granularity'], button_id['star_rating'], button_id['top_n'])]
+        area_cards, has_more = ranked_area_cards(ranking.areas[button_id['area']], page, restaurant_cards)
+
+        cards = Patch()
+        cards.extend(area_cards)
+        return cards, no_update if has_more else {'display': 'none'}, page + 1
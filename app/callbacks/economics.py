@@ -1,20 +1,20 @@
 import dash
 import plotly.graph_objects as go
 from dash.dependencies import ALL, Input, Output, State
-from dash.exceptions import PreventUpdate
 
 from app.utils.economics_figures import (
     calculate_weighted_mean,
     plot_demographic_choropleth_plotly,
     plot_demographics_barchart,
 )
-from app.utils.star_filters import update_button_active_state_helper
+from app.utils.star_filters import register_star_button_callback
 
 
 def register_economics_callbacks(app, data):
     all_france = data.all_france
     region_df = data.region_df
     department_df = data.department_df
+    restaurant_index = data.restaurant_index
     unique_regions = data.unique_regions
 
     @app.callback(
@@ -53,7 +53,7 @@ def register_economics_callbacks(app, data):
         if selected_granularity == 'region':
             df = region_df.sort_values('region').copy()  # Use region-level data
             df = df[df['region'].isin(selected_regions)].copy()
-            filtered_restaurants = all_france[all_france['region'].isin(selected_regions)].copy()
+            filtered_restaurants = restaurant_index.regions(selected_regions)
         else:
             df = department_df.copy()
             # If a region is selected in the dropdown, filter to that region
@@ -176,13 +176,4 @@ def register_economics_callbacks(app, data):
 
         raise dash.exceptions.PreventUpdate
 
-    @app.callback(
-        [Output({'type': 'filter-button-demographics', 'index': ALL}, 'className'),
-         Output({'type': 'filter-button-demographics', 'index': ALL}, 'style')],
-        [Input({'type': 'filter-button-demographics', 'index': ALL}, 'n_clicks')],
-        [State({'type': 'filter-button-demographics', 'index': ALL}, 'id')]
-    )
-    def update_demographics_button_active_state(n_clicks_list, ids):
-        if not n_clicks_list:
-            raise PreventUpdate
-        return update_button_active_state_helper(n_clicks_list, ids, 'demographics')
+    register_star_button_callback(app, 'filter-button-demographics', 'demographics')
@@ -1,30 +1,119 @@
 import dash
-from dash import callback_context, html
-from dash.dependencies import ALL, Input, Output, State
+from dash import Patch, callback_context, html
+from dash.dependencies import Input, Output, State
 from dash.exceptions import PreventUpdate
 
 from app.components.shared import color_map
 from app.layouts.layout_main import star_filter_section
+from app.utils.figure_cache import FigureCache, with_map_view, with_star_visibility
 from app.utils.guide_figures import (
     default_map_figure,
     plot_arrondissement_outlines,
     plot_department_outlines,
     plot_interactive_department,
     plot_paris_arrondissement,
+    outline_trace_index,
     plot_regional_outlines,
+    star_trace_indices,
 )
-from app.utils.locationMatcher import LocationMatcher
-from app.utils.restaurant_cards import get_restaurant_details
+from app.utils.guide_tables import (
+    ARRONDISSEMENT_ZOOM,
+    DEPARTMENT_ZOOM,
+    DEPARTMENT_ZOOM_BY_CODE,
+    FRANCE_ZOOM,
+    outline_level,
+)
+from app.utils.star_filters import StarSelection, register_star_button_callback
+
+
+def _star_key(selected_stars):
+    # Figures depend on the set of selected star levels, not the order they were toggled in
+    return tuple(sorted(set(selected_stars)))
+
+
+def _view_zoom(view_data):
+    return (view_data or {}).get('zoom')
+
+
+def _view_center(view_data):
+    center = (view_data or {}).get('center') or {}
+    return {axis: center[axis] for axis in ('lat', 'lon') if axis in center}
+
+
+def _has_full_center(kind, center):
+    # The department builder takes any non-None centre from the view, the arrondissement builder only truthy ones
+    if kind == 'arrondissement':
+        return bool(center.get('lat')) and bool(center.get('lon'))
+    return center.get('lat') is not None and center.get('lon') is not None
+
+
+def _is_displayed(key, displayed):
+    return bool(displayed) and displayed.get('key') == list(key)
+
+
+def _with_outline_trace(fig):
+    figure = fig.to_dict()
+    return figure, outline_trace_index(figure)
+
+
+def _contents(key=None, stars=None, outline=None):
+    # What the map is showing: the marker location and stars a Patch can toggle, and the outline it can refine
+    kind, name, trace, level = outline if outline else (None, None, None, None)
+    return {
+        'key': list(key) if key else None,
+        'stars': _star_key(stars) if stars is not None else None,
+        'outline': {'kind': kind, 'name': name, 'trace': trace, 'level': level} if trace is not None else None,
+    }
+
+
+def marker_map(figure, stars_present, star_traces, selected_stars, zoom, center, displayed_stars=None):
+    """
+    Return the guide map output for a cached marker figure of every star rating.
+
+    When the browser already shows the figure's location with `displayed_stars`, only the traces of the
+    toggled ratings are flipped in a `Patch`. The stored view goes along, as Plotly would otherwise reset the
+    map to the figure's original view. Anything else sends the full figure with the view overlaid.
+    """
+    if displayed_stars is not None:
+        patched_figure = Patch()
+        for star, trace_indices in star_traces.items():
+            if (star in selected_stars) != (star in displayed_stars):
+                for trace_index in trace_indices:
+                    patched_figure['data'][trace_index]['visible'] = star in selected_stars
+        if zoom is not None:
+            patched_figure['layout']['map']['zoom'] = zoom
+        if center:
+            patched_figure['layout']['map']['center'] = center
+        return patched_figure
+
+    figure = with_star_visibility(figure, star_traces, selected_stars)
+    # The builder keeps its own centre when there is nothing to show or the view has no full centre
+    if not stars_present & selected_stars:
+        center = None
+    return with_map_view(figure, zoom, center)
 
 
-def register_guide_callbacks(app, data):
-    all_france = data.all_france
+def register_guide_callbacks(app, data, config):
     region_df = data.region_df
     paris_df = data.paris_df
     dept_to_code = data.dept_to_code
     region_to_name = data.region_to_name
-    get_combined_restaurant_data = data.get_combined_restaurant_data
     get_geo_df = data.get_geo_df
+    get_dept_to_code = data.get_dept_to_code
+    location_matcher = data.location_matcher
+    guide_filters = data.guide_filters
+    guide_views = data.guide_views
+    guide_outlines = data.guide_outlines
+    restaurant_index = data.restaurant_index
+    restaurant_details = data.restaurant_details
+    restaurant_cards = data.restaurant_cards
+    marker_mode = config.guide_marker_mode
+    # Only the layered renderer draws per-rating traces that a star toggle can hide
+    star_toggles = marker_mode == 'layered'
+
+    # Shared with monitoring through the Flask app, e.g. app.server.extensions['guide_figure_cache'].stats()
+    figure_cache = FigureCache(config.guide_figure_cache_size)
+    app.server.extensions['guide_figure_cache'] = figure_cache
 
     # Get rid of the 'hand' when hovering over restaurants (doesn't work with Safari...)
     app.clientside_callback(
@@ -96,10 +185,8 @@ def register_guide_callbacks(app, data):
                 return dash.no_update, '', html.Div([html.P("Enter a valid location.", className='default-message')]), \
                     'city-match-output-container-mainpage', dash.no_update, dash.no_update
 
-            # Add Monaco to dataset
-            plus_monaco = get_combined_restaurant_data(include_monaco=True)
-            matcher = LocationMatcher(plus_monaco)
-            result = matcher.find_region_department(city_input)
+            # Matcher index over France and Monaco is built once at load time
+            result = location_matcher.find_region_department(city_input)
             if isinstance(result, dict):
                 # Valid result, update outputs
                 city_details = [
@@ -133,149 +220,29 @@ def register_guide_callbacks(app, data):
             Input('arrondissement-dropdown', 'value')]
     )
     def update_department_and_filters(selected_region, selected_department, selected_arrondissement):
-        # Use dynamic geo_df based on region
-        geo_df_dynamic = get_geo_df(include_monaco=(selected_region == "Provence-Alpes-Côte d'Azur"))
-
-        # Fetch department options based on the selected region.
-        departments = geo_df_dynamic[geo_df_dynamic['region'] == selected_region][['department', 'code']].drop_duplicates().to_dict('records')
-        department_options = [{'label': f"{dept['department']} ({dept['code']})", 'value': dept['department']} for dept in departments]
+        # Department options and star availability are precomputed at load time
+        department_options = guide_filters.department_options(selected_region)
 
         if not selected_department:
             # No department selected, hide star filter and clear buttons
             return department_options, star_filter_section().children, {'display': 'none'}, []
 
-        # Handle the case when the department is Paris
-        if selected_department == 'Paris':
-            # Determine available stars based on arrondissement selection
-            if selected_arrondissement and selected_arrondissement != 'all':
-                # Filter all_france for the selected arrondissement
-                filtered_data = all_france[
-                    (all_france['department'] == 'Paris') &
-                    (all_france['arrondissement'] == selected_arrondissement)
-                ]
-            else:
-                # No specific arrondissement selected, use all of Paris
-                filtered_data = all_france[
-                    (all_france['department'] == 'Paris')
-                ]
-
-            # Determine available stars from the filtered data
-            available_stars = sorted(filtered_data['stars'].unique(), reverse=True)
-
-            # Only show the filter if there are stars available
-            if available_stars:
-                star_filter = star_filter_section(available_stars)
-                return department_options, star_filter.children, {'display': 'block'}, available_stars
-            else:
-                return department_options, star_filter_section().children, {'display': 'none'}, []
+        # Paris is resolved per arrondissement, other departments per region (Monaco joins PACA)
+        available_stars = guide_filters.available_stars(selected_region, selected_department, selected_arrondissement)
 
+        # Only show the filter if there are stars available
+        if available_stars:
+            star_filter = star_filter_section(available_stars)
+            return department_options, star_filter.children, {'display': 'block'}, available_stars
         else:
-            # For departments other than Paris
-            # Fetch the row for the selected department
-            department_row = geo_df_dynamic[geo_df_dynamic['department'] == selected_department]
-
-            if department_row.empty:
-                # Handle the case where the department is not found
-                return department_options, star_filter_section().children, {'display': 'none'}, []
-
-            department_row = department_row.iloc[0]
-
-            # Determine which star ratings are present in the department
-            available_stars = []
-            for star_level in [3, 2, 1]:  # Ensure all levels are checked
-                if department_row[f'{int(star_level)}_star'] > 0:
-                    available_stars.append(star_level)
-            if department_row['bib_gourmand'] > 0:
-                available_stars.append(0.5)
-            if department_row['selected'] > 0:
-                available_stars.append(0.25)
-
-            # Only show the filter if there are stars available
-            if available_stars:
-                star_filter = star_filter_section(available_stars)
-                return department_options, star_filter.children, {'display': 'block'}, available_stars
-            else:
-                return department_options, star_filter_section().children, {'display': 'none'}, []
+            return department_options, star_filter_section().children, {'display': 'none'}, []
 
-    @app.callback(
-        [Output({'type': 'filter-button-mainpage', 'index': ALL}, 'className'),
-         Output({'type': 'filter-button-mainpage', 'index': ALL}, 'style'),
-         Output('selected-stars', 'data'),
-         Output('toggle-selected-btn', 'className'),
-         Output('toggle-selected-btn', 'style')],
-        [Input({'type': 'filter-button-mainpage', 'index': ALL}, 'n_clicks'),
-         Input('toggle-selected-btn', 'n_clicks')],
-        [State({'type': 'filter-button-mainpage', 'index': ALL}, 'id'),
-         State('selected-stars', 'data'),
-         State('available-stars', 'data')]
+    # Star buttons are styled, and `selected-stars` rebuilt, in the browser: an even click count is active,
+    # ratings missing from `available-stars` are greyed out and 0.25 follows the "Selected" toggle button
+    register_star_button_callback(
+        app, 'filter-button-mainpage', class_name='me-1 star-button',
+        selection=StarSelection('selected-stars', 'available-stars', 'toggle-selected-btn')
     )
-    def update_button_active_state(n_clicks_list, toggle_selected_clicks, ids,
-                                   current_stars, available_stars):
-        # Handle cases where not all data is available, especially at initialization
-        if (not n_clicks_list or not available_stars or len(available_stars) == 0) and available_stars != [0.25]:
-            raise PreventUpdate
-
-        # Initialize empty lists to store class names and styles
-        class_names = []
-        styles = []
-
-        # Initialize the new list of active stars from current state filtered by available stars
-        new_stars = [star for star in current_stars if star in available_stars and star != 0.25]
-
-        for i, button_id in enumerate(ids):
-            index = button_id['index']
-            n_clicks = n_clicks_list[i] if i < len(n_clicks_list) else 0  # fallback to 0
-
-            if index not in available_stars:
-                # Still return something so Dash output lengths match
-                class_names.append("me-1 star-button inactive")
-                styles.append({
-                    "display": "inline-block",
-                    "width": "100%",
-                    "backgroundColor": "#cccccc"
-                })
-                continue
-
-            # Determine if the button is active (even number of clicks means active)
-            is_active = n_clicks % 2 == 0
-
-            if is_active:
-                if index not in new_stars:
-                    new_stars.append(index)
-                background_color = color_map[index]
-            else:
-                if index in new_stars:
-                    new_stars.remove(index)
-                background_color = (
-                    f"rgba({int(color_map[index][1:3], 16)},"
-                    f"{int(color_map[index][3:5], 16)},"
-                    f"{int(color_map[index][5:7], 16)},0.6)"
-                )
-
-            class_name = "me-1 star-button" + (" active" if is_active else "")
-            color_style = {
-                "display": "inline-block",
-                "width": "100%",
-                "backgroundColor": background_color,
-            }
-            class_names.append(class_name)
-            styles.append(color_style)
-
-        # ---- Toggle Selected Button Logic ----
-        selected_active = toggle_selected_clicks % 2 == 0
-        if selected_active and 0.25 not in new_stars:
-            new_stars.append(0.25)
-        elif not selected_active and 0.25 in new_stars:
-            new_stars.remove(0.25)
-
-        selected_class = "selected-toggle-button" + (" active" if selected_active else " inactive")
-        # Compute display: show the toggle button only if 0.25 is an available star rating
-        toggle_display = "block" if 0.25 in available_stars else "none"
-        selected_style = {
-            "display": toggle_display,
-        }
-
-        return class_names, styles, new_stars, selected_class, selected_style
 
     @app.callback(
         Output('restaurant-details', 'children'),
@@ -312,23 +279,19 @@ def register_guide_callbacks(app, data):
         if not selected_stars:
             return select_stars_placeholder
 
-        include_monaco = selected_region == "Provence-Alpes-Côte d'Azur"
-        combined_data = get_combined_restaurant_data(include_monaco)
-
         # Determine which input triggered the callback
         triggered_id = ctx.triggered[0]['prop_id'].split('.')[0]
 
-        # Handle map clicks
+        # Handle map clicks; markers carry their restaurant ID, and only markers on the displayed map can be clicked
         if triggered_id == 'map-display':
             if clickData and 'points' in clickData and len(clickData['points']) > 0:
                 point = clickData['points'][0]
-                restaurant_index = point.get('meta') or point.get('customdata')
+                restaurant_id = point.get('customdata')
+                restaurant_info = restaurant_details.get(restaurant_id)
 
-                if restaurant_index in combined_data.index:
-                    restaurant_info = combined_data.loc[restaurant_index]
-                    # Check if the restaurant's star rating is in selected_stars
-                    if restaurant_info['stars'] in selected_stars:
-                        return get_restaurant_details(restaurant_info)
+                # Check if the restaurant's star rating is in selected_stars
+                if restaurant_info and restaurant_info['stars'] in selected_stars:
+                    return restaurant_cards.card(restaurant_id)
             return restaurant_placeholder
 
         # For any other triggers, clear the restaurant details
@@ -353,25 +316,25 @@ def register_guide_callbacks(app, data):
             return 'hidden-paris-section', [], None
 
     @app.callback(
-        Output('map-display', 'figure'),
+        [Output('map-display', 'figure'),
+         Output('map-display-contents', 'data')],
         [Input('department-dropdown', 'value'),
          Input('region-dropdown', 'value'),
          Input('selected-stars', 'data'),
          Input('arrondissement-dropdown', 'value')],
         [State('map-view-store-mainpage', 'data'),
          State('department-centroid-store', 'data'),
-         State('paris-arrondissement-centroid', 'data')]
+         State('paris-arrondissement-centroid', 'data'),
+         State('map-display-contents', 'data')]
     )
     def update_map(selected_department, selected_region, selected_stars, paris_arrondissement,
-                   mapview_data, dept_viewdata, arron_viewdata):
+                   mapview_data, dept_viewdata, arron_viewdata, displayed):
         ctx = callback_context
         triggered_id, _ = ctx.triggered[0]['prop_id'].split('.') if ctx.triggered else (None, None)
 
         # Use combined restaurant + geo data for PACA
         include_monaco = selected_region == "Provence-Alpes-Côte d'Azur"
-        restaurant_data = get_combined_restaurant_data(include_monaco=include_monaco)
-        geo_df_dynamic = get_geo_df(include_monaco=include_monaco)
-        dept_to_code_dynamic = geo_df_dynamic.drop_duplicates(subset='department').set_index('department')['code'].to_dict()
+        dept_to_code_dynamic = get_dept_to_code(include_monaco=include_monaco)
 
         # Set view_data once, then reuse it
         view_data = mapview_data if mapview_data else dept_viewdata
@@ -385,38 +348,157 @@ def register_guide_callbacks(app, data):
                 view_data = mapview_data if mapview_data else arron_viewdata
                 if triggered_id == 'selected-stars':
                     # Plot selected arrondissement with stars
-                    if selected_stars:
-                        return plot_paris_arrondissement(restaurant_data, paris_df, paris_arrondissement, selected_stars, view_data)
-                    return plot_arrondissement_outlines(paris_df, paris_arrondissement, view_data)
+                    key = ('arrondissement', include_monaco, paris_arrondissement)
+                    if selected_stars or _is_displayed(key, displayed):
+                        return marker_figure(key, selected_stars, view_data, displayed)
+                    return arrondissement_outline_figure(paris_arrondissement, view_data)
 
             # Plot entire Paris department when no arrondissement selected
             view_data = mapview_data if mapview_data else dept_viewdata
             if triggered_id == 'selected-stars':
-                if selected_stars:
-                    return plot_interactive_department(restaurant_data, geo_df_dynamic, department_code, selected_stars, view_data)
-                return plot_department_outlines(geo_df_dynamic, department_code, view_data)
+                key = ('department', include_monaco, department_code)
+                if selected_stars or _is_displayed(key, displayed):
+                    return marker_figure(key, selected_stars, view_data, displayed)
+                return department_outline_figure(department_code, include_monaco, view_data)
 
         # Case 1: Department selected (non-Paris)
         if triggered_id == 'department-dropdown' and selected_department:
             department_code = dept_to_code_dynamic.get(selected_department)
-            return plot_department_outlines(geo_df_dynamic, department_code, view_data)
+            return department_outline_figure(department_code, include_monaco, view_data)
 
         # Case 2: Handle stars selection
         if triggered_id == 'selected-stars' and selected_department:
             department_code = dept_to_code_dynamic.get(selected_department)
-            if selected_stars:
-                return plot_interactive_department(restaurant_data, geo_df_dynamic, department_code, selected_stars, view_data)
+            key = ('department', include_monaco, department_code)
+            if selected_stars or _is_displayed(key, displayed):
+                return marker_figure(key, selected_stars, view_data, displayed)
             else:
-                return plot_department_outlines(geo_df_dynamic, department_code, view_data)
+                return department_outline_figure(department_code, include_monaco, view_data)
 
         # Case 3: Handle region selection
         if selected_region or triggered_id == 'region-dropdown':
             region_name = region_to_name.get(selected_region)
             if region_name:
-                return plot_regional_outlines(region_df, region_name)
+                level = outline_level(FRANCE_ZOOM)
+                figure, outline_trace = figure_cache.get_or_build(
+                    ('region', region_name, level),
+                    lambda: _with_outline_trace(plot_regional_outlines(
+                        region_df, region_name, outline=guide_outlines.outline('region', region_name, level)
+                    )),
+                )
+                return figure, _contents(outline=('region', region_name, outline_trace, level))
 
         # Default fallback case: Show entire country map if no specific input
-        return default_map_figure()
+        return figure_cache.get_or_build(('default',), lambda: default_map_figure().to_dict()), None
+
+    @app.callback(
+        [Output('map-display', 'figure', allow_duplicate=True),
+         Output('map-display-contents', 'data', allow_duplicate=True)],
+        Input('map-display', 'relayoutData'),
+        State('map-display-contents', 'data'),
+        prevent_initial_call=True
+    )
+    def refine_map_outline(relayout_data, displayed):
+        # Swap the outline for its level of detail at the new zoom, once the zoom crosses a level boundary
+        zoom = (relayout_data or {}).get('map.zoom')
+        outline = (displayed or {}).get('outline')
+        if zoom is None or not outline:
+            raise PreventUpdate
+
+        level = outline_level(zoom)
+        coordinates = guide_outlines.outline(outline['kind'], outline['name'], level)
+        if level == outline['level'] or coordinates is None:
+            raise PreventUpdate
+
+        lon, lat = coordinates
+        patched_figure = Patch()
+        patched_figure['data'][outline['trace']]['lon'] = lon
+        patched_figure['data'][outline['trace']]['lat'] = lat
+        # Keep the view the user has just moved to rather than the figure's original one
+        patched_figure['layout']['map']['zoom'] = zoom
+        if relayout_data.get('map.center'):
+            patched_figure['layout']['map']['center'] = relayout_data['map.center']
+        return patched_figure, {**displayed, 'outline': {**outline, 'level': level}}
+
+    # Figures are cached without a view (zoom_data=None) and the stored view is overlaid on every response.
+    # Layered figures carry every star rating of their department or arrondissement, so they are cached per
+    # location and star toggles on the displayed figure become a Patch of trace visibility. Outlines are
+    # cached per level of detail, picked from the view's zoom or the builder's default zoom.
+
+    def build_marker_figure(key, stars, level):
+        kind, include_monaco, location = key
+        # Only the location's rows at the requested star levels reach the figure builder
+        if kind == 'arrondissement':
+            restaurant_data = restaurant_index.arrondissement(location, stars, include_monaco)
+            fig = plot_paris_arrondissement(restaurant_data, paris_df, location, stars, marker_mode=marker_mode,
+                                            outline=guide_outlines.outline('arrondissement', location, level))
+        else:
+            restaurant_data = restaurant_index.department(location, stars, include_monaco)
+            fig = plot_interactive_department(restaurant_data, get_geo_df(include_monaco), location, stars,
+                                              marker_mode=marker_mode,
+                                              outline=guide_outlines.outline('department', str(location), level))
+        figure, outline_trace = _with_outline_trace(fig)
+        return figure, frozenset(restaurant_data['stars'].unique()), star_trace_indices(figure), outline_trace
+
+    def marker_figure(key, selected_stars, view_data, displayed):
+        selected = frozenset(selected_stars)
+        zoom = _view_zoom(view_data)
+        center = _view_center(view_data)
+        if not _has_full_center(key[0], center):
+            center = None
+
+        is_displayed = _is_displayed(key, displayed)
+        if is_displayed and displayed.get('outline'):
+            level = displayed['outline']['level']
+        elif key[0] == 'arrondissement':
+            level = outline_level(ARRONDISSEMENT_ZOOM if zoom is None else zoom)
+        else:
+            level = outline_level(DEPARTMENT_ZOOM_BY_CODE.get(key[2], DEPARTMENT_ZOOM) if zoom is None else zoom)
+
+        if star_toggles:
+            figure, stars_present, star_traces, outline_trace = figure_cache.get_or_build(
+                key + (level,), lambda: build_marker_figure(key, list(color_map), level)
+            )
+        else:
+            figure, stars_present, star_traces, outline_trace = figure_cache.get_or_build(
+                key + (level, _star_key(selected)), lambda: build_marker_figure(key, list(selected), level)
+            )
+        outline_name = key[2] if key[0] == 'arrondissement' else str(key[2])
+        contents = _contents(
+            key=key if star_toggles else None,
+            stars=selected,
+            outline=(key[0], outline_name, outline_trace, level),
+        )
+
+        # A location already in the browser only has its toggled ratings flipped
+        displayed_stars = frozenset(displayed['stars']) if is_displayed else None
+        return marker_map(figure, stars_present, star_traces, selected, zoom, center, displayed_stars), contents
+
+    def department_outline_figure(department_code, include_monaco, view_data):
+        zoom = _view_zoom(view_data)
+        level = outline_level(FRANCE_ZOOM if zoom is None else zoom)
+        outline_name = str(department_code)
+        figure, outline_trace = figure_cache.get_or_build(
+            ('department-outline', include_monaco, department_code, level),
+            lambda: _with_outline_trace(plot_department_outlines(
+                get_geo_df(include_monaco), department_code,
+                outline=guide_outlines.outline('department', outline_name, level),
+            )),
+        )
+        contents = _contents(outline=('department', outline_name, outline_trace, level))
+        return with_map_view(figure, zoom, _view_center(view_data)), contents
+
+    def arrondissement_outline_figure(arrondissement, view_data):
+        zoom = _view_zoom(view_data)
+        level = outline_level(ARRONDISSEMENT_ZOOM if zoom is None else zoom)
+        figure, outline_trace = figure_cache.get_or_build(
+            ('arrondissement-outline', arrondissement, level),
+            lambda: _with_outline_trace(plot_arrondissement_outlines(
+                paris_df, arrondissement, outline=guide_outlines.outline('arrondissement', arrondissement, level)
+            )),
+        )
+        contents = _contents(outline=('arrondissement', arrondissement, outline_trace, level))
+        return with_map_view(figure, zoom, _view_center(view_data)), contents
 
     @app.callback(
         Output('department-centroid-store', 'data'),
@@ -427,40 +509,8 @@ def register_guide_callbacks(app, data):
         if not selected_department:
             return {}
 
-        # Dynamically include Monaco for PACA
-        include_monaco = selected_region == "Provence-Alpes-Côte d'Azur"
-        geo_df_dynamic = get_geo_df(include_monaco=include_monaco)
-
-        # Generate dept_to_code dynamically from the active geo_df
-        dept_to_code_dynamic = geo_df_dynamic.drop_duplicates(subset='department').set_index('department')[
-            'code'].to_dict()
-        department_code = dept_to_code_dynamic.get(selected_department)
-
-        if not department_code:
-            return {}
-
-        filtered_geo = geo_df_dynamic[geo_df_dynamic['code'] == str(department_code)]
-        if filtered_geo.empty:
-            return {}
-
-        specific_geometry = filtered_geo['geometry'].iloc[0]
-        centroid = specific_geometry.centroid
-
-        # Adjust zoom level
-        if department_code == '75':
-            zoom_level = 11  # Paris
-        elif department_code == '98':
-            zoom_level = 13.5  # Monaco
-        else:
-            zoom_level = 8
-
-        return {
-            'zoom': zoom_level,
-            'center': {
-                'lat': centroid.y,
-                'lon': centroid.x
-            }
-        }
+        # Centroid and zoom are precomputed at load time (Monaco only within PACA)
+        return guide_views.department_view(selected_region, selected_department)
 
     @app.callback(
         Output('paris-arrondissement-centroid', 'data'),
@@ -470,29 +520,7 @@ def register_guide_callbacks(app, data):
         if not selected_arrondissement:
             return {}
 
-        # Find the geometry for the selected arrondissement
-        filtered_geo = paris_df[paris_df['arrondissement'] == selected_arrondissement]
-
-        if filtered_geo.empty:
-            return {}  # Return empty if the arrondissement is not found
-
-        # Calculate the centroid of the selected arrondissement's geometry
-        specific_geometry = filtered_geo['geometry'].iloc[0]
-        centroid = specific_geometry.centroid
-
-        # Set a zoom level for Paris arrondissements
-        zoom_level = 13
-
-        # Create the dictionary to store
-        stored_data = {
-            'zoom': zoom_level,
-            'center': {
-                'lat': centroid.y,
-                'lon': centroid.x
-            }
-        }
-
-        return stored_data
+        return guide_views.arrondissement_view(selected_arrondissement)
 
     @app.callback(
         Output('map-view-store-mainpage', 'data'),
@@ -4,7 +4,8 @@ from dash.dependencies import ALL, Input, Output, State
 from dash.exceptions import PreventUpdate
 from flask import session
 
-from app.utils.star_filters import update_button_active_state_helper
+from app.utils.lazy_loading import LazyValue
+from app.utils.star_filters import register_star_button_callback
 from app.utils.wine_figures import (
     RESTAURANT_STAR_ORDER,
     RESTAURANT_TRACE_INDICES,
@@ -191,16 +192,21 @@ def build_wine_info_response(
         return f"Error fetching region details: {str(e)}", {"display": "none"}, no_update, {"display": "none"}
 
 
+def build_wine_lookups(wine_df):
+    """Return the AOC feature, search record and search lookup tables the Wine callbacks share."""
+    wine_search_records = build_wine_search_index(wine_df)
+    return {
+        "features": wine_df.set_index("feature_id")[["region", "app", "colour"]].to_dict("index"),
+        "search_records": wine_search_records,
+        "search_lookup": wine_search_lookup(wine_search_records),
+    }
+
+
 def register_wine_callbacks(app, data, config, cache, openai_client):
     all_france = data.all_france
-    wine_df = data.wine_df
     region_df = data.region_df
-    wine_feature_lookup = (
-        wine_df.set_index("feature_id")[["region", "app", "colour"]]
-        .to_dict("index")
-    )
-    wine_search_records = build_wine_search_index(wine_df)
-    wine_feature_search_lookup = wine_search_lookup(wine_search_records)
+    # The AOC layer loads on the first Wine request, or earlier through MichelinData.warm
+    wine_lookups = LazyValue(lambda: build_wine_lookups(data.wine_df))
 
     def is_request_limit_exceeded():
         # Request limit for OpenAi API calls
@@ -226,7 +232,7 @@ def register_wine_callbacks(app, data, config, cache, openai_client):
             raise PreventUpdate
 
         return plot_wine_choropleth_plotly(
-            wine_df=wine_df,
+            wine_df=data.wine_df,
             zoom_data=map_view_data,
             regional_outline_df=region_df,
             restaurants_df=all_france,
@@ -262,7 +268,7 @@ def register_wine_callbacks(app, data, config, cache, openai_client):
     def update_wine_region_options(pathname):
         if pathname != '/wine':
             raise PreventUpdate
-        return wine_region_options(wine_search_records)
+        return wine_region_options(wine_lookups.get()["search_records"])
 
     @app.callback(
         Output('wine-appellation-search', 'options'),
@@ -271,7 +277,7 @@ def register_wine_callbacks(app, data, config, cache, openai_client):
         State('wine-appellation-search', 'value'),
     )
     def update_wine_appellation_options(search_value, selected_region, selected_feature_id):
-        available_records = wine_records_for_region(wine_search_records, selected_region)
+        available_records = wine_records_for_region(wine_lookups.get()["search_records"], selected_region)
         return wine_search_options(
             available_records,
             search_value=search_value,
@@ -289,7 +295,7 @@ def register_wine_callbacks(app, data, config, cache, openai_client):
     def navigate_to_wine_region(selected_region, existing_map_view):
         response = region_navigation_response(
             selected_region,
-            wine_search_records,
+            wine_lookups.get()["search_records"],
             existing_map_view,
         )
         if response is None:
@@ -306,7 +312,7 @@ def register_wine_callbacks(app, data, config, cache, openai_client):
     def navigate_to_wine_appellation(selected_feature_id, existing_map_view):
         response = search_navigation_response(
             selected_feature_id,
-            wine_feature_search_lookup,
+            wine_lookups.get()["search_lookup"],
             existing_map_view,
         )
         if response is None:
@@ -324,16 +330,7 @@ def register_wine_callbacks(app, data, config, cache, openai_client):
             return map_view
         raise dash.exceptions.PreventUpdate
 
-    @app.callback(
-        [Output({'type': 'filter-button-wine', 'index': ALL}, 'className'),
-         Output({'type': 'filter-button-wine', 'index': ALL}, 'style')],
-        [Input({'type': 'filter-button-wine', 'index': ALL}, 'n_clicks')],
-        [State({'type': 'filter-button-wine', 'index': ALL}, 'id')]
-    )
-    def update_wine_button_active_state(n_clicks_list, ids):
-        if not n_clicks_list:
-            raise PreventUpdate
-        return update_button_active_state_helper(n_clicks_list, ids, 'wine')
+    register_star_button_callback(app, 'filter-button-wine', 'wine')
 
     @app.callback(
         [Output('llm-output-container', 'children'),
@@ -345,7 +342,7 @@ def register_wine_callbacks(app, data, config, cache, openai_client):
     def update_wine_info(clickData):
         return build_wine_info_response(
             click_data=clickData,
-            feature_lookup=wine_feature_lookup,
+            feature_lookup=wine_lookups.get()["features"],
             cache=cache,
             openai_client=openai_client,
             is_request_limit_exceeded=is_request_limit_exceeded,
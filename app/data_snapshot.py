@@ -0,0 +1,107 @@
+import hashlib
+import logging
+import os
+import pickle
+import platform
+import tempfile
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Bump when the shape of the snapshotted frames changes without any source file changing
+SNAPSHOT_VERSION = 1
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def _runtime_key():
+    # Pickled frames are only portable between identical Python and library versions
+    return (
+        SNAPSHOT_VERSION,
+        platform.python_version(),
+        np.__version__,
+        pd.__version__,
+        gpd.__version__,
+        shapely.__version__,
+    )
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as source:
+        for chunk in iter(lambda: source.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _file_stat(path: Path):
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def source_fingerprint(paths) -> dict[str, tuple[int, int, str]]:
+    """Return `{filename: (size, mtime_ns, sha256)}` for the snapshot's source files."""
+    return {path.name: (*_file_stat(path), _file_digest(path)) for path in paths}
+
+
+def _sources_match(paths, fingerprint) -> bool:
+    if sorted(fingerprint) != sorted(path.name for path in paths):
+        return False
+
+    for path in paths:
+        size, mtime_ns, digest = fingerprint[path.name]
+        current_size, current_mtime_ns = _file_stat(path)
+        if current_size != size:
+            return False
+        # Unchanged stats are trusted; otherwise (e.g. a fresh checkout or slug) compare content
+        if current_mtime_ns != mtime_ns and _file_digest(path) != digest:
+            return False
+    return True
+
+
+def load_snapshot(snapshot_path: Path, sources):
+    """
+    Return the frames stored at `snapshot_path`, or None if the snapshot is missing or stale.
+
+    The header is unpickled first, so a stale snapshot is rejected without reading its frames.
+    Unreadable snapshots are logged and treated as missing.
+    """
+    try:
+        with snapshot_path.open("rb") as snapshot:
+            header = pickle.load(snapshot)
+            if header.get("runtime") != _runtime_key() or not _sources_match(sources, header.get("sources", {})):
+                return None
+            return pickle.load(snapshot)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        LOGGER.warning("Ignoring unreadable data snapshot %s: %s", snapshot_path, exc)
+        return None
+
+
+def write_snapshot(snapshot_path: Path, fingerprint, frames):
+    """
+    Atomically write `frames` to `snapshot_path`, keyed by a `source_fingerprint` result.
+
+    Failures are logged rather than raised; the app still runs from the parsed sources.
+    """
+    header = {"runtime": _runtime_key(), "sources": fingerprint}
+    temp_path = None
+    try:
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=snapshot_path.parent, prefix=f".{snapshot_path.name}.", delete=False
+        ) as snapshot:
+            temp_path = Path(snapshot.name)
+            pickle.dump(header, snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(frames, snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, snapshot_path)
+    except Exception as exc:
+        LOGGER.warning("Could not write data snapshot %s: %s", snapshot_path, exc)
+        if temp_path is not None:
+            temp_path.unlink(missing_ok=True)
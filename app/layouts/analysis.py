@@ -109,7 +109,8 @@ def get_regions_section():
                                     dcc.Graph(
                                         id='region-map',
                                         config={'displayModeBar': False}
-                                    )
+                                    ),
+                                    dcc.Store(id='region-map-areas', data=None)    # Feature IDs the map shows
                                 ],
                                 style={'width': '50%', 'display': 'inline-block'}
                             )
@@ -195,7 +196,8 @@ def get_departments_section():
                                     dcc.Graph(
                                         id='department-map',
                                         config={'displayModeBar': False}
-                                    )
+                                    ),
+                                    dcc.Store(id='department-map-areas', data=None)    # Feature IDs the map shows
                                 ],
                             )
                         ]
@@ -286,7 +288,8 @@ def get_arrondissements_section():
                                     dcc.Graph(
                                         id='arrondissement-map',
                                         config={'displayModeBar': False}
-                                    )
+                                    ),
+                                    dcc.Store(id='arrondissement-map-areas', data=None)    # Feature IDs the map shows
                                 ],
                                 style={'width': '50%', 'display': 'inline-block'}
                             )
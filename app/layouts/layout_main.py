@@ -271,6 +271,8 @@ def get_main_content_with_city_match(unique_regions):
             }
         ),
         dcc.Store(id='map-view-store-mainpage', data={}),
+        # Which figure the map is showing, so star toggles can patch it instead of resending it
+        dcc.Store(id='map-display-contents', data=None),
     ], className='map-section')
 
     # Star Ratings Section (below map and sidebar)
@@ -1,10 +1,13 @@
+import json
+from dataclasses import dataclass
+
 import geopandas as gpd
+import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
-from dash import html
-from shapely.geometry import Point
+from dash import Patch, dcc, html
 
 from app.components.shared import green_star, michelin_stars
-from app.utils.restaurant_cards import get_restaurant_details
 
 ANALYSIS_RATING_COLORS = {
     0.5: "#7a2466",
@@ -23,6 +26,205 @@ ANALYSIS_CHOROPLETH_COLORSCALE = [
     [1.0, "#a91f29"],
 ]
 
+# Column identifying each choropleth area; it becomes the GeoJSON feature `id` the traces match on
+CHOROPLETH_FEATURE_ID_COLUMNS = {
+    'region': 'region',
+    'department': 'code',
+    'arrondissement': 'code',
+}
+
+# Count column behind each star level the analysis filters offer
+STAR_COUNT_COLUMNS = {
+    0.5: 'bib_gourmand',
+    1: '1_star',
+    2: '2_star',
+    3: '3_star',
+}
+
+
+def choropleth_feature_ids(df, granularity):
+    """Return the GeoJSON feature IDs of the areas in `df`, in row order."""
+    if granularity not in CHOROPLETH_FEATURE_ID_COLUMNS:
+        raise ValueError(f"Invalid granularity: {granularity}. Choose from ['region', 'department', 'arrondissement'].")
+    return df[CHOROPLETH_FEATURE_ID_COLUMNS[granularity]].astype(str).tolist()
+
+
+def choropleth_features(df, granularity):
+    """
+    Serialise the area outlines of a granularity once, for choropleths to reference by feature ID.
+
+    Args:
+        df (GeoDataFrame): Areas at `granularity`, in EPSG:4326.
+        granularity (str): 'region', 'department' or 'arrondissement'.
+
+    Returns:
+        dict: {feature_id: GeoJSON feature}, each feature carrying only its `id` and geometry.
+    """
+    feature_ids = choropleth_feature_ids(df, granularity)
+    if len(set(feature_ids)) != len(feature_ids):
+        raise RuntimeError(f"{granularity} choropleth areas must have unique feature IDs")
+
+    geometries = gpd.GeoSeries(df.geometry.values, index=feature_ids, crs=df.crs)
+    return {feature['id']: feature for feature in json.loads(geometries.to_json())['features']}
+
+
+# Column grouping the areas drawn together on one choropleth, which share a view
+CHOROPLETH_VIEW_GROUP_COLUMNS = {
+    'department': 'region',
+    'arrondissement': 'department',
+}
+
+# The region choropleth always shows the whole of France
+FRANCE_CHOROPLETH_VIEW = {
+    'center': {'lat': 46.603354, 'lon': 1.888334},
+    'projection_scale': 6,
+}
+
+
+def _choropleth_projection_scale(granularity, region, department_num=None):
+    if granularity == 'department':
+        return 30 if region == 'Île-de-France' else 11  # Île-de-France departments are small
+    if department_num == '75':
+        return 300  # High zoom for Paris arrondissements
+    if region == 'Île-de-France':
+        return 125
+    return 25  # Default zoom for other arrondissements
+
+
+def choropleth_views(df, granularity):
+    """
+    Precompute the choropleth view of every group of areas drawn together.
+
+    Departments are drawn by region and arrondissements by department. A group is centred on the mean
+    of its areas' Web Mercator centroids, so the reprojection runs once here rather than per figure.
+
+    Args:
+        df (GeoDataFrame): Areas at `granularity`, in EPSG:4326.
+        granularity (str): 'department' or 'arrondissement'.
+
+    Returns:
+        dict: {group: {'center': {'lat', 'lon'}, 'projection_scale': scale}}, keyed by region or department.
+    """
+    group_column = CHOROPLETH_VIEW_GROUP_COLUMNS[granularity]
+    centroids = df.geometry.to_crs(epsg=3857).centroid
+    groups = pd.DataFrame({'x': centroids.x.to_numpy(), 'y': centroids.y.to_numpy()}, index=df[group_column].to_numpy())
+    means = groups.groupby(level=0, sort=False).mean()
+    centers = gpd.GeoSeries.from_xy(means['x'], means['y'], crs='EPSG:3857').to_crs(epsg=4326)
+
+    # The first area of a group decides its scale, as the figure builder did per selection
+    first_rows = df.drop_duplicates(subset=group_column)
+    department_nums = first_rows['department_num'] if 'department_num' in first_rows else [None] * len(first_rows)
+    scales = {
+        group: _choropleth_projection_scale(granularity, region, department_num)
+        for group, region, department_num in zip(first_rows[group_column], first_rows['region'], department_nums)
+    }
+    return {
+        group: {'center': {'lat': float(center.y), 'lon': float(center.x)}, 'projection_scale': scales[group]}
+        for group, center in zip(means.index, centers)
+    }
+
+
+def choropleth_view(df, granularity):
+    """Return the choropleth view of the areas in `df`, which must be drawn together."""
+    if granularity == 'region':
+        return FRANCE_CHOROPLETH_VIEW
+    return next(iter(choropleth_views(df, granularity).values()))
+
+
+def star_count_matrix(df):
+    """Return the (areas x star levels) restaurant counts of `df`, in STAR_COUNT_COLUMNS order."""
+    return df[list(STAR_COUNT_COLUMNS.values())].to_numpy()
+
+
+def choropleth_totals(counts, selected_stars):
+    """Return each area's restaurant count over the selected star levels, from `star_count_matrix` rows."""
+    selected = np.array([star in selected_stars for star in STAR_COUNT_COLUMNS])
+    return counts @ selected
+
+
+def choropleth_totals_patch(counts, selected_stars):
+    """Return a `Patch` recolouring a choropleth of the same areas for new star levels."""
+    patch = Patch()
+    patch['data'][0]['z'] = choropleth_totals(counts, selected_stars).tolist()
+    return patch
+
+
+@dataclass(frozen=True)
+class ChoroplethAreas:
+    """
+    The areas of one analysis map, in display order, with their star counts and the rows of each selectable group.
+
+    Each group's rows are sliced once here, so a single-group selection returns them as they are. Callers share
+    the returned frames and must not change them.
+    """
+    frame: gpd.GeoDataFrame
+    counts: np.ndarray
+    groups: dict[str, np.ndarray]
+    group_areas: dict[str, tuple[gpd.GeoDataFrame, np.ndarray]]
+
+    def select(self, groups):
+        """Return the areas in any of `groups`, in display order, and their `star_count_matrix` rows."""
+        selected = [group for group in dict.fromkeys(groups) if group in self.groups]
+        if len(selected) == 1:
+            return self.group_areas[selected[0]]
+
+        # Several regions on the region map are taken by row position, which keeps the display order
+        arrays = [self.groups[group] for group in selected]
+        positions = np.sort(np.concatenate(arrays)) if arrays else np.empty(0, dtype=np.intp)
+        return self.frame.iloc[positions], self.counts[positions]
+
+
+def build_choropleth_areas(df, group_column, sort_column=None):
+    """
+    Sort the areas of an analysis map once and index them by the column the page selects on.
+
+    Args:
+        df (GeoDataFrame): Areas of one granularity.
+        group_column (str): Column whose values the page's dropdown selects.
+        sort_column (str, optional): Column the map and bar chart list the areas by; source order when None.
+
+    Returns:
+        ChoroplethAreas: The sorted areas, their counts and the rows of each group.
+    """
+    frame = df.sort_values(sort_column) if sort_column else df
+    counts = star_count_matrix(frame)
+    codes, values = pd.factorize(frame[group_column])
+    groups = {value: np.flatnonzero(codes == code) for code, value in enumerate(values)}
+    return ChoroplethAreas(
+        frame=frame,
+        counts=counts,
+        groups=groups,
+        group_areas={group: (frame.iloc[positions], counts[positions]) for group, positions in groups.items()},
+    )
+
+
+@dataclass(frozen=True)
+class ChoroplethLayer:
+    """The areas, serialised outlines and group views behind the analysis maps of one granularity."""
+    areas: ChoroplethAreas
+    features: dict
+    views: dict
+
+
+def build_choropleth_layer(df, granularity, sort_column=None):
+    """
+    Prepare everything the analysis maps of a granularity need from its areas, ahead of any request.
+
+    Args:
+        df (GeoDataFrame): Areas at `granularity`, in EPSG:4326.
+        granularity (str): 'department' or 'arrondissement'.
+        sort_column (str, optional): Column the map and bar chart list the areas by; source order when None.
+
+    Returns:
+        ChoroplethLayer: Areas selectable by their view group, with their features and views.
+    """
+    return ChoroplethLayer(
+        areas=build_choropleth_areas(df, CHOROPLETH_VIEW_GROUP_COLUMNS[granularity], sort_column=sort_column),
+        features=choropleth_features(df, granularity),
+        views=choropleth_views(df, granularity),
+    )
+
+
 def create_michelin_bar_chart(filtered_df, select_stars, granularity, title):
     """
     Create a stacked bar chart of Michelin restaurants for the given data and star levels.
@@ -112,7 +314,8 @@ def create_michelin_bar_chart(filtered_df, select_stars, granularity, title):
 
     return fig_bar
 
-def plot_single_choropleth_plotly(df, selected_stars, granularity='region', show_labels=True, cmap='Reds'):
+def plot_single_choropleth_plotly(df, selected_stars, granularity='region', show_labels=True, cmap='Reds',
+                                  features=None, view=None, counts=None):
     """
     Plot a single choropleth map using Plotly.
 
@@ -122,6 +325,10 @@ def plot_single_choropleth_plotly(df, selected_stars, granularity='region', show
         granularity (str): Level of granularity - 'department', or 'region'. Default is 'region'.
         show_labels (bool): Whether to show the labels. Default is True.
         cmap (str): The colormap to use. Default is 'Reds'.
+        features (dict, optional): Serialised outlines from `choropleth_features`, covering the areas in `df`.
+            Built from `df` when None.
+        view (dict, optional): The areas' entry from `choropleth_views`. Computed from `df` when None.
+        counts (np.ndarray, optional): The areas' `star_count_matrix` rows. Read from `df` when None.
 
     Returns:
         fig (Plotly Figure): The plotly figure object.
@@ -131,15 +338,14 @@ def plot_single_choropleth_plotly(df, selected_stars, granularity='region', show
     fig = go.Figure()
 
     # Calculate the total number of restaurants for the selected stars
-    df['total_restaurants'] = 0
-    if 0.5 in selected_stars:
-        df['total_restaurants'] += df['bib_gourmand']
-    if 1 in selected_stars:
-        df['total_restaurants'] += df['1_star']
-    if 2 in selected_stars:
-        df['total_restaurants'] += df['2_star']
-    if 3 in selected_stars:
-        df['total_restaurants'] += df['3_star']
+    if counts is None:
+        counts = star_count_matrix(df)
+    total_restaurants = choropleth_totals(counts, selected_stars)
+
+    feature_ids = choropleth_feature_ids(df, granularity)
+    if features is None:
+        features = choropleth_features(df, granularity)
+    geojson = {'type': 'FeatureCollection', 'features': [features[feature_id] for feature_id in feature_ids]}
 
     # Set the hover template and custom data based on granularity
     if granularity == 'region':
@@ -170,9 +376,10 @@ def plot_single_choropleth_plotly(df, selected_stars, granularity='region', show
     # Add the choropleth map with hover info based on granularity
     fig.add_trace(
         go.Choropleth(
-            geojson=df.__geo_interface__,  # GeoJSON representation of the dataframe
-            z=df['total_restaurants'],  # Use total restaurants for coloring
-            locations=df.index,  # Match the locations via index
+            geojson=geojson,  # Outlines of the areas in df, serialised once per granularity
+            featureidkey='id',
+            z=total_restaurants,  # Use total restaurants for coloring
+            locations=feature_ids,  # Match the areas by feature ID
             colorscale=colorscale,
             colorbar=dict(
                 title=dict(text='Restaurants', font=dict(size=12, color="#444444")),
@@ -213,51 +420,9 @@ def plot_single_choropleth_plotly(df, selected_stars, granularity='region', show
                 )
             )
 
-    # Determine custom centering and zoom level
-    if granularity == 'department':
-        selected_region = df['region'].unique()[0]  # Extract the region from the dataframe
-
-        # Re-project to Web Mercator (EPSG:3857) for accurate centroid calculation
-        df_projected = df.to_crs(epsg=3857)
-
-        if selected_region == 'Île-de-France':
-            # Custom centering for Île-de-France
-            centroids = df_projected.geometry.centroid
-            avg_x, avg_y = centroids.x.mean(), centroids.y.mean()
-            zoom_level = 30
-        else:
-            # General case for other departments
-            centroids = df_projected.geometry.centroid
-            avg_x, avg_y = centroids.x.mean(), centroids.y.mean()
-            zoom_level = 11
-
-        # Convert the projected centroids back to geographic CRS (EPSG:4326)
-        centroids_geo = gpd.GeoSeries([Point(avg_x, avg_y)], crs='EPSG:3857').to_crs(epsg=4326)
-        avg_lat, avg_lon = centroids_geo[0].y, centroids_geo[0].x
-
-    elif granularity == 'arrondissement':
-        # Re-project to Web Mercator (EPSG:3857) for accurate centroid calculation
-        df_projected = df.to_crs(epsg=3857)
-
-        # Handle arrondissement-level zoom and center
-        centroids = df_projected.geometry.centroid
-        avg_x, avg_y = centroids.x.mean(), centroids.y.mean()
-
-        if df['department_num'].unique()[0] == '75':  # Check if it's Paris
-            zoom_level = 300  # High zoom for Paris arrondissements
-        elif df['region'].unique()[0] == 'Île-de-France':
-            zoom_level = 125
-        else:
-            zoom_level = 25  # Default zoom for other arrondissements
-
-        # Convert the projected centroids back to geographic CRS (EPSG:4326)
-        centroids_geo = gpd.GeoSeries([Point(avg_x, avg_y)], crs='EPSG:3857').to_crs(epsg=4326)
-        avg_lat, avg_lon = centroids_geo[0].y, centroids_geo[0].x
-
-    else:
-        # Default centering on France
-        avg_lat, avg_lon = 46.603354, 1.888334
-        zoom_level = 6  # Default zoom for region-level map
+    # Centre and zoom come from the precomputed view of the areas drawn
+    if view is None:
+        view = choropleth_view(df, granularity)
 
     # Update the layout for the figure, centering on France and adjusting size
     fig.update_layout(
@@ -267,28 +432,85 @@ def plot_single_choropleth_plotly(df, selected_stars, granularity='region', show
             showcoastlines=False,
             showland=True,
             landcolor="#eeeeee",
-            center=dict(lat=avg_lat, lon=avg_lon),  # Custom center
-            projection_scale=zoom_level,  # Custom zoom
+            center=dict(view['center']),  # Custom center
+            projection_scale=view['projection_scale'],  # Custom zoom
         ),
         margin=dict(l=10, r=10, t=30, b=10),  # Reduce margins to reduce white space
     )
 
     return fig
 
-def top_restaurants(data, granularity, star_rating, top_n, display_restaurants=True):
+# "Top N" ranking choices offered on the Analysis page; a top N of 1 ranks Paris or Île-de-France
+RANKING_GRANULARITIES = ('region', 'department', 'arrondissement')
+RANKING_STAR_RATINGS = (2, 3, 'green')
+RANKING_TOP_N = (3, 5, 1)
+
+# Restaurant cards shown per ranked area before its "Show more" button; each click loads one more page
+RANKING_CARDS_PAGE_SIZE = 6
+
+
+@dataclass(frozen=True)
+class RankedArea:
+    """An area in a "Top N" ranking, with its display label and the restaurants it counts."""
+    area: str
+    label: str
+    restaurant_count: int
+    restaurant_ids: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Ranking:
+    """The top areas of a ranking, and the areas outside them tied with the last one."""
+    top_areas: tuple[RankedArea, ...]
+    tied_areas: tuple[RankedArea, ...]
+
+    @property
+    def areas(self):
+        """All ranked areas in display order, top areas first."""
+        return self.top_areas + self.tied_areas
+
+
+def ranking_restaurants(restaurants, granularity, top_n):
+    """
+    Return the restaurants a "Top N" ranking counts and the number of areas it ranks.
+
+    A top N of 1 focuses on Paris (departments and arrondissements) or Île-de-France (regions); arrondissements
+    then rank the top 5. Otherwise Île-de-France is left out, and so is Paris from the department top 3 and 5.
     """
-    Returns a list of Dash components for top_n regions, departments, or arrondissements with the highest count of
-    'star_rating' restaurants. Tied areas outside the top N are grouped separately.
+    if top_n == 1 and granularity == 'department':
+        return restaurants[restaurants['department_num'] == '75'], top_n  # Only Paris restaurants
+    if top_n == 1 and granularity == 'region':
+        return restaurants[restaurants['region'] == 'Île-de-France'], top_n  # Only Île-de-France restaurants
+    if top_n == 1 and granularity == 'arrondissement':
+        return restaurants[restaurants['department_num'] == '75'], 5  # Paris arrondissements, top 5
+
+    # General case: filter out Île-de-France if not Paris
+    restaurants = restaurants[restaurants['region'] != 'Île-de-France']
+    if granularity == 'department' and top_n in [3, 5]:
+        restaurants = restaurants[restaurants['department_num'] != '75']  # Exclude Paris
+    return restaurants, top_n
+
+
+def _ranked_area_label(granularity, area, first_row):
+    if granularity == 'department':
+        return f"{area} ({first_row['department_num']}): {first_row['region']}"
+    if granularity == 'arrondissement':
+        return f"{area}, {first_row['department']} ({first_row['department_num']}), {first_row['region']}"
+    return area
+
+
+def rank_areas(data, granularity, star_rating, top_n):
+    """
+    Rank the regions, departments, or arrondissements of `data` by their count of 'star_rating' restaurants.
 
     Args:
         data (pandas.DataFrame): The dataset containing restaurant info.
         granularity (str): Either 'region', 'department', or 'arrondissement'.
-        star_rating (int): The Michelin star rating (2 or 3).
+        star_rating (int or str): The Michelin star rating (2 or 3), or 'green'.
         top_n (int): The number of top (granularity) to consider.
-        display_restaurants (bool): Whether to display individual restaurants. Default is True.
 
     Returns:
-        list: Dash components containing the ranking or restaurant details, with ties grouped separately.
+        Ranking: The top_n areas and any areas tied with the last of them, empty when no restaurant qualifies.
     """
     # Ensure the data contains necessary columns based on granularity
     if granularity not in data.columns:
@@ -297,126 +519,167 @@ def top_restaurants(data, granularity, star_rating, top_n, display_restaurants=T
     # Filter the data based on star type
     if star_rating == 'green':
         filtered_data = data[data['greenstar'] == 1]
-        star_icon = html.Span(green_star(with_margin=False), style={"vertical-align": "middle"})
     else:
         filtered_data = data[data['stars'] == star_rating]
-        star_icon = html.Span(michelin_stars(star_rating), style={"vertical-align": "middle"})
-
-    # Special handling for Paris department or Île-de-France region
-    if top_n == 'paris':
-        if granularity == 'department':
-            filtered_data = filtered_data[filtered_data['department_num'] == '75']  # Focus on Paris department
-        elif granularity == 'region':
-            filtered_data = filtered_data[filtered_data['region'] == 'Île-de-France']  # Focus on Île-de-France region
-        # Calculate restaurant counts for each area
-        restaurant_counts = filtered_data[granularity].value_counts()
-        top_areas = restaurant_counts.nlargest(top_n)
 
-    else:
-        # General case for other regions, departments, or arrondissements
-        restaurant_counts = filtered_data[granularity].value_counts()
-        top_areas = restaurant_counts.nlargest(top_n)
+    # Calculate restaurant counts for each area
+    restaurant_counts = filtered_data[granularity].value_counts()
+    top_areas = restaurant_counts.nlargest(top_n)
+    if top_areas.empty:
+        return Ranking(top_areas=(), tied_areas=())
+
+    first_rows = filtered_data.drop_duplicates(subset=granularity).set_index(granularity)
+    restaurant_ids = filtered_data.groupby(granularity, sort=False)['restaurant_id'].agg(tuple)
+
+    def ranked_area(area, restaurant_count):
+        return RankedArea(
+            area=area,
+            label=_ranked_area_label(granularity, area, first_rows.loc[area]),
+            restaurant_count=int(restaurant_count),
+            restaurant_ids=restaurant_ids[area],
+        )
 
     # Detect if there are any tied areas outside the top N
     all_tied_areas = restaurant_counts[restaurant_counts == top_areas.iloc[-1]]  # All areas tied for last place
-    is_tied = len(all_tied_areas) > len(top_areas)
+    tied_areas = ()
+    if len(all_tied_areas) > len(top_areas):
+        tied_areas = tuple(
+            ranked_area(area, restaurant_count)
+            for area, restaurant_count in all_tied_areas.items()
+            if area not in top_areas.index  # Only include tied areas outside top N
+        )
+
+    return Ranking(
+        top_areas=tuple(ranked_area(area, restaurant_count) for area, restaurant_count in top_areas.items()),
+        tied_areas=tied_areas,
+    )
+
 
+def build_ranking_table(restaurants):
+    """
+    Rank every "Top N" choice the Analysis page offers once, so the ranking callback only renders.
+
+    Args:
+        restaurants (pandas.DataFrame): France restaurants, with 'restaurant_id' values.
+
+    Returns:
+        dict: {(granularity, star_rating, top_n): Ranking}, keyed by the page's dropdown values.
+    """
+    table = {}
+    for granularity in RANKING_GRANULARITIES:
+        for top_n in RANKING_TOP_N:
+            ranked_restaurants, ranked_n = ranking_restaurants(restaurants, granularity, top_n)
+            for star_rating in RANKING_STAR_RATINGS:
+                table[(granularity, star_rating, top_n)] = rank_areas(
+                    ranked_restaurants, granularity, star_rating, ranked_n
+                )
+    return table
+
+
+def ranking_area_id(component_type, ranking_key, area_number):
+    """Return the pattern-matching id of a component belonging to one area of a ranking."""
+    granularity, star_rating, top_n = ranking_key
+    return {'type': component_type, 'granularity': granularity, 'star_rating': star_rating, 'top_n': top_n,
+            'area': area_number}
+
+
+def ranked_area_cards(ranked_area, page, restaurant_cards):
+    """Return one page of an area's serialised restaurant cards, and whether more pages follow it."""
+    start = page * RANKING_CARDS_PAGE_SIZE
+    end = start + RANKING_CARDS_PAGE_SIZE
+    cards = restaurant_cards.cards(ranked_area.restaurant_ids[start:end], extra_class_name='editorial-guide-entry')
+    return cards, end < len(ranked_area.restaurant_ids)
+
+
+def _ranked_area_components(ranked_areas, star_icon, restaurant_cards, display_restaurants, ranking_key=None,
+                            first_area_number=0):
     components = []
-    for area, restaurant_count in top_areas.items():
-        restaurant_word = "Restaurant" if restaurant_count == 1 else "Restaurants"
-
-        # Format the display based on the granularity
-        if granularity == 'department':
-            department_info = filtered_data[filtered_data['department'] == area].iloc[0]
-            department_code = department_info['department_num']
-            region_name = department_info['region']
-            display_area = f"{area} ({department_code}): {region_name}"
-        elif granularity == 'arrondissement':
-            arrondissement_info = filtered_data[filtered_data['arrondissement'] == area].iloc[0]
-            department_name = arrondissement_info['department']
-            department_code = arrondissement_info['department_num']
-            region_name = arrondissement_info['region']
-            display_area = f"{area}, {department_name} ({department_code}), {region_name}"
-        else:
-            display_area = area
+    for area_number, ranked_area in enumerate(ranked_areas, start=first_area_number):
+        restaurant_word = "Restaurant" if ranked_area.restaurant_count == 1 else "Restaurants"
 
         # Add area name and restaurant count
-        area_component = html.Div([
-            html.Div(display_area, style={"font-weight": "bold", "font-size": "20px"}),
+        components.append(html.Div([
+            html.Div(ranked_area.label, style={"font-weight": "bold", "font-size": "20px"}),
             html.Div([
-                f"{restaurant_count} ",
+                f"{ranked_area.restaurant_count} ",
                 star_icon,
                 f" {restaurant_word}"
             ], style={"margin-left": "10px", "display": "inline-block"})
-        ], style={"margin-bottom": "40px", "text-align": "center"})
-
-        components.append(area_component)
+        ], style={"margin-bottom": "40px", "text-align": "center"}))
 
         # Display restaurant details for this area if required
         if display_restaurants:
-            restaurants_in_area = filtered_data[filtered_data[granularity] == area]
-            restaurant_cards = [
-                get_restaurant_details(row, extra_class_name='editorial-guide-entry')
-                for _, row in restaurants_in_area.iterrows()
-            ]
-
+            cards_style = {'display': 'flex', 'flex-wrap': 'wrap', 'gap': '20px', 'margin-bottom': '40px',
+                           'justify-content': 'center'}
+            if ranking_key is None:
+                components.append(html.Div(
+                    children=restaurant_cards.cards(ranked_area.restaurant_ids,
+                                                    extra_class_name='editorial-guide-entry'),
+                    className='restaurant-cards-container editorial-card-grid',
+                    style=cards_style
+                ))
+                continue
+
+            # Only the first page of cards is sent; "Show more" appends the next one
+            area_cards, has_more = ranked_area_cards(ranked_area, 0, restaurant_cards)
             components.append(html.Div(
-                children=restaurant_cards,
+                id=ranking_area_id('ranking-cards', ranking_key, area_number),
+                children=area_cards,
                 className='restaurant-cards-container editorial-card-grid',
-                style={'display': 'flex', 'flex-wrap': 'wrap', 'gap': '20px', 'margin-bottom': '40px',
-                       'justify-content': 'center'}
+                style=cards_style
             ))
+            if has_more:
+                components.append(html.Div(
+                    [
+                        html.Button(
+                            "Show more restaurants",
+                            id=ranking_area_id('ranking-more-cards-button', ranking_key, area_number),
+                            n_clicks=0,
+                            className='button-show-details ranking-more-cards-button'
+                        ),
+                        # The next page to load; only a successful "Show more" response advances it
+                        dcc.Store(id=ranking_area_id('ranking-next-page', ranking_key, area_number), data=1),
+                    ],
+                    id=ranking_area_id('ranking-more-cards', ranking_key, area_number),
+                    className='ranking-more-cards'
+                ))
+    return components
+
+
+def render_ranking(ranking, star_rating, restaurant_cards, display_restaurants=True, ranking_key=None):
+    """
+    Returns a list of Dash components for a ranking from `rank_areas`. Tied areas outside the top N are grouped
+    separately.
+
+    With a `ranking_key`, each area shows its first `RANKING_CARDS_PAGE_SIZE` cards, then a "Show more" button
+    and a store of the next page to load. Their pattern-matching ids carry the key and the area's position in
+    `Ranking.areas`.
+
+    Args:
+        ranking (Ranking): The ranked areas to render.
+        star_rating (int or str): The Michelin star rating (2 or 3), or 'green', shown next to each count.
+        restaurant_cards (RestaurantCardCache): Cached detail cards for the listed restaurants.
+        display_restaurants (bool): Whether to display individual restaurants. Default is True.
+        ranking_key (tuple, optional): The ranking's `build_ranking_table` key; every card is rendered when None.
+
+    Returns:
+        list: Dash components containing the ranking or restaurant details, with ties grouped separately.
+    """
+    if star_rating == 'green':
+        star_icon = html.Span(green_star(with_margin=False), style={"vertical-align": "middle"})
+    else:
+        star_icon = html.Span(michelin_stars(star_rating), style={"vertical-align": "middle"})
+
+    components = _ranked_area_components(
+        ranking.top_areas, star_icon, restaurant_cards, display_restaurants, ranking_key
+    )
 
     # Handle tied areas, ensuring restaurant details are shown for all tied areas
-    if is_tied:
-        tied_components = []  # A separate section for tied areas
-        for area, restaurant_count in all_tied_areas.items():
-            if area not in top_areas.index:  # Only include tied areas outside top N
-                restaurant_word = "Restaurant" if restaurant_count == 1 else "Restaurants"
-
-                # Format the tied area in the same style as the top areas
-                if granularity == 'department':
-                    department_info = filtered_data[filtered_data['department'] == area].iloc[0]
-                    department_code = department_info['department_num']
-                    region_name = department_info['region']
-                    display_area = f"{area} ({department_code}): {region_name}"
-                elif granularity == 'arrondissement':
-                    arrondissement_info = filtered_data[filtered_data['arrondissement'] == area].iloc[0]
-                    department_name = arrondissement_info['department']
-                    department_code = arrondissement_info['department_num']
-                    region_name = arrondissement_info['region']
-                    display_area = f"{area}, {department_name} ({department_code}), {region_name}"
-                else:
-                    display_area = area
-
-                tied_area_component = html.Div([
-                    html.Div(display_area, style={"font-weight": "bold", "font-size": "20px"}),
-                    html.Div([
-                        f"{restaurant_count} ",
-                        star_icon,
-                        f" {restaurant_word}"
-                    ], style={"margin-left": "10px", "display": "inline-block"})
-                ], style={"margin-bottom": "40px", "text-align": "center"})
-
-                tied_components.append(tied_area_component)
-
-                # Show detailed restaurant info for the tied areas if required
-                if display_restaurants:
-                    restaurants_in_area = filtered_data[filtered_data[granularity] == area]
-                    restaurant_cards = [
-                        get_restaurant_details(row, extra_class_name='editorial-guide-entry')
-                        for _, row in restaurants_in_area.iterrows()
-                    ]
-
-                    tied_components.append(html.Div(
-                        children=restaurant_cards,
-                        className='restaurant-cards-container editorial-card-grid',
-                        style={'display': 'flex', 'flex-wrap': 'wrap', 'gap': '20px', 'margin-bottom': '40px',
-                               'justify-content': 'center'}
-                    ))
-
-        # Add a header for the tied areas
+    if ranking.tied_areas:
         components.append(html.Div("Tied Areas:", style={"font-weight": "bold", "font-size": "22px"}))
-        components.extend(tied_components)  # Add the tied areas to the main components
+        components.extend(_ranked_area_components(
+            ranking.tied_areas, star_icon, restaurant_cards, display_restaurants, ranking_key,
+            first_area_number=len(ranking.top_areas)
+        ))
 
     return components
@@ -0,0 +1,100 @@
+import threading
+from collections import OrderedDict
+
+
+class FigureCache:
+    """
+    Bounded least-recently-used cache of serialised figures.
+
+    Values are built by the caller on a miss and shared afterwards, so callers must copy
+    before changing them (see `with_map_view`). Hit and miss counts are kept for monitoring.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio,
+        }
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Build outside the lock; concurrent misses on one key may both build, and the last one wins
+        value = build()
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+
+def with_map_view(figure, zoom=None, center=None):
+    """
+    Return a cached figure dict with its map zoom and centre replaced.
+
+    Only the layout dicts on the path to the map view are copied; traces stay shared.
+
+    Args:
+        figure (dict): Serialised figure, as returned by `go.Figure.to_dict`.
+        zoom (float, optional): Map zoom to set.
+        center (dict, optional): 'lat' and/or 'lon' to set on the map centre.
+
+    Returns:
+        dict: The figure itself when there is nothing to overlay, otherwise a shallow copy.
+    """
+    if zoom is None and not center:
+        return figure
+
+    map_layout = dict(figure['layout'].get('map', {}))
+    if zoom is not None:
+        map_layout['zoom'] = zoom
+    if center:
+        map_layout['center'] = {**map_layout.get('center', {}), **center}
+    return {**figure, 'layout': {**figure['layout'], 'map': map_layout}}
+
+
+def with_star_visibility(figure, star_traces, selected_stars):
+    """
+    Return a cached figure dict showing only the traces of the selected star ratings.
+
+    Args:
+        figure (dict): Serialised figure, as returned by `go.Figure.to_dict`.
+        star_traces (dict): Star rating to trace indices, from `star_trace_indices`.
+        selected_stars (Collection): Star ratings to show.
+
+    Returns:
+        dict: The figure itself when it has no star traces, otherwise a copy with new trace dicts for them.
+    """
+    if not star_traces:
+        return figure
+
+    data = list(figure['data'])
+    for star, trace_indices in star_traces.items():
+        for trace_index in trace_indices:
+            data[trace_index] = {**data[trace_index], 'visible': star in selected_stars}
+    return {**figure, 'data': data}
@@ -1,6 +1,7 @@
 import plotly.graph_objects as go
 
 from app.components.shared import color_map
+from app.utils.guide_tables import outline_coordinates
 
 # Hover-tip text
 text_color_map = {
@@ -12,50 +13,36 @@ text_color_map = {
     3: "#FFB84D"
 }
 
-def plot_geometry_outline(fig, geometry, line_width=0.5):
+def add_outline_trace(fig, outline, line_width=0.5):
     """
-    Draw the geographic boundary of a department, region, or arrondissement on a Plotly map.
+    Draw a precomputed outline on a Plotly map as a single line trace.
 
     Parameters:
         fig (go.Figure): The Plotly figure to which the outline will be added.
-        geometry (shapely.geometry.Polygon or MultiPolygon):
-            A geometry object representing the area to be outlined.
-            Typically obtained via `geometry = geo_df['geometry'].iloc[0]`
+        outline (tuple): NaN-separated (lon, lat) arrays, as built by `outline_coordinates`.
         line_width (float): Width of the outline line in pixels.
-
-    Notes:
-        This function handles both single Polygon and MultiPolygon geometries, and plots their exterior boundaries
-        using black lines on the map.
     """
-    if geometry.geom_type == 'Polygon':
-        x, y = geometry.exterior.xy
-        fig.add_trace(go.Scattermap(
-            lat=list(y),
-            lon=list(x),
-            mode='lines',
-            line=dict(width=line_width, color='black'),
-            hoverinfo='none',
-            showlegend=False
-        ))
-    elif geometry.geom_type == 'MultiPolygon':
-        for poly in geometry.geoms:
-            x, y = poly.exterior.xy
-            fig.add_trace(go.Scattermap(
-                lat=list(y),
-                lon=list(x),
-                mode='lines',
-                line=dict(width=line_width, color='black'),
-                hoverinfo='none',
-                showlegend=False
-            ))
-
-def plot_regional_outlines(region_df, region):
+    lon, lat = outline
+    if len(lon) == 0:
+        return
+
+    fig.add_trace(go.Scattermap(
+        lat=lat,
+        lon=lon,
+        mode='lines',
+        line=dict(width=line_width, color='black'),
+        hoverinfo='none',
+        showlegend=False
+    ))
+
+def plot_regional_outlines(region_df, region, outline=None):
     """
     Plot the outlines of a selected region on a map.
 
     Args:
         region_df (GeoDataFrame): A GeoDataFrame containing geometries of regions with a 'region' column.
         region (str): The name of the region to plot.
+        outline (tuple, optional): Precomputed (lon, lat) outline arrays; traced from region_df when omitted.
 
     Returns:
         fig (plotly.graph_objs.Figure): A Plotly Figure object with the region outlines plotted.
@@ -65,17 +52,18 @@ def plot_regional_outlines(region_df, region):
     """
     fig = go.Figure(go.Scattermap())  # Initialize empty figure with mapbox
 
-    # Filter the GeoDataFrame for the selected region
-    filtered_region = region_df[region_df['region'] == region]
+    if outline is None:
+        # Filter the GeoDataFrame for the selected region
+        filtered_region = region_df[region_df['region'] == region]
 
-    if filtered_region.empty:
-        # Handle case when the region is not found
-        raise ValueError(f"Region '{region}' not found in the provided GeoDataFrame.")
+        if filtered_region.empty:
+            # Handle case when the region is not found
+            raise ValueError(f"Region '{region}' not found in the provided GeoDataFrame.")
 
-    # Loop through the filtered GeoDataFrame
-    for _, row in filtered_region.iterrows():
-        specific_geometry = row['geometry']
-        plot_geometry_outline(fig, specific_geometry, line_width=1)
+        outline = outline_coordinates(filtered_region.geometry.array)
+
+    # Every row of the region is drawn in one trace
+    add_outline_trace(fig, outline, line_width=1)
 
     # Update map layout settings
     fig.update_layout(
@@ -88,7 +76,7 @@ def plot_regional_outlines(region_df, region):
     )
     return fig
 
-def plot_department_outlines(geo_df, department_code, zoom_data=None):
+def plot_department_outlines(geo_df, department_code, zoom_data=None, outline=None):
     """
     Plot the outlines of a selected department on a map.
 
@@ -96,6 +84,7 @@ def plot_department_outlines(geo_df, department_code, zoom_data=None):
         geo_df (GeoDataFrame): A GeoDataFrame containing geometries of departments with a 'code' column.
         department_code (str or int): The code of the department to plot.
         zoom_data (dict, optional): Contains zoom and centre information.
+        outline (tuple, optional): Precomputed (lon, lat) outline arrays; traced from geo_df when omitted.
 
     Returns:
         fig (plotly.graph_objs.Figure): A Plotly Figure object with the department outline plotted.
@@ -111,10 +100,12 @@ def plot_department_outlines(geo_df, department_code, zoom_data=None):
 
     fig = go.Figure(go.Scattermap())  # Initialize empty figure with mapbox
 
-    # Filter the GeoDataFrame for the selected department
-    specific_geometry = geo_df[geo_df['code'] == str(department_code)]['geometry'].iloc[0]
+    if outline is None:
+        # Filter the GeoDataFrame for the selected department
+        specific_geometry = geo_df[geo_df['code'] == str(department_code)]['geometry'].iloc[0]
+        outline = outline_coordinates([specific_geometry])
     # Plot the geometry's boundaries
-    plot_geometry_outline(fig, specific_geometry, line_width=0.5)
+    add_outline_trace(fig, outline, line_width=0.5)
 
     # Update map layout settings
     fig.update_layout(
@@ -127,7 +118,7 @@ def plot_department_outlines(geo_df, department_code, zoom_data=None):
     )
     return fig
 
-def plot_arrondissement_outlines(paris_df, arrondissement, zoom_data=None):
+def plot_arrondissement_outlines(paris_df, arrondissement, zoom_data=None, outline=None):
     """
     Plot the outlines of a selected Paris arrondissement on a map.
 
@@ -135,6 +126,7 @@ def plot_arrondissement_outlines(paris_df, arrondissement, zoom_data=None):
         paris_df (GeoDataFrame): A GeoDataFrame containing geometries of Paris arrondissements with 'arrondissement' and 'geometry'.
         arrondissement (str): The name of the arrondissement to plot.
         zoom_data (dict, optional): Contains zoom and centre information.
+        outline (tuple, optional): Precomputed (lon, lat) outline arrays; traced from paris_df when omitted.
 
     Returns:
         fig (plotly.graph_objs.Figure): A Plotly Figure object with the arrondissement outline plotted.
@@ -153,14 +145,15 @@ def plot_arrondissement_outlines(paris_df, arrondissement, zoom_data=None):
 
     fig = go.Figure(go.Scattermap())  # Initialize empty figure with mapbox
 
-    # Filter the GeoDataFrame for the selected arrondissement
-    filtered_geo = paris_df[paris_df['arrondissement'] == arrondissement]
-    if filtered_geo.empty:
-        raise ValueError(f"Arrondissement '{arrondissement}' not found in the provided GeoDataFrame.")
+    if outline is None:
+        # Filter the GeoDataFrame for the selected arrondissement
+        filtered_geo = paris_df[paris_df['arrondissement'] == arrondissement]
+        if filtered_geo.empty:
+            raise ValueError(f"Arrondissement '{arrondissement}' not found in the provided GeoDataFrame.")
 
-    specific_geometry = filtered_geo['geometry'].iloc[0]
+        outline = outline_coordinates([filtered_geo['geometry'].iloc[0]])
     # Plot the geometry's boundaries
-    plot_geometry_outline(fig, specific_geometry, line_width=1)
+    add_outline_trace(fig, outline, line_width=1)
 
     # Update map layout settings
     fig.update_layout(
@@ -199,6 +192,29 @@ def generate_hover_text(row):
     )
     return hover_text
 
+def generate_hover_texts(data_df):
+    """
+    Generate the `generate_hover_text` HTML for every restaurant in a DataFrame at once.
+
+    Parameters:
+        data_df (pd.DataFrame): Restaurant rows with 'name', 'location' and 'stars' columns.
+
+    Returns:
+        hover_texts (pd.Series): HTML-formatted hover text, aligned with data_df's index.
+    """
+    text_colors = data_df['stars'].map(text_color_map).fillna('#000')
+    return (
+        "<span style=\"font-family: 'Libre Franklin', sans-serif; font-size: 12px; color: " + text_colors + ";\">"
+        + "<span style='font-size: 14px;'>" + data_df['name'].astype(str) + "</span><br>"
+        + data_df['location'].astype(str) + "<br>"
+    )
+
+def with_hover_text(data_df):
+    """Return the restaurants with a 'hover_text' column, reusing one precomputed at load time."""
+    if 'hover_text' in data_df.columns:
+        return data_df
+    return data_df.assign(hover_text=generate_hover_texts(data_df))
+
 def label_properties(star):
     """
     Return:
@@ -216,13 +232,13 @@ def label_properties(star):
         return "★" * int(star), 11, 1, color_map[star]
 
 def add_star_trace(fig, subset, label_name,
-                   marker_size, marker_opacity, marker_color):
+                   marker_size, marker_opacity, marker_color, star=None, visible=None):
     """
     Add a scatter marker layer to a Plotly map for a specific group of restaurants.
 
     Each trace corresponds to a single star rating (e.g. 1★, Bib Gourmand, Selected)
-    and is styled with a consistent marker size, opacity, and colour. Hover text and
-    clickData are included for interactivity.
+    and is styled with a consistent marker size, opacity, and colour. Hover text is
+    included, and each point's `restaurant_id` is sent as its clickData customdata.
 
     Parameters:
         fig (go.Figure): The Plotly figure to which the trace will be added.
@@ -231,6 +247,8 @@ def add_star_trace(fig, subset, label_name,
         marker_size (int): Marker size for the restaurant points.
         marker_opacity (float): Opacity level for the markers.
         marker_color (str): Colour to apply to the markers (hex or CSS format).
+        star (float, optional): Star rating the trace belongs to, recorded as its legend group.
+        visible (bool, optional): Initial visibility; omitted from the trace when None.
     """
     if subset.empty:
         return
@@ -245,14 +263,176 @@ def add_star_trace(fig, subset, label_name,
             opacity=marker_opacity
         ),
         text=subset['hover_text'],
-        customdata=subset.index,
+        customdata=subset['restaurant_id'],
         hovertemplate='%{text}',
         name=label_name,
         showlegend=False,
-        meta=subset.index   # <- NEW: include explicitly for clickData
+        legendgroup=star_legend_group(star),
+        visible=visible
     ))
 
-def plot_interactive_department(data_df, geo_df, department_code, selected_stars, zoom_data=None):
+def star_trace_label(star, greenstar):
+    """Return the trace label for a star rating, with a leaf for green-star restaurants."""
+    base_label = label_properties(star)[0]
+    if not greenstar:
+        return base_label
+    return base_label + (" 🌿" if star in [0.25, 0.5] else "🌿")
+
+def outline_trace_index(figure):
+    """Return the index of the first outline (line) trace in a serialised figure, or None if it has none."""
+    return next((index for index, trace in enumerate(figure['data']) if trace.get('mode') == 'lines'), None)
+
+def star_legend_group(star):
+    """Return the legend group tagging a star rating's traces, or None for untagged traces."""
+    return None if star is None else f"stars-{float(star)}"
+
+def star_trace_indices(figure):
+    """
+    Map each star rating to the indices of its traces in a serialised figure.
+
+    Parameters:
+        figure (dict): Figure as returned by `go.Figure.to_dict`.
+
+    Returns:
+        dict: Star rating to trace indices, for traces tagged by `star_legend_group`.
+    """
+    indices = {}
+    for index, trace in enumerate(figure['data']):
+        group = trace.get('legendgroup') or ''
+        if group.startswith('stars-'):
+            indices.setdefault(float(group[len('stars-'):]), []).append(index)
+    return indices
+
+def add_layered_restaurant_markers(fig, data, selected_stars=None):
+    """
+    Add restaurant markers as one trace per star rating and green-star split, over green-star halo traces.
+
+    Every star rating in `data` gets its traces, tagged with `star_legend_group`, and ratings
+    outside `selected_stars` start hidden. Toggling a rating then only flips `visible` on its traces.
+
+    Parameters:
+        fig (go.Figure): The Plotly figure to which the traces will be added.
+        data (pd.DataFrame): Restaurants to plot, with 'hover_text' and 'restaurant_id' columns.
+        selected_stars (list, optional): Star ratings to show; all are shown when None.
+    """
+    stars = sorted(data['stars'].unique(), reverse=False)
+
+    def visible(star):
+        return None if selected_stars is None else star in selected_stars
+
+    # Plot background outlines for green star restaurants, one halo per star rating so each toggles with it
+    for star in stars:
+        green_outline_data = data[(data['stars'] == star) & (data['greenstar'] == 1)]
+        if green_outline_data.empty:
+            continue
+        fig.add_trace(go.Scattermap(
+            lat=green_outline_data['latitude'],
+            lon=green_outline_data['longitude'],
+            mode='markers',
+            marker=dict(
+                size=11 if star == 0.25 else 15,
+                color='#689c44',
+                opacity=0.8
+            ),
+            hoverinfo='skip',
+            showlegend=False,
+            legendgroup=star_legend_group(star),
+            visible=visible(star)
+        ))
+
+    # Plot each group of star-rated restaurants (including 0.25 if present)
+    for star in stars:
+        subset = data[data['stars'] == star]
+
+        _, marker_size, marker_opacity, marker_color = label_properties(star)
+
+        # Split and add traces
+        for greenstar in (False, True):
+            add_star_trace(
+                fig,
+                subset[(subset['greenstar'] == 1) == greenstar],
+                star_trace_label(star, greenstar),
+                marker_size,
+                marker_opacity,
+                marker_color,
+                star=star,
+                visible=visible(star)
+            )
+
+def _rgba(hex_colour, opacity):
+    return f"rgba({int(hex_colour[1:3], 16)},{int(hex_colour[3:5], 16)},{int(hex_colour[5:7], 16)},{opacity})"
+
+# Star ratings mapped onto a colorscale carrying each rating's `label_properties` colour and opacity,
+# so a single trace can colour its points from the numeric star values alone
+STAR_LEVELS = sorted(color_map)
+STAR_COLORSCALE = [
+    [(star - STAR_LEVELS[0]) / (STAR_LEVELS[-1] - STAR_LEVELS[0]), _rgba(color_map[star], label_properties(star)[2])]
+    for star in STAR_LEVELS
+]
+
+def add_single_restaurant_markers(fig, data, selected_stars=None):
+    """
+    Add restaurant markers as a single trace with per-point styling, over at most one green-star halo trace.
+
+    Marker size comes from `label_properties` per point and colour/opacity from `STAR_COLORSCALE`.
+    Points are drawn in the layered renderer's order so higher ratings stay on top. Clicks resolve
+    through the `restaurant_id` in `customdata`; the hover box shows the restaurant text without a per-rating
+    trace label.
+
+    Parameters:
+        fig (go.Figure): The Plotly figure to which the traces will be added.
+        data (pd.DataFrame): Restaurants to plot, with 'hover_text' and 'restaurant_id' columns.
+        selected_stars (list, optional): Star ratings to plot; all are plotted when None.
+    """
+    if selected_stars is not None:
+        data = data[data['stars'].isin(selected_stars)]
+    if data.empty:
+        return
+
+    data = data.assign(_green=data['greenstar'] == 1).sort_values(['stars', '_green'], kind='stable')
+    marker_sizes = {star: label_properties(star)[1] for star in data['stars'].unique()}
+
+    green_outline_data = data[data['_green']]
+    if not green_outline_data.empty:
+        fig.add_trace(go.Scattermap(
+            lat=green_outline_data['latitude'],
+            lon=green_outline_data['longitude'],
+            mode='markers',
+            marker=dict(
+                size=[11 if star == 0.25 else 15 for star in green_outline_data['stars']],
+                color='#689c44',
+                opacity=0.8
+            ),
+            hoverinfo='skip',
+            showlegend=False
+        ))
+
+    fig.add_trace(go.Scattermap(
+        lat=data['latitude'],
+        lon=data['longitude'],
+        mode='markers',
+        marker=dict(
+            size=data['stars'].map(marker_sizes),
+            color=data['stars'],
+            colorscale=STAR_COLORSCALE,
+            cmin=STAR_LEVELS[0],
+            cmax=STAR_LEVELS[-1],
+        ),
+        text=data['hover_text'],
+        customdata=data['restaurant_id'],
+        hovertemplate='%{text}<extra></extra>',
+        name='Restaurants',
+        showlegend=False
+    ))
+
+# Restaurant marker renderers selectable through `marker_mode`
+MARKER_RENDERERS = {
+    'layered': add_layered_restaurant_markers,
+    'single': add_single_restaurant_markers,
+}
+
+def plot_interactive_department(data_df, geo_df, department_code, selected_stars, zoom_data=None,
+                                marker_mode='layered', outline=None):
     """
     Plot an interactive map of a department, including restaurant points for selected star ratings.
 
@@ -262,6 +442,8 @@ def plot_interactive_department(data_df, geo_df, department_code, selected_stars
         department_code (str or int): The code of the department to plot.
         selected_stars (list): List of star ratings to include in the plot.
         zoom_data (dict): Dictionary containing zoom level and center information.
+        marker_mode (str): 'layered' for a trace per star rating, 'single' for one per-point styled trace.
+        outline (tuple, optional): Precomputed (lon, lat) outline arrays; traced from geo_df when omitted.
 
     Returns:
         fig (plotly.graph_objs.Figure): A Plotly Figure object with the department and restaurants plotted.
@@ -289,61 +471,19 @@ def plot_interactive_department(data_df, geo_df, department_code, selected_stars
 
     specific_geometry = filtered_geo['geometry'].iloc[0]
     # Plot department boundaries
-    plot_geometry_outline(fig, specific_geometry, line_width=0.5)
+    add_outline_trace(fig, outline if outline is not None else outline_coordinates([specific_geometry]),
+                      line_width=0.5)
 
-    # Before filtering, inspect all restaurants in the department
-    all_in_dept = data_df[data_df['department_num'] == str(department_code)]
+    # Every restaurant in the department goes to the renderer, which hides or drops unselected ratings
+    all_in_dept = with_hover_text(data_df[data_df['department_num'] == str(department_code)])
+    if not all_in_dept.empty:
+        MARKER_RENDERERS[marker_mode](fig, all_in_dept, selected_stars)
 
     # Now do star filtering
-    dept_data = all_in_dept[all_in_dept['stars'].isin(selected_stars)].copy()
+    dept_data = all_in_dept[all_in_dept['stars'].isin(selected_stars)]
 
-    # If dept_data is not empty, add restaurant points
+    # If dept_data is not empty, centre on its restaurant points
     if not dept_data.empty:
-        dept_data['color'] = dept_data['stars'].map(color_map).fillna('#808080')  # Default to grey for 0.25
-        dept_data['hover_text'] = dept_data.apply(generate_hover_text, axis=1)
-
-        # Plot background outlines for green star restaurants
-        green_outline_data = dept_data[dept_data['greenstar'] == 1]
-        if not green_outline_data.empty:
-            fig.add_trace(go.Scattermap(
-                lat=green_outline_data['latitude'],
-                lon=green_outline_data['longitude'],
-                mode='markers',
-                marker=dict(
-                    size=11 if (green_outline_data['stars'] == 0.25).any() else 15,
-                    color='#689c44',
-                    opacity=0.8
-                ),
-                hoverinfo='skip',
-                showlegend=False
-            ))
-
-        # Plot each group of star-rated restaurants (including 0.25 if present)
-        for star in sorted(dept_data['stars'].unique(), reverse=False):
-            subset = dept_data[dept_data['stars'] == star]
-            if subset.empty:
-                continue
-
-            base_label, marker_size, marker_opacity, marker_color = label_properties(star)
-
-            # Split and add traces
-            add_star_trace(
-                fig,
-                subset[subset['greenstar'] != 1],
-                base_label,
-                marker_size,
-                marker_opacity,
-                marker_color
-            )
-
-            add_star_trace(
-                fig,
-                subset[subset['greenstar'] == 1],
-                base_label + (" 🌿" if star in [0.25, 0.5] else "🌿"),
-                marker_size,
-                marker_opacity,
-                marker_color
-            )
 
         # Calculate the center if zoom_data doesn't have it
         if center_lat is None or center_lon is None:
@@ -377,7 +517,8 @@ def plot_interactive_department(data_df, geo_df, department_code, selected_stars
     )
     return fig
 
-def plot_paris_arrondissement(data_df, paris_df, arrondissement, selected_stars, zoom_data=None):
+def plot_paris_arrondissement(data_df, paris_df, arrondissement, selected_stars, zoom_data=None,
+                              marker_mode='layered', outline=None):
     """
     Plot an interactive map of a Paris arrondissement, including restaurant points for selected star ratings.
 
@@ -387,6 +528,8 @@ def plot_paris_arrondissement(data_df, paris_df, arrondissement, selected_stars,
         arrondissement (str): The arrondissement to plot.
         selected_stars (list): List of star ratings to include in the plot.
         zoom_data (dict, optional): Contains zoom and center information.
+        marker_mode (str): 'layered' for a trace per star rating, 'single' for one per-point styled trace.
+        outline (tuple, optional): Precomputed (lon, lat) outline arrays; traced from paris_df when omitted.
 
     Returns:
         fig (plotly.graph_objs.Figure): A Plotly Figure object with the arrondissement and restaurants plotted.
@@ -409,61 +552,19 @@ def plot_paris_arrondissement(data_df, paris_df, arrondissement, selected_stars,
 
     specific_geometry = filtered_geo['geometry'].iloc[0]
     # Plot the arrondissement boundary
-    plot_geometry_outline(fig, specific_geometry, line_width=1)
+    add_outline_trace(fig, outline if outline is not None else outline_coordinates([specific_geometry]),
+                      line_width=1)
+
+    # Every restaurant in the arrondissement goes to the renderer, which hides or drops unselected ratings
+    all_in_arron = with_hover_text(data_df[data_df['arrondissement'] == arrondissement])
+    if not all_in_arron.empty:
+        MARKER_RENDERERS[marker_mode](fig, all_in_arron, selected_stars)
 
-    # Before filtering, inspect all restaurants in the department
-    all_in_arron = data_df[data_df['arrondissement'] == arrondissement]
     # Now do star filtering
-    arr_data = all_in_arron[all_in_arron['stars'].isin(selected_stars)].copy()
+    arr_data = all_in_arron[all_in_arron['stars'].isin(selected_stars)]
 
-    # Proceed to plot starred restaurants
-    # If dept_data is not empty, add restaurant points
+    # If arr_data is not empty, centre on its restaurant points
     if not arr_data.empty:
-        arr_data['color'] = arr_data['stars'].map(color_map).fillna('#808080')  # Default to grey for 0.25
-        arr_data['hover_text'] = arr_data.apply(generate_hover_text, axis=1)
-
-        # Plot background outlines for green star restaurants
-        green_outline_data = arr_data[arr_data['greenstar'] == 1]
-        if not green_outline_data.empty:
-            fig.add_trace(go.Scattermap(
-                lat=green_outline_data['latitude'],
-                lon=green_outline_data['longitude'],
-                mode='markers',
-                marker=dict(
-                    size=11 if (green_outline_data['stars'] == 0.25).any() else 15,
-                    color='#689c44',
-                    opacity=0.8
-                ),
-                hoverinfo='skip',
-                showlegend=False
-            ))
-
-        # Plot each group of star-rated restaurants (including 0.25 if present)
-        for star in sorted(arr_data['stars'].unique(), reverse=False):
-            subset = arr_data[arr_data['stars'] == star]
-            if subset.empty:
-                continue
-
-            base_label, marker_size, marker_opacity, marker_color = label_properties(star)
-
-            # Split and add traces
-            add_star_trace(
-                fig,
-                subset[subset['greenstar'] != 1],
-                base_label,
-                marker_size,
-                marker_opacity,
-                marker_color
-            )
-
-            add_star_trace(
-                fig,
-                subset[subset['greenstar'] == 1],
-                base_label + (" 🌿" if star in [0.25, 0.5] else "🌿"),
-                marker_size,
-                marker_opacity,
-                marker_color
-            )
 
         # Use restaurant data to calculate map center if no zoom_data center
         if not center_lat or not center_lon:
@@ -0,0 +1,266 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import shapely
+
+# Monaco is listed with the Provence-Alpes-Côte d'Azur departments on the guide page
+MONACO_REGION = "Provence-Alpes-Côte d'Azur"
+
+# Count column behind each star level, in the order the filter buttons are offered
+STAR_COUNT_COLUMNS = (
+    (3, "3_star"),
+    (2, "2_star"),
+    (1, "1_star"),
+    (0.5, "bib_gourmand"),
+    (0.25, "selected"),
+)
+
+# Map zoom for the whole of France, and for a selected department or Paris arrondissement;
+# Paris and Monaco need closer views
+FRANCE_ZOOM = 5
+DEPARTMENT_ZOOM = 8
+DEPARTMENT_ZOOM_BY_CODE = {'75': 11, '98': 13.5}
+ARRONDISSEMENT_ZOOM = 13
+
+
+@dataclass(frozen=True)
+class GuideFilterTable:
+    region_department_options: dict[str, tuple[dict[str, str], ...]]
+    department_stars: dict[tuple[bool, str], tuple[float, ...]]
+    paris_stars: dict[str | None, tuple[float, ...]]
+
+    def department_options(self, region):
+        """Return the department dropdown options for a region."""
+        return list(self.region_department_options.get(region, ()))
+
+    def available_stars(self, region, department, arrondissement=None):
+        """Return the star levels present for a guide selection, highest first."""
+        if not department:
+            return []
+
+        if department == 'Paris':
+            key = arrondissement if arrondissement and arrondissement != 'all' else None
+            return list(self.paris_stars.get(key, ()))
+
+        return list(self.department_stars.get((region == MONACO_REGION, department), ()))
+
+
+def _department_options(geo_df):
+    options = {}
+    for region, departments in geo_df[['region', 'department', 'code']].drop_duplicates().groupby('region', sort=False):
+        options[region] = tuple(
+            {'label': f"{dept['department']} ({dept['code']})", 'value': dept['department']}
+            for dept in departments[['department', 'code']].to_dict('records')
+        )
+    return options
+
+
+def _department_stars(geo_df):
+    department_rows = geo_df.drop_duplicates(subset='department')
+    return {
+        row['department']: tuple(star for star, column in STAR_COUNT_COLUMNS if row[column] > 0)
+        for row in department_rows.to_dict('records')
+    }
+
+
+def _restaurant_stars(restaurants):
+    return tuple(sorted(restaurants['stars'].unique().tolist(), reverse=True))
+
+
+def build_guide_filter_table(all_france, geo_df, geo_df_with_monaco):
+    """
+    Precompute the guide page's department options and available star levels.
+
+    Args:
+        all_france (pd.DataFrame): Restaurant rows, used for Paris arrondissement availability.
+        geo_df (GeoDataFrame): Departments with restaurants, used outside Provence-Alpes-Côte d'Azur.
+        geo_df_with_monaco (GeoDataFrame): Departments plus Monaco, used for Provence-Alpes-Côte d'Azur.
+
+    Returns:
+        GuideFilterTable: Lookups keyed by region, department and arrondissement.
+    """
+    region_department_options = _department_options(geo_df)
+    monaco_options = _department_options(geo_df_with_monaco)
+    if MONACO_REGION in monaco_options:
+        region_department_options[MONACO_REGION] = monaco_options[MONACO_REGION]
+
+    department_stars = {
+        (include_monaco, department): stars
+        for include_monaco, frame in ((False, geo_df), (True, geo_df_with_monaco))
+        for department, stars in _department_stars(frame).items()
+    }
+
+    paris_restaurants = all_france[all_france['department'] == 'Paris']
+    paris_stars = {None: _restaurant_stars(paris_restaurants)}
+    for arrondissement, restaurants in paris_restaurants.groupby('arrondissement'):
+        paris_stars[arrondissement] = _restaurant_stars(restaurants)
+
+    return GuideFilterTable(
+        region_department_options=region_department_options,
+        department_stars=department_stars,
+        paris_stars=paris_stars,
+    )
+
+
+@dataclass(frozen=True)
+class GuideViewTable:
+    department_views: dict[tuple[bool, str], dict]
+    arrondissement_views: dict[str, dict]
+
+    def department_view(self, region, department):
+        """Return the map view (zoom, center) for a department, or {} if it has no geometry."""
+        return _copy_view(self.department_views.get((region == MONACO_REGION, department)))
+
+    def arrondissement_view(self, arrondissement):
+        """Return the map view (zoom, center) for a Paris arrondissement, or {} if unknown."""
+        return _copy_view(self.arrondissement_views.get(arrondissement))
+
+
+def _copy_view(view):
+    if view is None:
+        return {}
+    return {'zoom': view['zoom'], 'center': dict(view['center'])}
+
+
+def _map_views(frame, key_column, zooms):
+    # First row per key wins, as the dropdown callbacks resolved it; centroids are planar, as before
+    rows = frame.drop_duplicates(subset=key_column)
+    geometries = np.asarray(rows.geometry.array)
+    centroids = shapely.centroid(geometries)
+    return {
+        key: {
+            'zoom': zoom,
+            'center': {'lat': float(shapely.get_y(centroid)), 'lon': float(shapely.get_x(centroid))},
+        }
+        for key, zoom, centroid in zip(rows[key_column], zooms(rows), centroids)
+    }
+
+
+def build_guide_view_table(geo_df, geo_df_with_monaco, paris_df):
+    """
+    Precompute the guide page's map views for every department and Paris arrondissement.
+
+    Args:
+        geo_df (GeoDataFrame): Departments with restaurants, used outside Provence-Alpes-Côte d'Azur.
+        geo_df_with_monaco (GeoDataFrame): Departments plus Monaco, used for Provence-Alpes-Côte d'Azur.
+        paris_df (GeoDataFrame): Paris arrondissements.
+
+    Returns:
+        GuideViewTable: Views keyed by department and arrondissement.
+    """
+    def department_zooms(rows):
+        return [DEPARTMENT_ZOOM_BY_CODE.get(code, DEPARTMENT_ZOOM) for code in rows['code']]
+
+    department_views = {
+        (include_monaco, department): view
+        for include_monaco, frame in ((False, geo_df), (True, geo_df_with_monaco))
+        for department, view in _map_views(frame, 'department', department_zooms).items()
+    }
+    arrondissement_views = _map_views(paris_df, 'arrondissement', lambda rows: [ARRONDISSEMENT_ZOOM] * len(rows))
+
+    return GuideViewTable(department_views=department_views, arrondissement_views=arrondissement_views)
+
+
+# Outline levels of detail as (minimum map zoom, simplification tolerance in degrees), coarsest first.
+# A level stays under about half a screen pixel until two zoom steps past its minimum zoom.
+OUTLINE_DETAIL_LEVELS = (
+    (0, 0.005),
+    (8, 0.0005),
+    (11, 0.0001),
+    (14, 0.0),
+)
+
+
+def outline_level(zoom=None):
+    """Return the index into OUTLINE_DETAIL_LEVELS for a map zoom; full detail when zoom is None."""
+    if zoom is None:
+        return len(OUTLINE_DETAIL_LEVELS) - 1
+    return max(
+        (level for level, (min_zoom, _) in enumerate(OUTLINE_DETAIL_LEVELS) if zoom >= min_zoom),
+        default=0,
+    )
+
+
+@dataclass(frozen=True)
+class GuideOutlineTable:
+    region_outlines: dict[str, tuple[tuple[np.ndarray, np.ndarray], ...]]
+    department_outlines: dict[str, tuple[tuple[np.ndarray, np.ndarray], ...]]
+    arrondissement_outlines: dict[str, tuple[tuple[np.ndarray, np.ndarray], ...]]
+
+    def outline(self, kind, name, level=None):
+        """Return the (lon, lat) outline arrays of a 'region', 'department' or 'arrondissement' at a detail level."""
+        outlines = getattr(self, f'{kind}_outlines').get(name)
+        if outlines is None:
+            return None
+        return outlines[-1 if level is None else level]
+
+    def region_outline(self, region, zoom=None):
+        """Return the (lon, lat) outline arrays for a region at a map zoom, or None if it has no geometry."""
+        return self.outline('region', region, outline_level(zoom))
+
+    def department_outline(self, department_code, zoom=None):
+        """Return the (lon, lat) outline arrays for a department code at a map zoom, or None if it has no geometry."""
+        return self.outline('department', str(department_code), outline_level(zoom))
+
+    def arrondissement_outline(self, arrondissement, zoom=None):
+        """Return the (lon, lat) outline arrays for a Paris arrondissement at a map zoom, or None if unknown."""
+        return self.outline('arrondissement', arrondissement, outline_level(zoom))
+
+
+def outline_coordinates(geometries):
+    """
+    Return the exterior rings of Polygon/MultiPolygon geometries as NaN-separated coordinate arrays.
+
+    Args:
+        geometries (sequence): Shapely geometries to outline together.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Longitudes and latitudes, with a NaN between consecutive rings
+        so one line trace draws every part without joining them.
+    """
+    parts = shapely.get_parts(np.asarray(geometries, dtype=object))
+    polygons = parts[shapely.get_type_id(parts) == shapely.GeometryType.POLYGON]
+    coordinates, ring_index = shapely.get_coordinates(shapely.get_exterior_ring(polygons), return_index=True)
+    ring_starts = np.flatnonzero(np.diff(ring_index)) + 1
+    coordinates = np.insert(coordinates, ring_starts, np.nan, axis=0)
+    return coordinates[:, 0], coordinates[:, 1]
+
+
+def _outlines(frame, key_column, first_only=True):
+    # First row per key wins, as the figure builders resolved it; regions outline every row
+    rows = frame.drop_duplicates(subset=key_column) if first_only else frame
+    geometries = np.asarray(rows.geometry.array)
+    # Each geometry is simplified on its own, so shared borders between neighbours may drift apart;
+    # only one outline is drawn per figure
+    levels = [
+        shapely.simplify(geometries, tolerance, preserve_topology=True) if tolerance else geometries
+        for _, tolerance in OUTLINE_DETAIL_LEVELS
+    ]
+    positions = pd.Series(np.arange(len(rows))).groupby(rows[key_column].to_numpy(), sort=False)
+    return {
+        key: tuple(outline_coordinates(level[group.to_numpy()]) for level in levels)
+        for key, group in positions
+    }
+
+
+def build_guide_outline_table(region_df, geo_df_with_monaco, paris_df):
+    """
+    Precompute the guide page's outline coordinates for every region, department and Paris arrondissement.
+
+    Each outline is kept at every level of OUTLINE_DETAIL_LEVELS, so a figure only carries the vertices
+    its map zoom can show.
+
+    Args:
+        region_df (GeoDataFrame): Region geometries with a 'region' column.
+        geo_df_with_monaco (GeoDataFrame): Department geometries plus Monaco, with a 'code' column.
+        paris_df (GeoDataFrame): Paris arrondissements.
+
+    Returns:
+        GuideOutlineTable: (lon, lat) arrays per detail level, keyed by region, department code and arrondissement.
+    """
+    return GuideOutlineTable(
+        region_outlines=_outlines(region_df, 'region', first_only=False),
+        department_outlines=_outlines(geo_df_with_monaco, 'code'),
+        arrondissement_outlines=_outlines(paris_df, 'arrondissement'),
+    )
@@ -0,0 +1,29 @@
+import threading
+
+
+class LazyValue:
+    """
+    Build a value on first access and share it afterwards.
+
+    Concurrent first accesses wait on one build rather than each running the loader.
+    A loader that raises leaves the value unloaded, so the next access retries it.
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._value = None
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def get(self):
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._value = self._loader()
+                    self._loaded = True
+                    self._loader = None
+        return self._value
@@ -1,17 +1,62 @@
-from fuzzywuzzy import fuzz, process
+import re
+
+import pandas as pd
 from unidecode import unidecode
 
+from app.utils.location_search import best_location_match, build_location_search_index
+
+# Five-digit postal codes, or department numbers such as '06', '2A' and '974'
+LOCATION_CODE_PATTERN = re.compile(r'^(?:\d{5}|\d{2,3}|2[AB])$')
+
 
 class LocationMatcher:
     def __init__(self, df, threshold=80):
-        self.df = df.copy()  # Copy of the dataframe to avoid altering the original
         self.threshold = threshold  # Threshold for fuzzy matching
 
-        # Normalize the 'location' column and split it into city and postal code
-        self.df['normalized_city'] = self.df['location'].apply(lambda loc: self.normalize_text(self.split_location_field(loc)[0]))
+        # Normalise each distinct location and capital once, then broadcast back to the rows
+        split_locations = {location: self.split_location_field(location) for location in df['location'].unique()}
+        normalized_locations = {
+            location: self.normalize_text(city)
+            for location, (city, _) in split_locations.items()
+        }
+        normalized_capitals = {capital: self.normalize_text(capital) for capital in df['capital'].unique()}
+
+        # Compact index holding only what a search needs; the source frame is not retained
+        self.df = pd.DataFrame({
+            'location': df['location'].to_numpy(),
+            'region': df['region'].to_numpy(),
+            'department': df['department'].to_numpy(),
+            'department_num': df['department_num'].to_numpy(),
+            'postal_code': df['location'].map(lambda location: split_locations[location][1]).to_numpy(),
+            'normalized_city': df['location'].map(normalized_locations).to_numpy(),
+            'normalized_capital': df['capital'].map(normalized_capitals).to_numpy(),
+        })
+        self.df['is_capital'] = self.df['normalized_city'] == self.df['normalized_capital']
+
+        # A fuzzy match resolves to the first row carrying the matched city
+        self.city_rows = (
+            self.df.drop_duplicates(subset='normalized_city')
+            .set_index('normalized_city')[['location', 'region', 'department', 'is_capital']]
+            .to_dict('index')
+        )
 
-        # Normalize the 'capital' column for capital city comparison
-        self.df['normalized_capital'] = self.df['capital'].apply(self.normalize_text)
+        # Fuzzy search runs over the distinct cities only, in first-occurrence order
+        self.cities = list(self.city_rows)
+        self.search_index = build_location_search_index(self.cities)
+
+        # Exact lookup by postal code or department number; each code maps its cities to rows,
+        # with the department capital first so a bare code resolves to it
+        self.code_index = {}
+        ranked_rows = self.df.sort_values('is_capital', ascending=False, kind='stable')
+        for code_column in ('postal_code', 'department_num'):
+            code_rows = ranked_rows.dropna(subset=[code_column]).drop_duplicates(subset=[code_column, 'normalized_city'])
+            for row in code_rows.to_dict('records'):
+                self.code_index.setdefault(row[code_column], {})[row['normalized_city']] = {
+                    'location': row['location'],
+                    'region': row['region'],
+                    'department': row['department'],
+                    'is_capital': row['is_capital'],
+                }
 
     @staticmethod
     def normalize_text(text):
@@ -31,37 +76,79 @@ class LocationMatcher:
                 postal_code = parts[1]  # Second part is the postal code (if available)
         return city, postal_code
 
-    def get_region_department(self, city):
-        normalized_city = self.normalize_text(city)
-        city_matches = process.extractOne(normalized_city, self.df['normalized_city'], scorer=fuzz.token_sort_ratio)
+    @staticmethod
+    def split_location_code(city, postal_code=None):
+        # Separate a postal or department code from the city, e.g. "Lyon, 69002", "Lyon 69" or "2A"
+        if postal_code:
+            code = postal_code.strip().upper()
+            return city, code if LOCATION_CODE_PATTERN.match(code) else None
+
+        tokens = (city or '').split()
+        if tokens and LOCATION_CODE_PATTERN.match(tokens[-1].upper()):
+            return ' '.join(tokens[:-1]), tokens[-1].upper()
+        return city, None
 
-        # Ensure the match score is above the threshold
-        if city_matches and city_matches[1] >= self.threshold:
-            matched_city = city_matches[0]
-            # print(f"\nBest match found: {matched_city} with score {city_matches[1]}")
+    @staticmethod
+    def postal_department(postal_code):
+        # Department number of a postal code; Corsican 200xx/201xx codes are in 2A, the other 20xxx in 2B
+        if postal_code.startswith('20'):
+            return '2A' if postal_code[2] in '01' else '2B'
+        return postal_code[:2]
 
-            # Extract the row for the matched city
-            matched_row = self.df[self.df['normalized_city'] == matched_city].iloc[0]
+    def code_rows(self, location_code):
+        # Rows for an exact code; unknown postal codes fall back to their department
+        if not location_code:
+            return None
+        rows = self.code_index.get(location_code)
+        if rows is None and len(location_code) == 5:
+            rows = self.code_index.get(self.postal_department(location_code))
+        return rows
 
-            # Check if the city matches the department's capital
-            is_capital = matched_row['normalized_capital'] == matched_city
-            capital_status = "Department Capital" if is_capital else ""
+    def get_code_match(self, city, location_code):
+        rows = self.code_rows(location_code)
+        if not rows:
+            return None
+        if not city:
+            return next(iter(rows.values()))
+        return rows.get(self.normalize_text(city))
 
-            return {
-                'matched_city': matched_row['location'],  # Original location field (city and postal code)
-                'region': matched_row['region'],
-                'department': matched_row['department'],
-                'capital_status': capital_status  # Return "Department Capital" if applicable
-            }
-        else:
+    def get_region_department(self, city, location_code=None):
+        # An exact code hit needs no fuzzy scoring at all
+        matched_row = self.get_code_match(city, location_code)
+
+        if matched_row is None and city:
+            normalized_city = self.normalize_text(city)
+            city_match = best_location_match(self.search_index, normalized_city, self.threshold)
+
+            # Only matches at or above the threshold are returned
+            if city_match:
+                matched_city = self.cities[city_match[0]]
+                # The code breaks ties between same-named towns in different departments
+                matched_row = (
+                    (self.code_rows(location_code) or {}).get(matched_city)
+                    or self.city_rows[matched_city]
+                )
+
+        if matched_row is None:
             return None
 
+        # Check if the city matches the department's capital
+        capital_status = "Department Capital" if matched_row['is_capital'] else ""
+
+        return {
+            'matched_city': matched_row['location'],  # Original location field (city and postal code)
+            'region': matched_row['region'],
+            'department': matched_row['department'],
+            'capital_status': capital_status  # Return "Department Capital" if applicable
+        }
+
     def find_region_department(self, city_input):
-        # First, extract city and postal code
+        # First, extract city and postal or department code
         city, postal_code = self.split_location_field(city_input)
-        if city:
-            # Fuzzy match the city and get the region and department
-            result = self.get_region_department(city)
+        city, location_code = self.split_location_code(city, postal_code)
+        if city or location_code:
+            # Resolve by code where possible, otherwise fuzzy match the city
+            result = self.get_region_department(city, location_code)
             if result:
                 return {
                     'Matched Location': result['matched_city'],
@@ -72,4 +159,4 @@ class LocationMatcher:
             else:
                 return "No match found."
         else:
-            return "Invalid input."
\ No newline at end of file
+            return "Invalid input."
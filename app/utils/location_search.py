@@ -0,0 +1,122 @@
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+import math
+
+from fuzzywuzzy import fuzz, utils
+
+
+NGRAM_SIZE = 3
+NGRAM_PAD = "\0" * (NGRAM_SIZE - 1)  # Never survives full_process, so pads only match pads
+
+
+@dataclass(frozen=True)
+class LocationSearchIndex:
+    keys: tuple[str, ...]
+    ids_by_length: dict[int, tuple[int, ...]]
+    postings: dict[str, tuple[tuple[int, int], ...]]
+
+
+def location_search_key(text) -> str:
+    """Return the processed, token-sorted string that `fuzz.token_sort_ratio` compares."""
+    return " ".join(sorted(utils.full_process(text, force_ascii=True).split()))
+
+
+def _ngram_counts(key: str) -> Counter:
+    padded = f"{NGRAM_PAD}{key}{NGRAM_PAD}"
+    return Counter(padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1))
+
+
+def _min_common_length(query_length: int, candidate_length: int, threshold: int) -> int:
+    # Shortest common subsequence for which round(100 * 2 * LCS / total_length) can still reach threshold
+    return math.ceil((threshold - 0.5) * (query_length + candidate_length) / 200)
+
+
+def _min_shared_ngrams(query_length: int, candidate_length: int, common_length: int) -> int:
+    # q-gram lemma for an insert/delete alignment: each deletion breaks at most q padded n-grams
+    # and each insertion point at most q - 1, so this many n-grams must survive on both sides
+    return (
+        (2 * NGRAM_SIZE - 1) * common_length
+        - (NGRAM_SIZE - 1) * (query_length + candidate_length)
+        + NGRAM_SIZE - 1
+    )
+
+
+def build_location_search_index(names) -> LocationSearchIndex:
+    """
+    Index distinct location names for fuzzy lookup.
+
+    Names keep their order, so candidate IDs follow first occurrence just as a linear
+    `process.extractOne` scan would.
+    """
+    keys = tuple(location_search_key(name) for name in names)
+
+    ids_by_length = defaultdict(list)
+    postings = defaultdict(list)
+    for candidate_id, key in enumerate(keys):
+        ids_by_length[len(key)].append(candidate_id)
+        for ngram, count in _ngram_counts(key).items():
+            postings[ngram].append((candidate_id, count))
+
+    return LocationSearchIndex(
+        keys=keys,
+        ids_by_length={length: tuple(ids) for length, ids in ids_by_length.items()},
+        postings={ngram: tuple(entries) for ngram, entries in postings.items()},
+    )
+
+
+def location_search_candidates(index: LocationSearchIndex, query_key: str, threshold: int) -> list[int]:
+    """
+    Shortlist candidate IDs that could score at least `threshold` against `query_key`.
+
+    Candidates are pruned by length first and then by shared n-gram count; both bounds
+    are exact, so no candidate reaching the threshold is ever dropped.
+    """
+    query_length = len(query_key)
+    if not query_length:
+        # fuzz.ratio scores any pair with an empty string as 0, unless both are empty: its equality
+        # check runs before the empty-string check and scores them 100. Only empty keys can match.
+        return list(index.ids_by_length.get(0, ()))
+
+    required_ngrams = {}
+    unconditional = []
+    for candidate_length, candidate_ids in index.ids_by_length.items():
+        common_length = _min_common_length(query_length, candidate_length, threshold)
+        if common_length > min(query_length, candidate_length):
+            continue
+
+        min_shared = _min_shared_ngrams(query_length, candidate_length, common_length)
+        if min_shared <= 0:
+            unconditional.extend(candidate_ids)
+        else:
+            required_ngrams[candidate_length] = min_shared
+
+    shared = defaultdict(int)
+    for ngram, query_count in _ngram_counts(query_key).items():
+        for candidate_id, candidate_count in index.postings.get(ngram, ()):
+            shared[candidate_id] += min(query_count, candidate_count)
+
+    shortlisted = [
+        candidate_id
+        for candidate_id, count in shared.items()
+        if count >= required_ngrams.get(len(index.keys[candidate_id]), math.inf)
+    ]
+    return sorted(set(shortlisted).union(unconditional))
+
+
+def best_location_match(index: LocationSearchIndex, query, threshold: int) -> tuple[int, int] | None:
+    """
+    Return `(candidate_id, score)` for the best `token_sort_ratio` match at or above `threshold`.
+
+    Ties resolve to the lowest candidate ID, matching `process.extractOne`.
+    """
+    query_key = location_search_key(query)
+
+    best = None
+    for candidate_id in location_search_candidates(index, query_key, threshold):
+        score = fuzz.ratio(query_key, index.keys[candidate_id])
+        if best is None or score > best[1]:
+            best = (candidate_id, score)
+
+    if best is None or best[1] < threshold:
+        return None
+    return best
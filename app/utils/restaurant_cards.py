@@ -1,7 +1,26 @@
+import json
+from types import MappingProxyType
+
 from dash import html
+from plotly.utils import PlotlyJSONEncoder
 
 from app.components.shared import bib_gourmand, color_map, green_star, michelin_stars
 
+# Restaurant fields `get_restaurant_details` reads
+CARD_COLUMNS = (
+    'name',
+    'stars',
+    'greenstar',
+    'cuisine',
+    'price',
+    'address',
+    'location',
+    'arrondissement',
+    'url',
+    'department_num',
+)
+
+
 def get_restaurant_details(row, extra_class_name=''):
     """
     Generate an HTML Div containing detailed information about a restaurant.
@@ -82,3 +101,49 @@ def get_restaurant_details(row, extra_class_name=''):
     ], className=card_class_name, style={'borderColor': border_color})
 
     return details_layout
+
+
+def build_restaurant_details(restaurants):
+    """
+    Return the detail card fields of every restaurant keyed by its `restaurant_id`.
+
+    Parameters:
+        restaurants (pd.DataFrame): Restaurants with a unique 'restaurant_id' column.
+
+    Returns:
+        MappingProxyType: {restaurant_id: {field: value}} for the fields in `CARD_COLUMNS`.
+    """
+    records = restaurants[list(CARD_COLUMNS)].to_dict('records')
+    return MappingProxyType(dict(zip(restaurants['restaurant_id'], records)))
+
+
+class RestaurantCardCache:
+    """
+    Serialised restaurant detail cards keyed by restaurant ID and extra class name.
+
+    A card is rendered by `get_restaurant_details` on first use and its JSON-ready dict is shared by
+    every later request, so callers must not change it. There is at most one entry per restaurant and
+    class name, so the cache needs no eviction.
+    """
+
+    def __init__(self, details):
+        self.details = details
+        self._cards = {}
+
+    def __len__(self):
+        return len(self._cards)
+
+    def card(self, restaurant_id, extra_class_name=''):
+        """Return the serialised detail card of a restaurant, as `get_restaurant_details` would render it."""
+        key = (restaurant_id, extra_class_name)
+        card = self._cards.get(key)
+        if card is None:
+            component = get_restaurant_details(self.details[restaurant_id], extra_class_name=extra_class_name)
+            card = json.loads(json.dumps(component, cls=PlotlyJSONEncoder))
+            # Concurrent first uses may both render; setdefault keeps one card for everyone
+            card = self._cards.setdefault(key, card)
+        return card
+
+    def cards(self, restaurant_ids, extra_class_name=''):
+        """Return the serialised detail cards of several restaurants, in order."""
+        return [self.card(restaurant_id, extra_class_name) for restaurant_id in restaurant_ids]
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Columns the index partitions restaurants by
+INDEX_COLUMNS = ('department_num', 'arrondissement', 'region')
+
+_NO_POSITIONS = np.empty(0, dtype=np.intp)
+
+
+@dataclass(frozen=True)
+class RestaurantIndex:
+    """
+    Row positions of the France + Monaco restaurant frame, grouped by location and star level.
+
+    France rows come first, so the France-only view of any group is the prefix of its positions
+    below ``france_count`` and no frame is concatenated or copied per request.
+    """
+    restaurants: pd.DataFrame
+    france_count: int
+    groups: dict[tuple[str, object], dict[float, np.ndarray]]
+
+    def department(self, code, stars=None, include_monaco=False):
+        """Return the restaurants in a department code, optionally limited to some star levels."""
+        return self._take(self.groups.get(('department_num', str(code)), {}), stars, include_monaco)
+
+    def arrondissement(self, arrondissement, stars=None, include_monaco=False):
+        """Return the restaurants in an arrondissement, optionally limited to some star levels."""
+        return self._take(self.groups.get(('arrondissement', arrondissement), {}), stars, include_monaco)
+
+    def regions(self, regions, stars=None, include_monaco=False):
+        """Return the restaurants in any of the given regions, optionally limited to some star levels."""
+        by_star = {}
+        for region in dict.fromkeys(regions):
+            for star, positions in self.groups.get(('region', region), {}).items():
+                by_star.setdefault(star, []).append(positions)
+        merged = {star: np.sort(np.concatenate(arrays)) for star, arrays in by_star.items()}
+        return self._take(merged, stars, include_monaco)
+
+    def _positions(self, by_star, stars=None, include_monaco=False):
+        """Return the sorted row positions of a star-level group, without Monaco unless asked."""
+        levels = by_star if stars is None else dict.fromkeys(stars)
+        arrays = [by_star[star] for star in levels if star in by_star]
+        if not arrays:
+            return _NO_POSITIONS
+        positions = arrays[0] if len(arrays) == 1 else np.sort(np.concatenate(arrays))
+        if not include_monaco:
+            positions = positions[:np.searchsorted(positions, self.france_count)]
+        return positions
+
+    def _take(self, by_star, stars, include_monaco):
+        return self.restaurants.iloc[self._positions(by_star, stars, include_monaco)]
+
+
+def _positions_by_star(stars, positions):
+    order = np.argsort(stars[positions], kind='stable')
+    sorted_positions = positions[order]
+    levels, starts = np.unique(stars[sorted_positions], return_index=True)
+    return {
+        float(star): chunk
+        for star, chunk in zip(levels, np.split(sorted_positions, starts[1:]))
+    }
+
+
+def build_restaurant_index(restaurants_with_monaco, france_count):
+    """
+    Group the restaurant rows once so location and star filters cost the size of their result.
+
+    Args:
+        restaurants_with_monaco (pd.DataFrame): France restaurants followed by Monaco restaurants.
+        france_count (int): Number of leading France rows.
+
+    Returns:
+        RestaurantIndex: Sorted row positions keyed by location column value and star level.
+    """
+    stars = restaurants_with_monaco['stars'].to_numpy()
+    groups = {}
+    for column in INDEX_COLUMNS:
+        codes, values = pd.factorize(restaurants_with_monaco[column])
+        order = np.argsort(codes, kind='stable')
+        starts = np.flatnonzero(np.diff(codes[order], prepend=-2))
+        for start, positions in zip(starts, np.split(order, starts[1:])):
+            code = codes[order[start]]
+            if code < 0:
+                continue
+            groups[(column, values[code])] = _positions_by_star(stars, positions.astype(np.intp))
+
+    return RestaurantIndex(
+        restaurants=restaurants_with_monaco,
+        france_count=france_count,
+        groups=groups,
+    )
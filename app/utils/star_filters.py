@@ -1,44 +1,140 @@
+import json
+from dataclasses import dataclass
+
+from dash.dependencies import ALL, Input, Output, State
+
 from app.components.shared import color_map
 
-def update_button_active_state_helper(n_clicks_list, ids, filter_type):
-    """
-    Generalized function to update the button states for different filter types (e.g., analysis, department, etc.).
 
-    Args:
-        n_clicks_list (list): List of n_clicks from the buttons.
-        ids (list): List of button ids.
-        filter_type (str): The type of filter (analysis, department, demographics, wine).
+def inactive_star_colour(hex_colour):
+    """Return the lighter background of an inactive star button for a '#rrggbb' colour."""
+    return (f"rgba({int(hex_colour[1:3], 16)},"
+            f"{int(hex_colour[3:5], 16)},"
+            f"{int(hex_colour[5:7], 16)},"
+            f"0.6)")
+
+
+def star_button_colours():
+    """
+    Return the star button backgrounds keyed as the browser sees a button's `index`.
 
     Returns:
-        list: Class names for each button.
-        list: Styles for each button.
+        dict: {star: {'active': colour, 'inactive': colour}}, with stars as their JavaScript string
+        form ('0.25', '1', ...) so a clientside callback can look them up with `String(index)`.
     """
-    # Initialize empty lists to store class names and styles
-    class_names = []
-    styles = []
-
-    for n_clicks, button_id in zip(n_clicks_list, ids):
-        index = button_id['index']
-
-        # Determine if the button is currently active
-        is_active = n_clicks % 2 == 0  # Even clicks mean 'active'
-        if is_active:
-            background_color = color_map[index]  # Full color for active state
-        else:
-            background_color = (f"rgba({int(color_map[index][1:3], 16)},"
-                                f"{int(color_map[index][3:5], 16)},"
-                                f"{int(color_map[index][5:7], 16)},"
-                                f"0.6)")  # Lighter color for inactive
-
-        # Update class name and style based on the active/inactive state
-        class_name = f"me-1 star-button-{filter_type} editorial-rating-button" + (" active" if is_active else "")
-        color_style = {
-            "display": 'inline-block',
-            "width": '100%',
-            'backgroundColor': background_color,
-        }
-
-        class_names.append(class_name)
-        styles.append(color_style)
-
-    return class_names, styles
+    return {
+        json.dumps(star): {'active': colour, 'inactive': inactive_star_colour(colour)}
+        for star, colour in color_map.items()
+    }
+
+
+@dataclass(frozen=True)
+class StarSelection:
+    """
+    Components through which a page's star buttons also keep a store of the selected ratings.
+
+    Ratings missing from the available-stars store are greyed out, and 0.25 follows the "Selected" toggle button.
+    """
+    stars_store: str
+    available_store: str
+    toggle_button: str
+
+
+# Active buttons use the full rating colour and inactive ones a lighter version; an even click count is active.
+# `{colours}`, `{class_name}` and `{with_selection}` are filled in when the callback is registered. With a
+# `StarSelection`, the toggle button's clicks follow the buttons' clicks and the two stores follow their ids.
+STAR_BUTTON_STATE_JS = """
+function(nClicksList, ...args) {{
+    const withSelection = {with_selection};
+    const toggleSelectedClicks = withSelection ? args[0] : null;
+    const ids = withSelection ? args[1] : args[0];
+    const currentStars = withSelection ? args[2] : null;
+    // Without a selection every rating is available
+    const available = withSelection ? (args[3] || []) : null;
+    const onlySelected = withSelection && available.length === 1 && available[0] === 0.25;
+    if ((!nClicksList || nClicksList.length === 0 || (available && available.length === 0)) && !onlySelected) {{
+        throw window.dash_clientside.PreventUpdate;
+    }}
+    const colours = {colours};
+    const classNames = [];
+    const styles = [];
+    const newStars = (currentStars || []).filter(star => available.includes(star) && star !== 0.25);
+
+    ids.forEach(function(buttonId, i) {{
+        const index = buttonId.index;
+        if (available && !available.includes(index)) {{
+            classNames.push('{class_name} inactive');
+            styles.push({{display: 'inline-block', width: '100%', backgroundColor: '#cccccc'}});
+            return;
+        }}
+        const isActive = ((i < nClicksList.length ? nClicksList[i] : 0) || 0) % 2 === 0;
+        if (isActive && !newStars.includes(index)) {{
+            newStars.push(index);
+        }} else if (!isActive && newStars.includes(index)) {{
+            newStars.splice(newStars.indexOf(index), 1);
+        }}
+        classNames.push('{class_name}' + (isActive ? ' active' : ''));
+        styles.push({{
+            display: 'inline-block',
+            width: '100%',
+            backgroundColor: isActive ? colours[String(index)].active : colours[String(index)].inactive
+        }});
+    }});
+    if (!withSelection) {{
+        return [classNames, styles];
+    }}
+
+    const selectedActive = (toggleSelectedClicks || 0) % 2 === 0;
+    if (selectedActive && !newStars.includes(0.25)) {{
+        newStars.push(0.25);
+    }} else if (!selectedActive && newStars.includes(0.25)) {{
+        newStars.splice(newStars.indexOf(0.25), 1);
+    }}
+    const selectedClass = 'selected-toggle-button' + (selectedActive ? ' active' : ' inactive');
+    // Show the toggle button only if 0.25 is an available star rating
+    const selectedStyle = {{display: available.includes(0.25) ? 'block' : 'none'}};
+
+    return [classNames, styles, newStars, selectedClass, selectedStyle];
+}}
+"""
+
+
+def star_button_script(class_name, with_selection=False):
+    """Return the clientside star button callback for buttons of `class_name`, from `STAR_BUTTON_STATE_JS`."""
+    return STAR_BUTTON_STATE_JS.format(
+        colours=json.dumps(star_button_colours()),
+        class_name=class_name,
+        with_selection=json.dumps(with_selection),
+    )
+
+
+def register_star_button_callback(app, button_type, filter_type=None, class_name=None, selection=None):
+    """
+    Style a page's star filter buttons in the browser as they are clicked.
+
+    Args:
+        app (dash.Dash): The app to register the clientside callback on.
+        button_type (str): The pattern-matching id type of the buttons, e.g. 'filter-button-wine'.
+        filter_type (str, optional): The filter type in the buttons' class name (analysis, department,
+            demographics, wine).
+        class_name (str, optional): The buttons' class name, when it is not derived from `filter_type`.
+        selection (StarSelection, optional): Stores and toggle button through which the buttons also keep
+            the selected ratings, as on the guide page.
+    """
+    if class_name is None:
+        class_name = f'me-1 star-button-{filter_type} editorial-rating-button'
+
+    outputs = [Output({'type': button_type, 'index': ALL}, 'className'),
+               Output({'type': button_type, 'index': ALL}, 'style')]
+    inputs = [Input({'type': button_type, 'index': ALL}, 'n_clicks')]
+    states = [State({'type': button_type, 'index': ALL}, 'id')]
+    if selection is not None:
+        outputs += [Output(selection.stars_store, 'data'),
+                    Output(selection.toggle_button, 'className'),
+                    Output(selection.toggle_button, 'style')]
+        inputs.append(Input(selection.toggle_button, 'n_clicks'))
+        states += [State(selection.stars_store, 'data'),
+                   State(selection.available_store, 'data')]
+
+    app.clientside_callback(star_button_script(class_name, with_selection=selection is not None),
+                            outputs, inputs, states)
@@ -0,0 +1,31 @@
+import gc
+
+
+# Import michelin_app, and with it app.app_data.DATA, once in the master process.
+# Workers are forked from it and share the loaded frames copy-on-write instead of
+# each parsing their own copy. Worker count comes from WEB_CONCURRENCY, which
+# gunicorn reads by default and Heroku sets per dyno size.
+preload_app = True
+
+# Keep the cyclic collector from interleaving garbage with the long-lived data while
+# the master loads it, so the pages that hold that data stay densely packed.
+gc.disable()
+
+
+def when_ready(server):
+    # Move everything the master has loaded into the permanent generation. Collections
+    # in the workers then skip those objects instead of writing to their GC headers,
+    # which would copy every page holding one of them into each worker.
+    gc.freeze()
+    gc.enable()
+
+
+def on_reload(server):
+    # A SIGHUP reload re-runs this file in the master, disabling the collector again, but
+    # when_ready only runs at startup, so turn it back on here.
+    gc.enable()
+
+
+def post_fork(server, worker):
+    # Without preload_app the worker imports the app itself and needs the collector on.
+    gc.enable()
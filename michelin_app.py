@@ -68,8 +68,11 @@ app.layout = html.Div([
 # Initialize the cache (Maybe Redis or filesystem-based caching for production...?)
 cache = Cache(app.server, config=CONFIG.cache_config)
 
+# Load the lazy frames behind WARM_PAGES before the first request (before forking under preload_app)
+DATA.warm(CONFIG.warm_pages)
+
 register_navigation_callbacks(app)
-register_guide_callbacks(app, DATA)
+register_guide_callbacks(app, DATA, CONFIG)
 register_analysis_callbacks(app, DATA)
 register_economics_callbacks(app, DATA)
 register_wine_callbacks(app, DATA, CONFIG, cache, client)
@@ -0,0 +1,306 @@
+import geopandas as gpd
+import pandas as pd
+import pytest
+from dash import no_update
+from shapely.geometry import Point, box
+
+from app.callbacks.analysis import choropleth_map, register_analysis_callbacks
+from app.utils.analysis_figures import (
+    RANKING_CARDS_PAGE_SIZE,
+    RANKING_GRANULARITIES,
+    RANKING_STAR_RATINGS,
+    RANKING_TOP_N,
+    build_choropleth_areas,
+    build_ranking_table,
+    choropleth_features,
+    choropleth_totals,
+    choropleth_views,
+    plot_single_choropleth_plotly,
+    rank_areas,
+    ranked_area_cards,
+    ranking_area_id,
+    render_ranking,
+    star_count_matrix,
+)
+
+
+@pytest.fixture
+def departments():
+    return gpd.GeoDataFrame(
+        {
+            "code": ["01", "2A", "75"],
+            "department": ["Ain", "Corse-du-Sud", "Paris"],
+            "region": ["Auvergne-Rhône-Alpes", "Corse", "Île-de-France"],
+            "bib_gourmand": [1, 2, 3],
+            "1_star": [10, 20, 30],
+            "2_star": [100, 200, 300],
+            "3_star": [0, 0, 1],
+        },
+        geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1), box(2, 0, 3, 1)],
+        crs="EPSG:4326",
+    )
+
+
+def test_choropleth_features_are_keyed_by_area_id(departments):
+    features = choropleth_features(departments, "department")
+
+    assert list(features) == ["01", "2A", "75"]
+    assert features["2A"]["id"] == "2A"
+    assert features["2A"]["properties"] == {}
+    assert features["2A"]["geometry"]["type"] == "Polygon"
+
+
+def test_choropleth_features_reject_duplicate_ids(departments):
+    departments.loc[2, "code"] = "01"
+
+    with pytest.raises(RuntimeError, match="unique feature IDs"):
+        choropleth_features(departments, "department")
+
+
+def test_choropleth_references_shared_features_without_changing_the_frame(departments):
+    features = choropleth_features(departments, "department")
+    selection = departments.iloc[[2, 0]]
+
+    trace = plot_single_choropleth_plotly(
+        selection, [0.5, 2], granularity="department", show_labels=False, features=features
+    ).data[0]
+
+    assert trace.featureidkey == "id"
+    assert list(trace.locations) == ["75", "01"]
+    assert [feature["id"] for feature in trace.geojson["features"]] == ["75", "01"]
+    assert list(trace.z) == [303, 101]
+    assert "total_restaurants" not in departments.columns
+
+
+def test_star_toggles_on_the_displayed_areas_only_patch_totals(departments):
+    features = choropleth_features(departments, "department")
+    counts = star_count_matrix(departments)
+
+    fig, areas = choropleth_map(departments, counts, [1], "department", features, None, None, star_toggle=False)
+    assert areas == ["01", "2A", "75"]
+    assert list(fig.data[0].z) == [10, 20, 30]
+
+    patch, patched_areas = choropleth_map(
+        departments, counts, [1, 3], "department", features, None, areas, star_toggle=True
+    )
+    assert patched_areas is no_update
+    assert patch.to_plotly_json()["operations"] == [
+        {"operation": "Assign", "location": ["data", 0, "z"], "params": {"value": [10, 20, 31]}}
+    ]
+
+    # A toggle that reaches a map still drawing other areas redraws it
+    redrawn, redrawn_areas = choropleth_map(
+        departments.iloc[:2], counts[:2], [1], "department", features, None, areas, star_toggle=True
+    )
+    assert redrawn_areas == ["01", "2A"]
+    assert list(redrawn.data[0].z) == [10, 20]
+
+
+@pytest.mark.parametrize(
+    ("selected_stars", "expected"),
+    [([], [0, 0, 0]), ([0.5], [1, 2, 3]), ([3, 0.5], [1, 2, 4]), ([0.5, 1, 2, 3], [111, 222, 334])],
+)
+def test_choropleth_totals_sum_the_selected_count_columns(departments, selected_stars, expected):
+    assert choropleth_totals(star_count_matrix(departments), selected_stars).tolist() == expected
+
+
+def test_choropleth_areas_select_groups_in_display_order(departments):
+    departments["region"] = ["Corse", "Corse", "Île-de-France"]
+    areas = build_choropleth_areas(departments, "region", sort_column="department")
+
+    frame, counts = areas.select(["Île-de-France", "Corse", "nowhere"])
+
+    assert frame["department"].tolist() == ["Ain", "Corse-du-Sud", "Paris"]
+    assert counts.tolist() == star_count_matrix(frame).tolist()
+    assert areas.select(["nowhere"])[0].empty
+
+
+def test_single_group_selections_reuse_the_group_slice(departments):
+    areas = build_choropleth_areas(departments, "region", sort_column="department")
+
+    frame, counts = areas.select(["Corse", "nowhere"])
+
+    assert frame is areas.select(["Corse"])[0]
+    assert counts is areas.select(["Corse"])[1]
+    assert frame["department"].tolist() == ["Corse-du-Sud"]
+    assert counts.tolist() == [[2, 20, 200, 0]]
+
+
+def test_arrondissement_layer_covers_every_department(data_boundary):
+    layer = data_boundary.arrondissement_choropleth
+
+    assert set(layer.views) == set(layer.areas.groups) == set(data_boundary.arron_df["department"])
+    assert set(layer.features) == set(data_boundary.arron_df["code"])
+
+
+def _expected_center(selection):
+    # Mean of the areas' Web Mercator centroids, projected back to longitude and latitude
+    centroids = selection.to_crs(3857).geometry.centroid
+    center = gpd.GeoSeries([Point(centroids.x.mean(), centroids.y.mean())], crs=3857).to_crs(4326).iloc[0]
+    return {"lat": center.y, "lon": center.x}
+
+
+def test_department_views_centre_each_region_on_its_departments(data_boundary):
+    department_df = data_boundary.department_df
+    views = choropleth_views(department_df, "department")
+
+    assert set(views) == set(department_df["region"])
+    for region, view in views.items():
+        selection = department_df[department_df["region"] == region]
+        assert view["projection_scale"] == (30 if region == "Île-de-France" else 11)
+        assert view["center"] == pytest.approx(_expected_center(selection), abs=1e-9)
+
+
+def test_arrondissement_views_zoom_on_paris_and_ile_de_france(data_boundary):
+    paris_view = choropleth_views(data_boundary.paris_df, "arrondissement")["Paris"]
+
+    assert paris_view["projection_scale"] == 300
+    assert paris_view["center"] == pytest.approx(_expected_center(data_boundary.paris_df), abs=1e-9)
+    assert paris_view["center"]["lat"] == pytest.approx(48.86, abs=0.05)
+    assert paris_view["center"]["lon"] == pytest.approx(2.34, abs=0.05)
+
+    arron_df = data_boundary.arron_df
+    views = choropleth_views(arron_df, "arrondissement")
+    for department, scale in (("Hauts-de-Seine", 125), ("Rhône", 25)):
+        selection = arron_df[arron_df["department"] == department]
+        assert views[department]["projection_scale"] == scale
+        assert views[department]["center"] == pytest.approx(_expected_center(selection), abs=1e-9)
+
+
+def test_figure_uses_the_given_view(departments):
+    view = {"center": {"lat": 45.0, "lon": 4.0}, "projection_scale": 11}
+
+    geo = plot_single_choropleth_plotly(departments, [1], granularity="department", show_labels=False, view=view).layout.geo
+
+    assert (geo.center.lat, geo.center.lon, geo.projection.scale) == (45.0, 4.0, 11)
+
+
+def _restaurants(departments_and_stars):
+    return pd.DataFrame(
+        [
+            {
+                "restaurant_id": f"restaurant-{position}",
+                "department": department,
+                "department_num": department_num,
+                "region": "Occitanie",
+                "stars": stars,
+                "greenstar": 0,
+            }
+            for position, (department, department_num, stars) in enumerate(departments_and_stars)
+        ]
+    )
+
+
+def test_rank_areas_groups_areas_tied_outside_the_top_n():
+    restaurants = _restaurants(
+        [("Gard", "30", 2), ("Gard", "30", 2), ("Hérault", "34", 2), ("Aude", "11", 2), ("Lot", "46", 2),
+         ("Tarn", "81", 3)]
+    )
+
+    ranking = rank_areas(restaurants, "department", 2, top_n=2)
+
+    assert [area.label for area in ranking.top_areas] == ["Gard (30): Occitanie", "Hérault (34): Occitanie"]
+    assert ranking.top_areas[0].restaurant_ids == ("restaurant-0", "restaurant-1")
+    assert [(area.area, area.restaurant_count) for area in ranking.tied_areas] == [("Aude", 1), ("Lot", 1)]
+
+
+def test_empty_rankings_render_nothing():
+    ranking = rank_areas(_restaurants([("Gard", "30", 2)]), "department", 3, top_n=3)
+
+    assert ranking.top_areas == ranking.tied_areas == ()
+    assert render_ranking(ranking, 3, restaurant_cards=None) == []
+
+
+def test_ranking_table_covers_every_dropdown_choice(data_boundary):
+    table = build_ranking_table(data_boundary.all_france)
+
+    assert set(table) == {
+        (granularity, star_rating, top_n)
+        for granularity in RANKING_GRANULARITIES
+        for star_rating in RANKING_STAR_RATINGS
+        for top_n in RANKING_TOP_N
+    }
+    paris = table[("arrondissement", 3, 1)]
+    assert 1 <= len(paris.top_areas) <= 5
+    assert all(area.label.endswith("Paris (75), Île-de-France") for area in paris.top_areas)
+    assert all(area.area != "Paris" for area in table[("department", 2, 3)].top_areas)
+
+
+class _IdCards:
+    def cards(self, restaurant_ids, extra_class_name=''):
+        return list(restaurant_ids)
+
+
+def test_ranked_area_cards_are_paged():
+    restaurants = _restaurants([("Gard", "30", 2)] * (RANKING_CARDS_PAGE_SIZE + 1))
+    area = rank_areas(restaurants, "department", 2, top_n=1).top_areas[0]
+
+    first_page, has_more = ranked_area_cards(area, 0, _IdCards())
+    last_page, has_more_after_last = ranked_area_cards(area, 1, _IdCards())
+
+    assert (len(first_page), has_more) == (RANKING_CARDS_PAGE_SIZE, True)
+    assert (last_page, has_more_after_last) == ([f"restaurant-{RANKING_CARDS_PAGE_SIZE}"], False)
+    assert first_page + last_page == list(area.restaurant_ids)
+
+
+def test_keyed_rankings_show_a_more_button_only_for_areas_with_more_cards():
+    restaurants = _restaurants(
+        [("Gard", "30", 2)] * (RANKING_CARDS_PAGE_SIZE + 1) + [("Aude", "11", 2)]
+    )
+    key = ("department", 2, 3)
+    ranking = rank_areas(restaurants, "department", 2, top_n=3)
+
+    components = render_ranking(ranking, 2, _IdCards(), ranking_key=key)
+    ids = [component.id for component in components if getattr(component, "id", None)]
+
+    assert ids == [
+        ranking_area_id("ranking-cards", key, 0),
+        ranking_area_id("ranking-more-cards", key, 0),
+        ranking_area_id("ranking-cards", key, 1),
+    ]
+    assert len(components[1].children) == RANKING_CARDS_PAGE_SIZE
+    button, next_page = components[2].children
+    assert button.id == ranking_area_id("ranking-more-cards-button", key, 0)
+    assert (next_page.id, next_page.data) == (ranking_area_id("ranking-next-page", key, 0), 1)
+    # Without a key every card is rendered, as before
+    assert len(render_ranking(ranking, 2, _IdCards())[1].children) == RANKING_CARDS_PAGE_SIZE + 1
+
+
+class _CallbackCapture:
+    def __init__(self):
+        self.callbacks = {}
+
+    def callback(self, *args, **kwargs):
+        def register(function):
+            self.callbacks[function.__name__] = function
+            return function
+        return register
+
+    def clientside_callback(self, *args, **kwargs):
+        pass
+
+
+def test_show_more_appends_the_stored_page_whatever_the_click_count(data_boundary):
+    app = _CallbackCapture()
+    register_analysis_callbacks(app, data_boundary)
+    load_more = app.callbacks["load_more_ranking_cards"]
+    key = ("region", "green", 5)
+    area = build_ranking_table(data_boundary.all_france)[key].areas[0]
+    assert len(area.restaurant_ids) > 3 * RANKING_CARDS_PAGE_SIZE
+    button_id = ranking_area_id("ranking-more-cards-button", key, 0)
+
+    def appended(patch):
+        (operation,) = patch.to_plotly_json()["operations"]
+        assert operation["operation"] == "Extend"
+        return operation["params"]["value"]
+
+    def page_cards(page):
+        restaurant_ids = area.restaurant_ids[page * RANKING_CARDS_PAGE_SIZE:(page + 1) * RANKING_CARDS_PAGE_SIZE]
+        return data_boundary.restaurant_cards.cards(restaurant_ids, extra_class_name="editorial-guide-entry")
+
+    cards, style, next_page = load_more(1, 1, button_id)
+    assert (appended(cards), style, next_page) == (page_cards(1), no_update, 2)
+
+    # The response to click 2 was lost, so click 3 still starts from the stored page
+    cards, style, next_page = load_more(3, next_page, button_id)
+    assert (appended(cards), style, next_page) == (page_cards(2), no_update, 3)
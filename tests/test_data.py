@@ -1,9 +1,20 @@
+import dataclasses
+
 import geopandas as gpd
 import pandas as pd
 import pytest
 from shapely.geometry import Point, Polygon
 
-from app.app_data import _validate_wine_data, wine_feature_id
+from app.app_data import (
+    _require_unique_restaurant_ids,
+    _validate_wine_data,
+    _with_restaurant_ids,
+    restaurant_id,
+    wine_feature_id,
+    wine_feature_ids,
+    wine_validation_report,
+)
+from app.utils.restaurant_cards import CARD_COLUMNS
 
 
 def _assert_string_like_values(frame, column):
@@ -59,6 +70,91 @@ def test_derived_data_collections_are_available(data_boundary):
     assert len(geo_with_monaco) >= len(data_boundary.geo_df)
 
 
+@pytest.mark.parametrize("include_monaco", [False, True])
+def test_restaurant_and_geo_variants_are_shared_across_calls(data_boundary, include_monaco):
+    assert data_boundary.get_combined_restaurant_data(include_monaco) is data_boundary.get_combined_restaurant_data(
+        include_monaco=include_monaco
+    )
+    assert data_boundary.get_geo_df(include_monaco) is data_boundary.get_geo_df(include_monaco=include_monaco)
+
+    dept_to_code = data_boundary.get_dept_to_code(include_monaco)
+    assert dept_to_code is data_boundary.get_dept_to_code(include_monaco=include_monaco)
+    assert set(dept_to_code) == set(data_boundary.get_geo_df(include_monaco)["department"])
+    with pytest.raises(TypeError):
+        dept_to_code["Paris"] = "00"
+
+
+def test_monaco_department_code_is_only_in_the_monaco_variant(data_boundary):
+    assert "Monaco" not in data_boundary.get_dept_to_code()
+    assert data_boundary.get_dept_to_code(include_monaco=True)["Monaco"] == "98"
+
+
+@pytest.fixture
+def fresh_data(tmp_path):
+    from app.app_config import CONFIG
+    from app.app_data import load_michelin_data
+
+    return load_michelin_data(dataclasses.replace(CONFIG, data_snapshot_dir=tmp_path))
+
+
+def test_lazy_frames_load_on_first_access(fresh_data):
+    assert not any(frame.loaded for frame in fresh_data.lazy_frames.values())
+
+    wine_df = fresh_data.wine_df
+
+    assert fresh_data.lazy_frames["wine_df"].loaded
+    assert fresh_data.wine_df is wine_df
+    assert not fresh_data.lazy_frames["arron_df"].loaded
+
+
+def test_warm_loads_only_the_frames_behind_the_requested_pages(fresh_data):
+    fresh_data.warm(["guide", "analysis"])
+
+    assert fresh_data.lazy_frames["arron_df"].loaded
+    assert fresh_data.lazy_frames["arrondissement_choropleth"].loaded
+    assert not fresh_data.lazy_frames["wine_df"].loaded
+
+    fresh_data.warm(["all"])
+
+    assert fresh_data.lazy_frames["wine_df"].loaded
+
+
+def test_warm_rejects_unknown_pages(fresh_data):
+    with pytest.raises(RuntimeError, match="unknown pages: cellar"):
+        fresh_data.warm(["wine", "cellar"])
+
+
+def test_restaurant_ids_are_deterministic_unique_and_resolve_details(data_boundary):
+    restaurants = data_boundary.restaurants_with_monaco
+    expected = [
+        restaurant_id(name, address, location)
+        for name, address, location in restaurants[["name", "address", "location"]].itertuples(index=False, name=None)
+    ]
+
+    assert restaurants["restaurant_id"].tolist() == expected
+    assert restaurants["restaurant_id"].is_unique
+
+    reversed_frame = _with_restaurant_ids(restaurants.drop(columns="restaurant_id").iloc[::-1].reset_index(drop=True))
+    assert reversed_frame.set_index("restaurant_id")["name"].to_dict() == (
+        restaurants.set_index("restaurant_id")["name"].to_dict()
+    )
+
+    details = data_boundary.restaurant_details
+    assert len(details) == len(restaurants)
+    row = restaurants.iloc[-1]
+    assert details[row["restaurant_id"]] == row[list(CARD_COLUMNS)].to_dict()
+    with pytest.raises(TypeError):
+        details[row["restaurant_id"]] = {}
+
+
+def test_duplicate_restaurants_are_rejected():
+    restaurant = {"name": "A", "address": "1 rue B", "location": "Lyon, 69002"}
+    restaurants = _with_restaurant_ids(pd.DataFrame([restaurant, {**restaurant, "address": "2 rue B"}, restaurant]))
+
+    with pytest.raises(RuntimeError, match="share a name, address and location: A"):
+        _require_unique_restaurant_ids(restaurants)
+
+
 def _wine_frame(rows, geometries):
     return gpd.GeoDataFrame(rows, geometry=geometries, crs="EPSG:4326")
 
@@ -122,3 +218,58 @@ def test_wine_parent_region_must_have_one_colour():
 
     with pytest.raises(RuntimeError, match="exactly one colour: Test"):
         _validate_wine_data(frame)
+
+
+def test_wine_validation_report_collects_every_problem_in_order():
+    frame = _wine_frame(
+        [
+            {"region": "Test", "app": "Repeated", "colour": "#123456"},
+            {"region": "Test", "app": "Repeated", "colour": "#654321"},
+            {"region": "Other", "app": None, "colour": "#abcdef"},
+        ],
+        [
+            Polygon([(0, 0), (1, 0), (1, 1), (0, 0)]),
+            Point(0, 0),
+            None,
+        ],
+    )
+
+    report = wine_validation_report(frame, wine_feature_ids(frame["region"], frame["app"]))
+
+    assert report.missing_geometries == 1
+    assert report.missing_values == ("app",)
+    assert report.unsupported_geometry_types == ("Point",)
+    assert report.duplicate_pairs == 1
+    assert report.inconsistent_colour_regions == ("Test",)
+    assert report.duplicate_feature_ids == 0
+    assert report.errors == [
+        "wine_df contains missing or empty geometries",
+        "wine_df contains missing values in: app",
+        "wine_df contains unsupported geometry types: Point",
+        "wine_df contains duplicate (region, app) pairs",
+        "wine_df parent regions must each have exactly one colour: Test",
+    ]
+    with pytest.raises(RuntimeError, match="missing or empty geometries; wine_df contains missing values"):
+        report.raise_for_errors()
+
+
+def test_wine_validation_report_is_clean_for_loaded_layer(data_boundary):
+    wine_df = data_boundary.wine_df
+
+    assert wine_validation_report(wine_df, wine_df["feature_id"]).errors == []
+
+
+def test_wine_feature_id_collisions_are_reported_separately_from_duplicate_pairs():
+    frame = _wine_frame(
+        [
+            {"region": "Test\0A", "app": "B", "colour": "#123456"},
+            {"region": "Test", "app": "A\0B", "colour": "#123456"},
+        ],
+        [
+            Polygon([(0, 0), (1, 0), (1, 1), (0, 0)]),
+            Polygon([(2, 2), (3, 2), (3, 3), (2, 2)]),
+        ],
+    )
+
+    with pytest.raises(RuntimeError, match="duplicate generated feature IDs"):
+        _validate_wine_data(frame)
@@ -0,0 +1,98 @@
+import dataclasses
+import os
+
+import pandas as pd
+import pytest
+
+import app.app_data as app_data
+from app.app_config import CONFIG
+from app.data_snapshot import load_snapshot, source_fingerprint, write_snapshot
+
+
+@pytest.fixture
+def sources(tmp_path):
+    paths = [tmp_path / "restaurants.csv", tmp_path / "regions.geojson"]
+    paths[0].write_text("name,stars\nA,1\n")
+    paths[1].write_text('{"type": "FeatureCollection", "features": []}')
+    return paths
+
+
+@pytest.fixture
+def frames():
+    return {"restaurants": pd.DataFrame({"name": ["A"], "stars": [1.0]})}
+
+
+def _write(snapshot_path, sources, frames):
+    write_snapshot(snapshot_path, source_fingerprint(sources), frames)
+
+
+def test_snapshot_round_trips_frames(tmp_path, sources, frames):
+    snapshot_path = tmp_path / "cache" / "snapshot.pickle"
+    _write(snapshot_path, sources, frames)
+
+    loaded = load_snapshot(snapshot_path, sources)
+
+    pd.testing.assert_frame_equal(loaded["restaurants"], frames["restaurants"])
+    assert [path.name for path in snapshot_path.parent.iterdir()] == ["snapshot.pickle"]
+
+
+def test_snapshot_is_stale_when_a_source_changes(tmp_path, sources, frames):
+    snapshot_path = tmp_path / "snapshot.pickle"
+    _write(snapshot_path, sources, frames)
+
+    sources[0].write_text("name,stars\nB,2\n")
+
+    assert load_snapshot(snapshot_path, sources) is None
+
+
+def test_snapshot_survives_touched_sources_with_identical_content(tmp_path, sources, frames):
+    snapshot_path = tmp_path / "snapshot.pickle"
+    _write(snapshot_path, sources, frames)
+
+    stat = sources[1].stat()
+    os.utime(sources[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert load_snapshot(snapshot_path, sources) is not None
+
+
+def test_snapshot_is_stale_when_the_source_list_changes(tmp_path, sources, frames):
+    snapshot_path = tmp_path / "snapshot.pickle"
+    _write(snapshot_path, sources[:1], frames)
+
+    assert load_snapshot(snapshot_path, sources) is None
+
+
+def test_missing_or_corrupt_snapshots_are_ignored(tmp_path, sources):
+    snapshot_path = tmp_path / "snapshot.pickle"
+    assert load_snapshot(snapshot_path, sources) is None
+
+    snapshot_path.write_bytes(b"not a pickle")
+    assert load_snapshot(snapshot_path, sources) is None
+
+
+def test_load_michelin_data_reuses_a_current_snapshot(tmp_path, monkeypatch):
+    config = dataclasses.replace(CONFIG, data_snapshot_dir=tmp_path)
+    parsed = app_data.load_michelin_data(config)
+    parsed.warm(["wine"])
+    assert (tmp_path / app_data.SNAPSHOT_FILENAME).exists()
+    assert (tmp_path / "wine_df.pickle").exists()
+
+    def fail_to_parse(config):
+        pytest.fail("a current snapshot must not re-parse the sources")
+
+    monkeypatch.setattr(app_data, "_read_source_frames", fail_to_parse)
+    for name, (source_files, _) in app_data.LAZY_FRAMES.items():
+        monkeypatch.setitem(app_data.LAZY_FRAMES, name, (source_files, fail_to_parse))
+    restored = app_data.load_michelin_data(config)
+
+    pd.testing.assert_frame_equal(restored.all_france, parsed.all_france)
+    pd.testing.assert_frame_equal(restored.wine_df, parsed.wine_df)
+    assert restored.wine_df.crs == parsed.wine_df.crs
+    assert restored.dept_to_code == parsed.dept_to_code
+
+
+def test_load_michelin_data_without_snapshots_writes_nothing(tmp_path, monkeypatch):
+    config = dataclasses.replace(CONFIG, data_snapshot_dir=None)
+    monkeypatch.setattr(app_data, "write_snapshot", lambda *args: pytest.fail("snapshots are disabled"))
+
+    assert not app_data.load_michelin_data(config).all_france.empty
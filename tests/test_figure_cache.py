@@ -0,0 +1,36 @@
+from app.utils.figure_cache import FigureCache, with_map_view
+
+
+def test_cache_evicts_least_recently_used_and_counts_hits():
+    cache = FigureCache(maxsize=2)
+    builds = []
+
+    def build(key):
+        builds.append(key)
+        return {"key": key}
+
+    for key in ("a", "b", "a", "c", "b"):
+        cache.get_or_build(key, lambda: build(key))
+
+    # "b" was the least recently used entry when "c" arrived, so it had to be rebuilt
+    assert builds == ["a", "b", "c", "b"]
+    assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 1, "misses": 4, "hit_ratio": 0.2}
+
+
+def test_zero_size_cache_always_builds():
+    cache = FigureCache(maxsize=0)
+
+    assert cache.get_or_build("a", lambda: 1) == 1
+    assert len(cache) == 0
+    assert cache.hit_ratio == 0.0
+
+
+def test_map_view_overlay_leaves_the_cached_figure_untouched():
+    figure = {"data": [{"type": "scattermap"}], "layout": {"map": {"zoom": 8, "center": {"lat": 1.0, "lon": 2.0}}}}
+
+    overlaid = with_map_view(figure, zoom=11, center={"lat": 5.0})
+
+    assert overlaid["layout"]["map"] == {"zoom": 11, "center": {"lat": 5.0, "lon": 2.0}}
+    assert overlaid["data"] is figure["data"]
+    assert figure["layout"]["map"] == {"zoom": 8, "center": {"lat": 1.0, "lon": 2.0}}
+    assert with_map_view(figure) is figure
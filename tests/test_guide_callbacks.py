@@ -0,0 +1,55 @@
+from dash import Patch
+
+from app.callbacks.guide import marker_map
+
+
+def _figure():
+    return {
+        "data": [{"name": f"trace-{index}"} for index in range(6)],
+        "layout": {"map": {"zoom": 9, "center": {"lat": 45.0, "lon": 4.0}}},
+    }
+
+
+# Two traces (markers and halo) per rating, with the outline as trace 5
+STAR_TRACES = {0.5: [0, 1], 1: [2, 3], 2: [4]}
+
+
+def test_star_toggle_on_the_displayed_location_patches_toggled_traces_and_view():
+    view_center = {"lat": 45.5, "lon": 4.5}
+
+    patch = marker_map(
+        _figure(), frozenset({0.5, 1, 2}), STAR_TRACES, frozenset({1, 2}), 11, view_center,
+        displayed_stars=frozenset({0.5, 1}),
+    )
+
+    assert isinstance(patch, Patch)
+    assert patch.to_plotly_json()["operations"] == [
+        {"operation": "Assign", "location": ["data", 0, "visible"], "params": {"value": False}},
+        {"operation": "Assign", "location": ["data", 1, "visible"], "params": {"value": False}},
+        {"operation": "Assign", "location": ["data", 4, "visible"], "params": {"value": True}},
+        {"operation": "Assign", "location": ["layout", "map", "zoom"], "params": {"value": 11}},
+        {"operation": "Assign", "location": ["layout", "map", "center"], "params": {"value": view_center}},
+    ]
+
+
+def test_patch_without_a_stored_view_only_flips_visibility():
+    patch = marker_map(
+        _figure(), frozenset({0.5, 1}), STAR_TRACES, frozenset({0.5}), None, None,
+        displayed_stars=frozenset({0.5, 1}),
+    )
+
+    assert [operation["location"] for operation in patch.to_plotly_json()["operations"]] == [
+        ["data", 2, "visible"],
+        ["data", 3, "visible"],
+    ]
+
+
+def test_location_not_on_screen_gets_the_full_figure_with_the_view():
+    figure = marker_map(_figure(), frozenset({0.5, 1}), STAR_TRACES, frozenset({1}), 11, {"lat": 45.5, "lon": 4.5})
+
+    assert [trace.get("visible") for trace in figure["data"]] == [False, False, True, True, False, None]
+    assert figure["layout"]["map"] == {"zoom": 11, "center": {"lat": 45.5, "lon": 4.5}}
+
+    # With none of the selected ratings present, the builder's centre is kept
+    empty = marker_map(_figure(), frozenset({0.5}), STAR_TRACES, frozenset({2}), 11, {"lat": 45.5, "lon": 4.5})
+    assert empty["layout"]["map"] == {"zoom": 11, "center": {"lat": 45.0, "lon": 4.0}}
@@ -0,0 +1,86 @@
+import pandas as pd
+import pytest
+
+from app.utils.guide_figures import (
+    generate_hover_text,
+    generate_hover_texts,
+    label_properties,
+    plot_interactive_department,
+    star_trace_indices,
+)
+
+
+def test_vectorised_hover_text_matches_row_hover_text(data_boundary):
+    restaurants = data_boundary.restaurants_with_monaco
+
+    expected = restaurants.apply(generate_hover_text, axis=1)
+
+    pd.testing.assert_series_equal(generate_hover_texts(restaurants), expected, check_names=False)
+    pd.testing.assert_series_equal(restaurants["hover_text"], expected, check_names=False)
+
+
+def test_hover_text_handles_unknown_star_levels_and_empty_frames():
+    restaurants = pd.DataFrame({"name": ["A"], "location": ["Lyon, 69002"], "stars": [7.0]})
+
+    assert "color: #000;" in generate_hover_texts(restaurants).iloc[0]
+    assert generate_hover_texts(restaurants.iloc[:0]).empty
+
+
+def test_department_figure_reuses_precomputed_hover_text(data_boundary):
+    restaurants = data_boundary.all_france.assign(hover_text="precomputed")
+
+    fig = plot_interactive_department(restaurants, data_boundary.geo_df, "69", [1, 2, 3])
+
+    marker_texts = {text for trace in fig.data if trace.hovertemplate for text in trace.text}
+    assert marker_texts == {"precomputed"}
+
+
+@pytest.mark.parametrize("stars", [[3, 2, 1, 0.5, 0.25], [0.25], [1]])
+def test_single_marker_mode_draws_every_restaurant_in_one_trace(data_boundary, stars):
+    restaurants = data_boundary.all_france
+    expected = restaurants[(restaurants["department_num"] == "69") & restaurants["stars"].isin(stars)]
+
+    layered = plot_interactive_department(restaurants, data_boundary.geo_df, "69", stars)
+    single = plot_interactive_department(restaurants, data_boundary.geo_df, "69", stars, marker_mode="single")
+
+    layered_markers = [trace for trace in layered.data if trace.customdata is not None and trace.visible]
+    single_markers = [trace for trace in single.data if trace.customdata is not None]
+    halos = [trace for trace in single.data if trace.hoverinfo == "skip"]
+
+    assert len(single_markers) == 1
+    assert len(halos) <= 1
+    assert sorted(single_markers[0].customdata) == sorted(expected["restaurant_id"])
+    assert sorted(single_markers[0].customdata) == sorted(
+        index for trace in layered_markers for index in trace.customdata
+    )
+
+
+def test_single_marker_mode_styles_points_from_label_properties(data_boundary):
+    restaurants = data_boundary.all_france
+
+    fig = plot_interactive_department(restaurants, data_boundary.geo_df, "75", [3, 0.25], marker_mode="single")
+    marker_trace = next(trace for trace in fig.data if trace.customdata is not None)
+    stars = [data_boundary.restaurant_details[restaurant_id]["stars"] for restaurant_id in marker_trace.customdata]
+
+    assert list(marker_trace.marker.color) == stars
+    assert list(marker_trace.marker.size) == [label_properties(star)[1] for star in stars]
+    assert stars == sorted(stars)
+
+    colour_stops = dict((position, colour) for position, colour in marker_trace.marker.colorscale)
+    assert colour_stops[1.0] == "rgba(194,40,45,1)"
+    assert colour_stops[0.0] == "rgba(128,128,128,0.9)"
+
+
+def test_layered_mode_draws_every_rating_and_hides_unselected_ones(data_boundary):
+    restaurants = data_boundary.all_france
+    in_department = restaurants[restaurants["department_num"] == "69"]
+
+    figure = plot_interactive_department(restaurants, data_boundary.geo_df, "69", [1]).to_dict()
+    star_traces = star_trace_indices(figure)
+
+    assert set(star_traces) == set(in_department["stars"])
+    for star, trace_indices in star_traces.items():
+        for trace_index in trace_indices:
+            assert figure["data"][trace_index]["visible"] is (star == 1)
+    # The department outline is not tied to any rating
+    assert 0 not in {index for indices in star_traces.values() for index in indices}
@@ -0,0 +1,184 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from shapely.geometry import MultiPolygon, Point, box
+
+from app.utils.guide_tables import (
+    MONACO_REGION,
+    build_guide_filter_table,
+    build_guide_outline_table,
+    build_guide_view_table,
+    outline_coordinates,
+    outline_level,
+)
+
+
+def _department(code, department, region, **counts):
+    row = {"code": code, "department": department, "region": region}
+    row.update({column: counts.get(column, 0) for column in ("3_star", "2_star", "1_star", "bib_gourmand", "selected")})
+    return row
+
+
+@pytest.fixture
+def guide_filters():
+    geo_df = pd.DataFrame(
+        [
+            _department("06", "Alpes-Maritimes", MONACO_REGION, **{"1_star": 3, "selected": 2}),
+            _department("75", "Paris", "Île-de-France", **{"3_star": 1}),
+            _department("77", "Seine-et-Marne", "Île-de-France", bib_gourmand=1),
+        ]
+    )
+    monaco = pd.DataFrame([_department("98", "Monaco", MONACO_REGION, **{"3_star": 1, "2_star": 2})])
+    all_france = pd.DataFrame(
+        [
+            {"department": "Paris", "arrondissement": "1st (Louvre)", "stars": 3.0},
+            {"department": "Paris", "arrondissement": "1st (Louvre)", "stars": 0.25},
+            {"department": "Paris", "arrondissement": "2nd (Bourse)", "stars": 0.5},
+            {"department": "Seine-et-Marne", "arrondissement": "Meaux", "stars": 0.5},
+        ]
+    )
+
+    return build_guide_filter_table(all_france, geo_df, pd.concat([geo_df, monaco], ignore_index=True))
+
+
+def test_department_options_follow_region_and_include_monaco_in_paca(guide_filters):
+    assert guide_filters.department_options("Île-de-France") == [
+        {"label": "Paris (75)", "value": "Paris"},
+        {"label": "Seine-et-Marne (77)", "value": "Seine-et-Marne"},
+    ]
+    assert [option["value"] for option in guide_filters.department_options(MONACO_REGION)] == [
+        "Alpes-Maritimes",
+        "Monaco",
+    ]
+    assert guide_filters.department_options(None) == []
+
+
+def test_department_star_availability_is_ordered_highest_first(guide_filters):
+    assert guide_filters.available_stars(MONACO_REGION, "Alpes-Maritimes") == [1, 0.25]
+    assert guide_filters.available_stars("Île-de-France", "Seine-et-Marne") == [0.5]
+    assert guide_filters.available_stars(MONACO_REGION, "Monaco") == [3, 2]
+
+
+def test_monaco_is_only_available_from_paca(guide_filters):
+    assert guide_filters.available_stars("Île-de-France", "Monaco") == []
+
+
+@pytest.mark.parametrize(
+    ("arrondissement", "expected"),
+    [
+        (None, [3.0, 0.5, 0.25]),
+        ("all", [3.0, 0.5, 0.25]),
+        ("1st (Louvre)", [3.0, 0.25]),
+        ("2nd (Bourse)", [0.5]),
+        ("Unknown", []),
+    ],
+)
+def test_paris_star_availability_is_resolved_per_arrondissement(guide_filters, arrondissement, expected):
+    assert guide_filters.available_stars("Île-de-France", "Paris", arrondissement) == expected
+
+
+def test_available_stars_returns_fresh_lists(guide_filters):
+    stars = guide_filters.available_stars(MONACO_REGION, "Alpes-Maritimes")
+    stars.append(2)
+
+    assert guide_filters.available_stars(MONACO_REGION, "Alpes-Maritimes") == [1, 0.25]
+
+
+@pytest.fixture
+def guide_views():
+    geo_df = gpd.GeoDataFrame(
+        [
+            {"code": "06", "department": "Alpes-Maritimes", "region": MONACO_REGION},
+            {"code": "75", "department": "Paris", "region": "Île-de-France"},
+        ],
+        geometry=[box(6.0, 43.0, 8.0, 45.0), box(2.2, 48.8, 2.4, 48.9)],
+        crs="EPSG:4326",
+    )
+    monaco = gpd.GeoDataFrame(
+        [{"code": "98", "department": "Monaco", "region": MONACO_REGION}],
+        geometry=[box(7.4, 43.7, 7.44, 43.76)],
+        crs="EPSG:4326",
+    )
+    paris_df = gpd.GeoDataFrame(
+        [{"arrondissement": "1st (Louvre)"}],
+        geometry=[box(2.32, 48.85, 2.36, 48.87)],
+        crs="EPSG:4326",
+    )
+
+    return build_guide_view_table(geo_df, pd.concat([geo_df, monaco], ignore_index=True), paris_df)
+
+
+def test_department_views_hold_centroid_and_zoom(guide_views):
+    assert guide_views.department_view(MONACO_REGION, "Alpes-Maritimes") == {
+        "zoom": 8,
+        "center": {"lat": 44.0, "lon": 7.0},
+    }
+    assert guide_views.department_view("Île-de-France", "Paris")["zoom"] == 11
+
+
+def test_monaco_view_is_only_available_from_paca(guide_views):
+    assert guide_views.department_view(MONACO_REGION, "Monaco")["zoom"] == 13.5
+    assert guide_views.department_view("Île-de-France", "Monaco") == {}
+
+
+def test_arrondissement_views_use_arrondissement_zoom(guide_views):
+    view = guide_views.arrondissement_view("1st (Louvre)")
+
+    assert view["zoom"] == 13
+    assert view["center"] == pytest.approx({"lat": 48.86, "lon": 2.34})
+    assert guide_views.arrondissement_view("Unknown") == {}
+
+
+def test_views_are_returned_as_fresh_dicts(guide_views):
+    view = guide_views.arrondissement_view("1st (Louvre)")
+    view["center"]["lat"] = 0
+
+    assert guide_views.arrondissement_view("1st (Louvre)")["center"]["lat"] == pytest.approx(48.86)
+
+
+def test_outline_coordinates_separate_every_exterior_ring_with_nan():
+    islands = MultiPolygon([box(0, 0, 1, 1), box(5, 5, 6, 6)])
+    with_hole = box(10, 10, 20, 20).difference(box(12, 12, 14, 14))
+
+    lon, lat = outline_coordinates([islands, with_hole])
+
+    # Three exterior rings of five points each; the hole is not outlined
+    assert len(lon) == 3 * 5 + 2
+    assert np.isnan(lon[[5, 11]]).all() and np.isnan(lat[[5, 11]]).all()
+    assert list(lon[:5]) == list(islands.geoms[0].exterior.xy[0])
+    assert list(lat[12:]) == list(with_hole.exterior.xy[1])
+
+
+def test_outline_table_covers_regions_departments_and_arrondissements():
+    region_df = gpd.GeoDataFrame(
+        [{"region": "Bretagne"}, {"region": "Bretagne"}, {"region": "Corse"}],
+        geometry=[box(0, 0, 1, 1), box(2, 2, 3, 3), box(9, 41, 10, 43)],
+    )
+    departments = gpd.GeoDataFrame([{"code": "75"}], geometry=[box(2.2, 48.8, 2.4, 48.9)])
+    paris_df = gpd.GeoDataFrame([{"arrondissement": "1st (Louvre)"}], geometry=[box(2.32, 48.85, 2.36, 48.87)])
+
+    outlines = build_guide_outline_table(region_df, departments, paris_df)
+
+    assert np.isnan(outlines.region_outline("Bretagne")[0]).sum() == 1
+    assert not np.isnan(outlines.region_outline("Corse")[0]).any()
+    assert len(outlines.department_outline(75)[0]) == 5
+    assert outlines.arrondissement_outline("1st (Louvre)") is not None
+    assert outlines.department_outline("99") is None
+
+
+@pytest.mark.parametrize(("zoom", "expected"), [(None, 3), (5, 0), (8, 1), (10.9, 1), (13, 2), (14, 3), (20, 3)])
+def test_outline_level_follows_zoom(zoom, expected):
+    assert outline_level(zoom) == expected
+
+
+def test_outline_detail_levels_simplify_coarser_at_low_zoom():
+    circle = Point(2.35, 48.85).buffer(0.05, quad_segs=256)
+    paris_df = gpd.GeoDataFrame([{"arrondissement": "Round"}], geometry=[circle])
+    empty = gpd.GeoDataFrame({"region": [], "code": []}, geometry=[])
+
+    outlines = build_guide_outline_table(empty, empty, paris_df)
+    vertex_counts = [len(outlines.arrondissement_outline("Round", zoom)[0]) for zoom in (5, 8, 11, None)]
+
+    assert vertex_counts == sorted(vertex_counts)
+    assert vertex_counts[0] < vertex_counts[-1] == len(circle.exterior.coords)
@@ -1,3 +1,6 @@
+import gc
+import runpy
+
 from flask import Flask
 
 
@@ -5,3 +8,39 @@ def test_michelin_app_imports_and_exports_server(app_module):
     assert isinstance(app_module.server, Flask)
     assert app_module.app.server is app_module.server
     assert app_module.app.callback_map
+
+
+def test_gunicorn_config_preloads_app_and_freezes_before_fork(app_module):
+    try:
+        config = runpy.run_path(str(app_module.CONFIG.base_dir / "gunicorn.conf.py"))
+        assert not gc.isenabled()
+
+        config["when_ready"](None)
+
+        assert gc.isenabled()
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+        gc.enable()
+
+    assert config["preload_app"] is True
+    assert callable(config["post_fork"])
+
+
+def test_gunicorn_config_reload_turns_the_collector_back_on(app_module):
+    try:
+        config = runpy.run_path(str(app_module.CONFIG.base_dir / "gunicorn.conf.py"))
+        assert not gc.isenabled()
+
+        config["on_reload"](None)
+
+        assert gc.isenabled()
+    finally:
+        gc.enable()
+
+
+def test_guide_figure_cache_is_exposed_on_the_server(app_module):
+    figure_cache = app_module.server.extensions["guide_figure_cache"]
+
+    assert figure_cache.maxsize == app_module.CONFIG.guide_figure_cache_size
+    assert set(figure_cache.stats()) == {"size", "maxsize", "hits", "misses", "hit_ratio"}
@@ -0,0 +1,57 @@
+import threading
+import time
+
+import pytest
+
+from app.utils.lazy_loading import LazyValue
+
+
+def test_lazy_value_loads_once_on_first_access():
+    calls = []
+    value = LazyValue(lambda: calls.append(1) or object())
+
+    assert not value.loaded
+    assert not calls
+
+    first = value.get()
+
+    assert value.loaded
+    assert value.get() is first
+    assert len(calls) == 1
+
+
+def test_concurrent_first_accesses_share_one_load():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    value = LazyValue(loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(value.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len({id(result) for result in results}) == 1
+
+
+def test_failed_load_is_retried_on_next_access():
+    attempts = []
+
+    def loader():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("source unavailable")
+        return "loaded"
+
+    value = LazyValue(loader)
+
+    with pytest.raises(OSError):
+        value.get()
+    assert not value.loaded
+    assert value.get() == "loaded"
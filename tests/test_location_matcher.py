@@ -0,0 +1,151 @@
+import pandas as pd
+import pytest
+from fuzzywuzzy import fuzz, process
+
+from app.utils.locationMatcher import LocationMatcher
+from app.utils.location_search import (
+    best_location_match,
+    build_location_search_index,
+    location_search_candidates,
+    location_search_key,
+)
+
+
+@pytest.fixture
+def restaurants():
+    return pd.DataFrame(
+        [
+            {"location": "Lyon, 69002", "capital": "Lyon", "region": "Auvergne-Rhône-Alpes", "department": "Rhône",
+             "department_num": "69"},
+            {"location": "Lyon, 69005", "capital": "Lyon", "region": "Auvergne-Rhône-Alpes", "department": "Rhône",
+             "department_num": "69"},
+            {"location": "Écully, 69130", "capital": "Lyon", "region": "Auvergne-Rhône-Alpes", "department": "Rhône",
+             "department_num": "69"},
+            {"location": "Montreuil, 93100", "capital": "Bobigny", "region": "Île-de-France",
+             "department": "Seine-Saint-Denis", "department_num": "93"},
+            {"location": "Montreuil, 62170", "capital": "Arras", "region": "Hauts-de-France",
+             "department": "Pas-de-Calais", "department_num": "62"},
+            {"location": "Ajaccio, 20000", "capital": "Ajaccio", "region": "Corse", "department": "Corse-du-Sud",
+             "department_num": "2A"},
+            {"location": "Monaco, 98000", "capital": "Monaco", "region": "Provence-Alpes-Côte d'Azur",
+             "department": "Monaco", "department_num": "98"},
+        ]
+    )
+
+
+def test_matcher_ignores_accents_case_and_postal_suffix(restaurants):
+    matcher = LocationMatcher(restaurants)
+
+    result = matcher.find_region_department("ECULLY")
+
+    assert result == {
+        "Matched Location": "Écully, 69130",
+        "Region": "Auvergne-Rhône-Alpes",
+        "Department": "Rhône",
+        "Is Capital": "",
+    }
+
+
+def test_matcher_reports_department_capital(restaurants):
+    result = LocationMatcher(restaurants).find_region_department("lyon")
+
+    assert result["Matched Location"] == "Lyon, 69002"
+    assert result["Is Capital"] == "Department Capital"
+
+
+def test_matcher_tolerates_typos_above_threshold(restaurants):
+    result = LocationMatcher(restaurants).find_region_department("Monacco")
+
+    assert result["Department"] == "Monaco"
+
+
+def test_matcher_rejects_locations_below_threshold(restaurants):
+    matcher = LocationMatcher(restaurants)
+
+    assert matcher.find_region_department("Strasbourg") == "No match found."
+    assert matcher.find_region_department("") == "Invalid input."
+
+
+def test_matcher_does_not_mutate_source_frame(restaurants):
+    original_columns = list(restaurants.columns)
+
+    LocationMatcher(restaurants)
+
+    assert list(restaurants.columns) == original_columns
+
+
+@pytest.mark.parametrize(
+    ("city_input", "expected_location"),
+    [
+        ("Lyon, 69005", "Lyon, 69005"),
+        ("lyon 69005", "Lyon, 69005"),
+        ("69005", "Lyon, 69005"),
+        ("69", "Lyon, 69002"),
+        ("2a", "Ajaccio, 20000"),
+        ("Ecully, 69999", "Écully, 69130"),
+        ("20090", "Ajaccio, 20000"),
+    ],
+)
+def test_matcher_resolves_postal_and_department_codes_exactly(restaurants, city_input, expected_location, monkeypatch):
+    matcher = LocationMatcher(restaurants)
+    monkeypatch.setattr(
+        "app.utils.locationMatcher.best_location_match",
+        lambda *args: pytest.fail("code lookups must not run fuzzy scoring"),
+    )
+
+    assert matcher.find_region_department(city_input)["Matched Location"] == expected_location
+
+
+def test_matcher_uses_code_to_break_ties_between_same_named_towns(restaurants):
+    matcher = LocationMatcher(restaurants)
+
+    assert matcher.find_region_department("Montreuil")["Department"] == "Seine-Saint-Denis"
+    assert matcher.find_region_department("Montreuil, 62170")["Department"] == "Pas-de-Calais"
+    assert matcher.find_region_department("Montreuill 62")["Department"] == "Pas-de-Calais"
+
+
+def test_matcher_resolves_unknown_corsican_postal_codes_to_2a_or_2b(restaurants):
+    bastia = {"location": "Bastia, 20200", "capital": "Bastia", "region": "Corse", "department": "Haute-Corse",
+              "department_num": "2B"}
+    matcher = LocationMatcher(pd.concat([restaurants, pd.DataFrame([bastia])], ignore_index=True))
+
+    assert matcher.find_region_department("20167")["Department"] == "Corse-du-Sud"
+    assert matcher.find_region_department("20290")["Department"] == "Haute-Corse"
+
+
+def test_matcher_reports_unknown_codes_as_no_match(restaurants):
+    assert LocationMatcher(restaurants).find_region_department("99999") == "No match found."
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["lyon", "lyons", "saint remy", "remy de provence saint", "st remy", "montreal", "l isle", "aix", "zzz"],
+)
+@pytest.mark.parametrize("threshold", [60, 80])
+def test_location_search_matches_linear_extract_one(query, threshold):
+    names = [
+        "lyon", "lyons-la-foret", "saint-remy-de-provence", "saint-remy", "montreuil",
+        "montreuil-bellay", "l'isle-sur-la-sorgue", "aix-en-provence", "aix-les-bains", "lyon",
+    ]
+    index = build_location_search_index(names)
+
+    expected = process.extractOne(query, names, scorer=fuzz.token_sort_ratio)
+    expected = (names.index(expected[0]), expected[1]) if expected[1] >= threshold else None
+
+    assert best_location_match(index, query, threshold) == expected
+
+
+def test_location_search_shortlist_prunes_unrelated_names():
+    names = ["lyon", "marseille", "bordeaux", "strasbourg", "lille", "lyons-la-foret"]
+    index = build_location_search_index(names)
+
+    candidates = location_search_candidates(index, location_search_key("lyonn"), 80)
+
+    assert candidates == [0]
+
+
+def test_loaded_data_exposes_shared_location_matcher(data_boundary):
+    result = data_boundary.location_matcher.find_region_department("Monaco")
+
+    assert isinstance(result, dict)
+    assert result["Department"] == "Monaco"
@@ -0,0 +1,32 @@
+import json
+
+from plotly.utils import PlotlyJSONEncoder
+
+from app.utils.restaurant_cards import RestaurantCardCache, get_restaurant_details
+
+
+def _serialised(component):
+    return json.loads(json.dumps(component, cls=PlotlyJSONEncoder))
+
+
+def test_cached_cards_match_rendered_cards_per_class_name(data_boundary):
+    cards = RestaurantCardCache(data_boundary.restaurant_details)
+    restaurant = data_boundary.restaurants_with_monaco.iloc[-1]
+
+    for extra_class_name in ("", "editorial-guide-entry"):
+        card = cards.card(restaurant["restaurant_id"], extra_class_name)
+
+        assert card == _serialised(get_restaurant_details(restaurant, extra_class_name=extra_class_name))
+        assert cards.card(restaurant["restaurant_id"], extra_class_name) is card
+
+    assert len(cards) == 2
+    assert "editorial-guide-entry" in cards.card(restaurant["restaurant_id"], "editorial-guide-entry")["props"]["className"]
+
+
+def test_cards_keep_the_requested_order(data_boundary):
+    cards = RestaurantCardCache(data_boundary.restaurant_details)
+    restaurants = data_boundary.all_france.iloc[[5, 0, 3]]
+
+    assert cards.cards(restaurants["restaurant_id"]) == [
+        _serialised(get_restaurant_details(row)) for _, row in restaurants.iterrows()
+    ]
@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+
+from app.utils.restaurant_index import build_restaurant_index
+
+
+@pytest.fixture
+def restaurants():
+    france = pd.DataFrame(
+        [
+            {"name": "A", "department_num": "13", "arrondissement": "Marseille", "region": "PACA", "stars": 1.0},
+            {"name": "B", "department_num": "75", "arrondissement": "1st (Louvre)", "region": "IDF", "stars": 3.0},
+            {"name": "C", "department_num": "13", "arrondissement": "Aix", "region": "PACA", "stars": 0.25},
+            {"name": "D", "department_num": "13", "arrondissement": "Marseille", "region": "PACA", "stars": 3.0},
+            {"name": "E", "department_num": "75", "arrondissement": "1st (Louvre)", "region": "IDF", "stars": 1.0},
+        ]
+    )
+    monaco = pd.DataFrame(
+        [{"name": "M", "department_num": "98", "arrondissement": "Monaco", "region": "PACA", "stars": 3.0}]
+    )
+    return france, pd.concat([france, monaco], ignore_index=True)
+
+
+def test_index_slices_match_boolean_filters_in_row_order(restaurants):
+    france, combined = restaurants
+    index = build_restaurant_index(combined, len(france))
+
+    for code in ("13", "75", "98", "missing"):
+        for stars in ([3], [1, 3], [3, 1, 0.25], [2]):
+            expected = france[(france["department_num"] == code) & france["stars"].isin(stars)]
+            pd.testing.assert_frame_equal(index.department(code, stars), expected)
+
+    pd.testing.assert_frame_equal(
+        index.arrondissement("Marseille"), france[france["arrondissement"] == "Marseille"]
+    )
+
+
+def test_monaco_rows_are_included_only_on_request(restaurants):
+    france, combined = restaurants
+    index = build_restaurant_index(combined, len(france))
+
+    assert index.regions(["PACA"], [3])["name"].tolist() == ["D"]
+    assert index.regions(["PACA"], [3], include_monaco=True)["name"].tolist() == ["D", "M"]
+    assert index.department("98", include_monaco=True)["name"].tolist() == ["M"]
+    assert index.regions(["IDF", "PACA"])["name"].tolist() == ["A", "B", "C", "D", "E"]
+
+
+def test_index_covers_the_loaded_data(data_boundary):
+    index = data_boundary.restaurant_index
+    combined = data_boundary.restaurants_with_monaco
+
+    selected = index.department("06", [1, 2], include_monaco=True)
+    expected = combined[(combined["department_num"] == "06") & combined["stars"].isin([1, 2])]
+    pd.testing.assert_frame_equal(selected, expected)
+    assert index.restaurants is combined
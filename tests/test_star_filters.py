@@ -0,0 +1,34 @@
+import json
+
+from app.components.shared import color_map
+from app.utils.star_filters import inactive_star_colour, star_button_colours, star_button_script
+
+
+def test_star_button_colours_are_keyed_as_javascript_strings():
+    colours = star_button_colours()
+
+    assert set(colours) == {"0.25", "0.5", "1", "2", "3"}
+    assert colours["3"] == {"active": color_map[3], "inactive": inactive_star_colour(color_map[3])}
+    assert inactive_star_colour("#C2282D") == "rgba(194,40,45,0.6)"
+
+
+def test_star_button_script_embeds_the_colour_table_and_class_name():
+    script = star_button_script("me-1 star-button-wine editorial-rating-button")
+
+    assert json.dumps(star_button_colours()) in script
+    assert "'me-1 star-button-wine editorial-rating-button' + (isActive" in script
+    assert "const withSelection = false;" in script
+    assert "{" not in script.split("function", 1)[0]
+
+
+def test_star_button_styling_has_no_server_callbacks(app_module):
+    star_outputs = [
+        callback for callback in app_module.app._callback_list
+        if "filter-button-" in callback["output"] and ".className" in callback["output"]
+    ]
+
+    assert len(star_outputs) == 6
+    # The guide's buttons also keep the selected-stars store, through the same script
+    assert sum("selected-stars.data" in callback["output"] for callback in star_outputs) == 1
+    assert all(callback["clientside_function"] for callback in star_outputs)
+    assert all("callback" not in app_module.app.callback_map[callback["output"]] for callback in star_outputs)